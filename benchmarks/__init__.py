@@ -0,0 +1,5 @@
+#!/usr/bin/python3
+"""
+Benchmarks for the storage engine, run from the repository root with
+python3 -m benchmarks.<module>.
+"""
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Compares a per-object loop with models.engine.aggregate for the average
+price per city of synthetic places, with NumPy when it is installed.
+
+Usage: python3 -m benchmarks.bench_aggregate [number of places]
+"""
+import random
+import sys
+from datetime import datetime
+from benchmarks.bench_timestamps import timed
+from models.engine import aggregate
+from models.place import Place
+
+
+def make_places(count):
+    """Returns count Places spread over 1000 cities."""
+    now = datetime.now().isoformat()
+    rand = random.Random(0)
+    return [Place(id=str(i), created_at=now, updated_at=now,
+                  city_id="city-{}".format(rand.randrange(1000)),
+                  price_by_night=rand.randrange(20, 500),
+                  amenity_ids=rand.sample(range(50), 3))
+            for i in range(count)]
+
+
+def average_price_loop(places):
+    """Returns the average price per city with a loop over the places."""
+    totals = {}
+    for place in places:
+        total = totals.setdefault(place.city_id, [0, 0])
+        total[0] += place.price_by_night
+        total[1] += 1
+    return {city_id: total / count for city_id, (total, count)
+            in totals.items()}
+
+
+def price_statistics_loop(places):
+    """Returns the sum, min, max and average price per city with a loop."""
+    statistics = {}
+    for place in places:
+        price = place.price_by_night
+        entry = statistics.get(place.city_id)
+        if entry is None:
+            statistics[place.city_id] = [price, price, price, 1]
+        else:
+            entry[0] += price
+            entry[1] = min(entry[1], price)
+            entry[2] = max(entry[2], price)
+            entry[3] += 1
+    return {city_id: (total, low, high, total / count) for city_id,
+            (total, low, high, count) in statistics.items()}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    places = make_places(count)
+    backend = "NumPy" if aggregate.numpy is not None else "pure Python"
+    loop = timed(lambda: average_price_loop(places))
+    columns = timed(lambda: aggregate.aggregate(places, "city_id",
+                                                avg="price_by_night"))
+    print("avg price per city of {} places: loop {:.0f} ms, aggregate "
+          "({}) {:.0f} ms".format(count, 1000 * loop, backend,
+                                  1000 * columns))
+    loop = timed(lambda: price_statistics_loop(places))
+    columns = timed(lambda: aggregate.aggregate(
+        places, "city_id", sum="price_by_night", min="price_by_night",
+        max="price_by_night", avg="price_by_night"))
+    print("sum/min/max/avg price per city: loop {:.0f} ms, aggregate {:.0f} "
+          "ms".format(1000 * loop, 1000 * columns))
+    print("amenity frequency: {:.0f} ms".format(1000 * timed(
+        lambda: aggregate.aggregate(places, "amenity_ids"))))
+
+
+if __name__ == "__main__":
+    main()
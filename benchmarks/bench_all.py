@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+Compares the former all console command, which formatted every object
+into a list before printing, with the streaming one, in text and JSON
+lines, over a storage of synthetic places: time to the first line, total
+time and peak memory.
+
+Usage: python3 -m benchmarks.bench_all [number of places]
+"""
+import io
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from console import HBNBCommand
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+
+class Sink(io.TextIOBase):
+    """Text stream only recording when its first line was written."""
+
+    def __init__(self):
+        self.first = None
+
+    def write(self, text):
+        if self.first is None:
+            self.first = time.perf_counter()
+        return len(text)
+
+
+def former_all(console, arg):
+    """Runs the all command as it was before it streamed its output."""
+    objects = storage.all(arg or None).values()
+    formatted_objects = []
+    for obj in objects:
+        formatted_objects.append(f"[{str(obj)} {obj.to_dict()}]")
+    for formatted_obj in formatted_objects:
+        print(formatted_obj, file=console.stdout)
+
+
+def measure(command):
+    """Returns the seconds to the first line, or None when nothing is
+    printed, and the total seconds taken by command(console), then the
+    peak MiB it allocates, measured by a second run as tracing
+    allocations slows it down."""
+    sink = Sink()
+    start = time.perf_counter()
+    command(HBNBCommand(stdout=sink))
+    total = time.perf_counter() - start
+    tracemalloc.start()
+    command(HBNBCommand(stdout=Sink()))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    first = None if sink.first is None else sink.first - start
+    return first, total, peak / (1 << 20)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    page = "Place limit=20 offset={}".format(count // 2)
+    now = datetime.now().isoformat()
+    FileStorage._FileStorage__objects = {}
+    for i in range(count):
+        storage.new(Place(id=str(i), created_at=now, updated_at=now,
+                          name="Place {}".format(i), price_by_night=i % 500,
+                          amenity_ids=["a", "b"]))
+    commands = [
+        ("former all Place", lambda console: former_all(console, "Place")),
+        ("all Place", lambda console: console.do_all("Place")),
+        ("all Place --format=jsonl",
+         lambda console: console.do_all("Place --format=jsonl")),
+        ("all " + page, lambda console: console.do_all(page))
+    ]
+    for name, command in commands:
+        first, total, peak = measure(command)
+        first = "-" if first is None else "{:.2f}".format(1000 * first)
+        print("{:<32} first line {:>8} ms, total {:6.2f} s, peak {:6.1f} "
+              "MiB".format(name, first, total, peak))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/python3
+"""
+Compares the size, save time and reload time of the JSON file and of the
+binary snapshot format.
+
+Usage: python3 -m benchmarks.bench_binary_format [number of objects]
+"""
+import os
+import sys
+import tempfile
+from benchmarks.bench_timestamps import make_file, timed
+from models.engine.file_storage import FileStorage
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "file.json")
+        make_file(json_path, count)
+        FileStorage._FileStorage__file_path = json_path
+        storage = FileStorage()
+        for snapshot_format in ("json", "binary"):
+            FileStorage.snapshot_format = snapshot_format
+            FileStorage._FileStorage__objects = {}
+            reload_time = timed(storage.reload)
+            for obj in storage.all().values():
+                obj._dirty = True
+            save_time = timed(storage.save)
+            FileStorage._FileStorage__objects = {}
+            reload_time = timed(storage.reload)
+            path = json_path if snapshot_format == "json" else \
+                os.path.join(tmp, "file.hbnb")
+            print("{:>6}: {:.1f} MiB, save {:.2f}s, reload {:.2f}s".format(
+                snapshot_format, os.path.getsize(path) / 2 ** 20, save_time,
+                reload_time))
+
+
+if __name__ == "__main__":
+    main()
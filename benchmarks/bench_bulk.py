@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""
+Compares storing places read from a JSON Lines file one object and one
+save at a time with storage.import_file(), parsing inline and in a pool
+of processes, for JSON Lines and CSV, then times storage.export_file().
+
+Usage: python3 -m benchmarks.bench_bulk [number of places]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from models import storage
+from models.engine import bulk
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+
+def per_object(path):
+    """Stores the places of path as the console would without import:
+    one new object and one save per record."""
+    with open(path) as file:
+        for line in file:
+            place = Place(**bulk.coerce(Place, json.loads(line)))
+            storage.new(place)
+            place.save()
+
+
+def timed(function, *args):
+    """Returns the seconds function(*args) takes from an empty storage."""
+    FileStorage._FileStorage__objects = {}
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    processes = max(os.cpu_count() or 1, 2)
+    now = datetime.now().isoformat()
+    places = [Place(id=str(i), created_at=now, updated_at=now,
+                    name="Place {}".format(i), max_guest=i % 8,
+                    price_by_night=i % 500, latitude=i / count,
+                    amenity_ids=["a", "b"]) for i in range(count)]
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        for name in ("places.jsonl", "places.csv"):
+            path = os.path.join(tmp, name)
+            seconds = timed(bulk.write, path, Place, places)
+            print("{:<40} {:8.2f} s".format("export " + name, seconds))
+        small = os.path.join(tmp, "small.jsonl")
+        bulk.write(small, Place, places[:1000])
+        seconds = timed(per_object, small)
+        print("{:<40} {:8.2f} s".format("per object, 1000 places", seconds))
+        seconds = timed(storage.import_file, Place, small, 1)
+        print("{:<40} {:8.2f} s".format("import, 1000 places", seconds))
+        for name in ("places.jsonl", "places.csv"):
+            path = os.path.join(tmp, name)
+            for workers in (1, processes):
+                seconds = timed(storage.import_file, Place, path, workers)
+                print("{:<40} {:8.2f} s".format(
+                    "import {}, {} process(es)".format(name, workers),
+                    seconds))
+        FileStorage._FileStorage__file_path = "file.json"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""
+Measures the memory held by Place objects with and without
+HBNB_COMPACT_MODELS=1.
+
+Usage: python3 -m benchmarks.bench_compact [number of objects]
+"""
+import os
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime
+
+
+def measure(count):
+    """Prints the bytes allocated by count reloaded Place objects."""
+    from models.place import Place
+    now = datetime.now().isoformat()
+    tracemalloc.start()
+    places = [Place(id=str(i), created_at=now, updated_at=now,
+                    city_id="city", user_id="user", name="Place",
+                    description="A place", number_rooms=2,
+                    number_bathrooms=1, max_guest=4, price_by_night=100,
+                    latitude=37.7, longitude=-122.4)
+              for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(size, len(places))
+
+
+def main():
+    count = sys.argv[1] if len(sys.argv) > 1 else "100000"
+    if os.getenv("HBNB_BENCH_CHILD"):
+        measure(int(count))
+        return
+    sizes = {}
+    for mode in ("0", "1"):
+        env = dict(os.environ, HBNB_COMPACT_MODELS=mode, HBNB_BENCH_CHILD="1")
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_compact", count],
+            env=env, capture_output=True, text=True, check=True).stdout
+        sizes[mode] = int(output.split()[0])
+    print("{} Places: __dict__ {:.1f} MiB, compact {:.1f} MiB ({:.0f}%)"
+          .format(count, sizes["0"] / 2 ** 20, sizes["1"] / 2 ** 20,
+                  100 * sizes["1"] / sizes["0"]))
+
+
+if __name__ == "__main__":
+    main()
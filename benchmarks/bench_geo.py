@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""
+Compares a scan of every Place with the GeoIndex grid for radius and
+bounding-box searches over a million synthetic places.
+
+Usage: python3 -m benchmarks.bench_geo [number of places] [queries]
+"""
+import random
+import sys
+from datetime import datetime
+from benchmarks.bench_timestamps import timed
+from models.engine.geo import distance_km, in_box
+from models.engine.indexes import GeoIndex
+from models.place import Place
+
+
+def make_places(count):
+    """Returns count Places spread over the populated latitudes."""
+    now = datetime.now().isoformat()
+    rand = random.Random(0)
+    return {"Place.{}".format(i): Place(id=str(i), created_at=now,
+                                        updated_at=now,
+                                        latitude=rand.uniform(-60, 70),
+                                        longitude=rand.uniform(-180, 180))
+            for i in range(count)}
+
+
+def scan_nearby(places, lat, lon, radius_km, limit):
+    """Returns the places within radius_km of (lat, lon) with a scan."""
+    found = []
+    for key, place in places.items():
+        distance = distance_km(lat, lon, place.latitude, place.longitude)
+        if distance <= radius_km:
+            found.append((distance, key, place))
+    found.sort(key=lambda entry: entry[:2])
+    return found[:limit]
+
+
+def scan_within(places, south, west, north, east):
+    """Returns the places inside the box with a scan."""
+    return {key: place for key, place in places.items()
+            if in_box(place.latitude, place.longitude,
+                      south, west, north, east)}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    places = make_places(count)
+    index = []
+    print("build index of {} places: {:.2f}s".format(count, timed(
+        lambda: index.append(GeoIndex("latitude", "longitude", places)))))
+    index = index[0]
+    rand = random.Random(1)
+    points = [(rand.uniform(-60, 70), rand.uniform(-180, 180))
+              for i in range(queries)]
+    for radius in (10, 100, 500):
+        for lat, lon in points:
+            assert index.nearby(lat, lon, radius, 20) == \
+                scan_nearby(places, lat, lon, radius, 20)
+        scan = timed(lambda: [scan_nearby(places, lat, lon, radius, 20)
+                              for lat, lon in points])
+        grid = timed(lambda: [index.nearby(lat, lon, radius, 20)
+                              for lat, lon in points])
+        print("nearby {:>3} km: scan {:.1f} ms, index {:.3f} ms ({:.0f}x)"
+              .format(radius, 1000 * scan / queries, 1000 * grid / queries,
+                      scan / grid))
+    boxes = [(lat, lon, lat + 1, lon + 1) for lat, lon in points]
+    scan = timed(lambda: [scan_within(places, *box) for box in boxes])
+    grid = timed(lambda: [index.within(*box) for box in boxes])
+    print("within 1x1 deg: scan {:.1f} ms, index {:.3f} ms ({:.0f}x)"
+          .format(1000 * scan / queries, 1000 * grid / queries, scan / grid))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""
+Compares the time to parse console commands of the dot syntax with the
+former splits on dots and quotes, for the show and update calls it
+knew, with ast as parse_arguments() did, and
+with parse_command(): microseconds per line.
+
+Usage: python3 -m benchmarks.bench_parser [number of runs]
+"""
+import ast
+import sys
+import timeit
+from console import parse_command
+
+LINES = (
+    'User.show("246c227a-d5c1-403d-9bc7-6a47bb9f0f68")',
+    'User.update("246c227a-d5c1-403d-9bc7-6a47bb9f0f68", "first_name", '
+    '"John")',
+    'Place.update("246c227a-d5c1-403d-9bc7-6a47bb9f0f68", {"name": "Loft", '
+    '"max_guest": 4, "latitude": 37.77, "amenity_ids": ["a", "b"]})',
+    'Place.where(price_by_night__lt=100, max_guest__gte=4, '
+    'order_by="price_by_night", limit=20)',
+)
+
+
+def former_split(line):
+    """Parses line as the former default() did, for the calls it knew."""
+    if "{" in line or "where" in line:
+        raise ValueError(line)
+    line = line.split('.')
+    if line[1].startswith("update"):
+        update_args = line[1].split('"')
+        return line[0], update_args[1], update_args[3], update_args[5]
+    return line[0], line[1].split('"')[1]
+
+
+def former_ast(line):
+    """Parses line with ast, as the former parse_arguments() did."""
+    class_name, _, call = line.partition('.')
+    method, _, text = call.partition('(')
+    call = ast.parse(f"f({text[:-1]})", mode="eval").body
+    return class_name, method, \
+        [ast.literal_eval(arg) for arg in call.args], \
+        {kw.arg: ast.literal_eval(kw.value) for kw in call.keywords}
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for line in LINES:
+        print(line[:60])
+        for name, parse in (("split", former_split), ("ast", former_ast),
+                            ("parse_command", parse_command)):
+            try:
+                parse(line)
+            except (IndexError, ValueError):
+                print("  {:<14} cannot parse it".format(name))
+                continue
+            seconds = timeit.timeit(lambda: parse(line), number=runs)
+            print("  {:<14} {:8.2f} us".format(name, 1e6 * seconds / runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""
+Compares running a script of create commands line by line, as the
+console did with piped input, saving after every command, with
+HBNBCommand.run_script(), saving once at its end: commands per second.
+
+Usage: python3 -m benchmarks.bench_script [number of commands]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+from console import HBNBCommand
+from models.engine.file_storage import FileStorage
+
+
+def script(count):
+    """Returns count lines creating places."""
+    return ['create Place name="Place_{}" max_guest={} price_by_night={}'
+            .format(i, i % 8, i % 500) for i in range(count)]
+
+
+def line_by_line(lines):
+    """Runs lines as the command loop runs piped input."""
+    console = HBNBCommand(stdout=io.StringIO())
+    for line in lines:
+        console.onecmd(line)
+
+
+def batch(lines):
+    """Runs lines as a script."""
+    HBNBCommand(stdout=io.StringIO()).run_script(lines, stderr=io.StringIO())
+
+
+def rate(function, lines):
+    """Returns the commands per second function(lines) runs from an empty
+    storage."""
+    FileStorage._FileStorage__objects = {}
+    start = time.perf_counter()
+    function(lines)
+    return len(lines) / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        for name, function, lines in (
+                ("line by line", line_by_line, script(min(count, 2000))),
+                ("script", batch, script(min(count, 2000))),
+                ("script", batch, script(count))):
+            print("{:<14} {:6} commands {:10.0f} commands/s".format(
+                name, len(lines), rate(function, lines)))
+        FileStorage._FileStorage__file_path = "file.json"
+
+
+if __name__ == "__main__":
+    main()
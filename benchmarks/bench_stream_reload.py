@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""
+Compares the peak RSS and time of FileStorage.reload() decoding file.json
+with a single json.load() and with the streaming reader.
+
+Usage: python3 -m benchmarks.bench_stream_reload [number of objects]
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from benchmarks.bench_timestamps import make_file
+
+
+def run(mode, path):
+    """Reloads path in this process and prints peak RSS (KiB) and time."""
+    from models.engine.file_storage import FileStorage
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__file_path = path
+    storage = FileStorage()
+    start = time.perf_counter()
+    if mode == "json":
+        with open(path, "r", encoding="utf-8") as f:
+            loaded_dict = json.load(f)
+        for k, v in loaded_dict.items():
+            storage.new(storage.classes[k.split('.')[0]](**v))
+    else:
+        storage.reload()
+    elapsed = time.perf_counter() - start
+    print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, elapsed,
+          storage.count())
+
+
+def main():
+    if len(sys.argv) == 3:
+        run(sys.argv[1], sys.argv[2])
+        return
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "file.json")
+        make_file(path, count)
+        size = os.path.getsize(path)
+        print("{} objects, {:.1f} MiB file".format(count, size / 2 ** 20))
+        for mode in ("json", "stream"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.bench_stream_reload",
+                 mode, path], capture_output=True, text=True,
+                check=True).stdout.split()
+            print("{:>6}: peak RSS {:.1f} MiB, {:.2f}s".format(
+                mode, int(output[0]) / 1024, float(output[1])))
+
+
+if __name__ == "__main__":
+    main()
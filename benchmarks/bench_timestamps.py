@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+"""
+Compares datetime.strptime with models.timestamp.parse_datetime, alone and
+inside a FileStorage.reload() of a file of 100k objects.
+
+Usage: python3 -m benchmarks.bench_timestamps [number of objects]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from unittest.mock import patch
+import models.base_model
+from models.engine.file_storage import FileStorage
+from models.timestamp import TIME_FORMAT, parse_datetime
+
+
+def make_file(path, count):
+    """Writes count Place objects to the JSON file at path."""
+    now = datetime.now().isoformat()
+    objects = {}
+    for i in range(count):
+        obj_id = str(uuid.uuid4())
+        objects["Place." + obj_id] = {
+            "id": obj_id, "created_at": now, "updated_at": now,
+            "__class__": "Place", "name": "Place {}".format(i),
+            "price_by_night": i % 500, "latitude": 37.7, "longitude": -122.4
+        }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(objects, file)
+
+
+def timed(function):
+    """Returns the seconds function() took to run."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def reload(path):
+    """Reloads the JSON file at path into an empty FileStorage."""
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__file_path = path
+    FileStorage().reload()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    stamps = [datetime.now().isoformat()] * (2 * count)
+
+    def strptime_all():
+        for value in stamps:
+            datetime.strptime(value, TIME_FORMAT)
+
+    def codec_all():
+        for value in stamps:
+            parse_datetime(value)
+
+    slow = timed(strptime_all)
+    fast = timed(codec_all)
+    print("parse {} timestamps: strptime {:.3f}s, parse_datetime {:.3f}s "
+          "({:.1f}x)".format(len(stamps), slow, fast, slow / fast))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "file.json")
+        make_file(path, count)
+        with patch.object(models.base_model, "parse_datetime",
+                          lambda value: datetime.strptime(value,
+                                                          TIME_FORMAT)):
+            slow = timed(lambda: reload(path))
+        fast = timed(lambda: reload(path))
+    print("reload {} objects: strptime {:.3f}s, parse_datetime {:.3f}s "
+          "({:.1f}x)".format(count, slow, fast, slow / fast))
+
+
+if __name__ == "__main__":
+    main()
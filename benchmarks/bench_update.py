@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""
+Compares updating five attributes of a place, with one update command
+and save per attribute as before, with a single storage.update_many(),
+over a storage of synthetic places: milliseconds per place updated.
+
+Usage: python3 -m benchmarks.bench_update [number of places]
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from console import HBNBCommand
+from models import storage
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+ATTRIBUTES = {"name": "Loft", "max_guest": "4", "price_by_night": "120",
+              "latitude": "37.77", "longitude": "-122.41"}
+
+
+def one_by_one(console, id):
+    """Updates the attributes of the place id with one command each."""
+    for name, value in ATTRIBUTES.items():
+        console.onecmd(f"update Place {id} {name} {value}")
+
+
+def at_once(console, id):
+    """Updates the attributes of the place id with update_many()."""
+    storage.update_many("Place." + id, ATTRIBUTES)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    now = datetime.now().isoformat()
+    with tempfile.TemporaryDirectory() as tmp:
+        FileStorage._FileStorage__file_path = os.path.join(tmp, "file.json")
+        FileStorage._FileStorage__objects = {}
+        for i in range(count):
+            storage.new(Place(id=str(i), created_at=now, updated_at=now,
+                              name="Place {}".format(i)))
+        storage.save()
+        console = HBNBCommand(stdout=io.StringIO())
+        for name, update in (("one save per attribute", one_by_one),
+                             ("update_many", at_once)):
+            start = time.perf_counter()
+            for i in range(10):
+                update(console, str(i))
+            seconds = (time.perf_counter() - start) / 10
+            print("{:<24} {:8.2f} ms per place".format(name, 1000 * seconds))
+        FileStorage._FileStorage__file_path = "file.json"
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,14 @@
 #!/usr/bin/python3
 """ a consol to create and update objects"""
+import argparse
+import ast
 import cmd
+import json
+import re
+import sys
+import time
+import warnings
+from itertools import islice
 from models import storage
 from models.base_model import BaseModel
 from models.user import User
@@ -11,6 +19,214 @@ from models.place import Place
 from models.review import Review
 
 
+TOKEN = re.compile(r"""\s*(?:
+    (?P<string>"[^"\\\n]*(?:\\.[^"\\\n]*)*"|'[^'\\\n]*(?:\\.[^'\\\n]*)*')
+  | (?P<number>[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?(?![\w.]))
+  | (?P<name>[^\W\d]\w*)
+  | (?P<symbol>[.(),=:{}\[\]])
+)""", re.VERBOSE)
+CALL = re.compile(r"\s*([^\W\d]\w*)\.([^\W\d]\w*)\((.*)\)\s*$", re.DOTALL)
+CONSTANTS = {"True": True, "False": False, "None": None}
+CLOSING = {"(": ")", "[": "]", "{": "}"}
+
+
+class Command:
+    """A call <class name>.<method>(<arguments>) typed in the console,
+    its arguments parsed into Python values, and their text."""
+    __slots__ = ("class_name", "method", "args", "kwargs", "text")
+
+    def __init__(self, class_name, method, args, kwargs, text):
+        self.class_name = class_name
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self.text = text
+
+
+def tokenize(text):
+    """Returns the (kind, value) tokens of text, strings unquoted and
+    numbers converted, ending with an ("end", "") token.
+    Raises ValueError on a character starting no token."""
+    tokens = []
+    position = 0
+    end = len(text.rstrip())
+    while position < end:
+        match = TOKEN.match(text, position)
+        if match is None:
+            raise ValueError(f"Unexpected {text[position:end]!r}")
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "string":
+            if "\\" in value:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    value = ast.literal_eval(value)
+            else:
+                value = value[1:-1]
+        elif kind == "number":
+            value = float(value) if any(c in value for c in ".eE") \
+                else int(value)
+        tokens.append((kind, value))
+        position = match.end()
+    tokens.append(("end", ""))
+    return tokens
+
+
+def parse_command(line):
+    """Returns the Command of a line <class name>.<method>(<arguments>).
+    Raises ValueError when line is not such a call."""
+    match = CALL.match(line)
+    if match is None:
+        raise ValueError(line)
+    class_name, method, text = match.groups()
+    args, kwargs = parse_arguments(text)
+    return Command(class_name, method, args, kwargs, text)
+
+
+def parse_arguments(text):
+    """Returns the positional and keyword arguments written in text as
+    Python literals, such as '"city_id", avg="price_by_night"'; a bare
+    name stands for the string of that name.
+    Raises ValueError when text is not such a list of arguments."""
+    tokens = tokenize(text)
+    end = len(tokens) - 1
+    args = []
+    kwargs = {}
+    position = 0
+    try:
+        while position < end:
+            kind, value = tokens[position]
+            if kind == "name" and tokens[position + 1] == ("symbol", "="):
+                if value in kwargs:
+                    raise ValueError(f"Repeated argument {value}")
+                kwargs[value], position = _value(tokens, position + 2)
+            elif kwargs:
+                raise ValueError("Positional argument after keywords")
+            else:
+                value, position = _value(tokens, position)
+                args.append(value)
+            if position < end and tokens[position] != ("symbol", ","):
+                raise ValueError(f"Unexpected {tokens[position][1]!r}")
+            position += 1
+    except RecursionError:
+        raise ValueError("Values nested too deeply") from None
+    return args, kwargs
+
+
+def _value(tokens, position):
+    """Returns the value starting at tokens[position] and the position of
+    the token following it.
+    Raises ValueError when no value starts there."""
+    kind, value = tokens[position]
+    if kind == "name":
+        return CONSTANTS.get(value, value), position + 1
+    if kind != "symbol":
+        if kind == "end":
+            raise ValueError("Missing value")
+        return value, position + 1
+    if value not in CLOSING:
+        raise ValueError(f"Unexpected {value!r}")
+    closing = ("symbol", CLOSING[value])
+    items = []
+    position += 1
+    while tokens[position] != closing:
+        item, position = _value(tokens, position)
+        if value == "{":
+            if tokens[position] != ("symbol", ":"):
+                raise ValueError("Missing ':'")
+            key = item
+            item, position = _value(tokens, position + 1)
+            item = (key, item)
+        items.append(item)
+        if tokens[position] == ("symbol", ","):
+            position += 1
+        elif tokens[position] != closing:
+            raise ValueError(f"Unexpected {tokens[position][1]!r}")
+    if value == "[":
+        return items, position + 1
+    if value == "(":
+        return tuple(items), position + 1
+    try:
+        return dict(items), position + 1
+    except TypeError:
+        raise ValueError("Unhashable key") from None
+
+
+def format_lines(objects, jsonl=False):
+    """Yields the line printed by all for each of objects: its string
+    and dictionary representations, or only its dictionary as JSON when
+    jsonl is True, so each object is serialized once."""
+    if jsonl:
+        for obj in objects:
+            yield json.dumps(obj.to_dict()) + "\n"
+    else:
+        for obj in objects:
+            yield f"[{str(obj)} {obj.to_dict()}]\n"
+
+
+def convert_value(current, value):
+    """Returns value, a string typed in the console, converted to the
+    type of current, the value of the attribute it replaces, or to a
+    number when the attribute has no value and value reads as one."""
+    if current is not None:
+        if isinstance(current, int):
+            return int(value)
+        if isinstance(current, float):
+            return float(value)
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+
+class ScriptOutput:
+    """Text stream of a console running a script: passes the lines it
+    prints to stdout and its error messages, prefixed with the script name
+    and the number of the line running, to stderr."""
+
+    def __init__(self, name, stdout, stderr):
+        self.name = name
+        self.stdout = stdout
+        self.stderr = stderr
+        self.line = 0
+        self.errors = 0
+        self.__partial = ""
+
+    def write(self, text):
+        """Writes text, holding back a line starting with * until it ends
+        to tell whether it is an error message."""
+        text, self.__partial = self.__partial + text, ""
+        while text.startswith("*"):
+            line, newline, text = text.partition("\n")
+            if not newline:
+                self.__partial = line
+                return
+            if line.startswith("** ") or line.startswith("*** "):
+                self.error(line)
+            else:
+                self.stdout.write(line + "\n")
+        if text:
+            self.stdout.write(text)
+
+    def writelines(self, lines):
+        """Writes each of lines."""
+        for line in lines:
+            self.write(line)
+
+    def error(self, message):
+        """Writes message to stderr with the number of the line running."""
+        self.errors += 1
+        self.stderr.write(f"{self.name}:{self.line}: {message}\n")
+
+    def flush(self):
+        """Flushes stdout."""
+        self.stdout.flush()
+
+
 class HBNBCommand(cmd.Cmd):
     """the console class"""
     class_mapping = {
@@ -23,36 +239,184 @@ class HBNBCommand(cmd.Cmd):
         "Review": Review
     }
     prompt = "(hbnb) "
+    query_methods = ("all", "count", "where", "nearby", "within", "search",
+                     "aggregate")
 
     def readline(self):
         return input(self.prompt)
 
     def default(self, lines):
         """the cmds's default method to manipulate
-        commands with this form <class_name>.<method>"""
-        line = lines.split('.')
-        all_count = {
-            "all()": self.do_all,
-            "count()": self.do_count
-        }
-
-        if line[0] in self.class_mapping:
-            if line[1] in all_count:
-                all_count[line[1]](f"{line[0]} {line[1]}")
-            elif line[1].startswith("show"):
-                show_id = line[1].split('"')[1]
-                self.do_show(f"{line[0]} {show_id}")
-            elif line[1].startswith("destroy"):
-                destr_id = line[1].split('"')[1]
-                self.do_destroy(f"{line[0]} {destr_id}")
-            elif line[1].startswith("update"):
-                update_args = line[1].split('"')
-                update_class = line[0]
-                update_id = update_args[1]
-                update_attr = update_args[3]
-                update_value = update_args[5]
-                self.do_update(f"{update_class} {update_id}"
-                               f"{update_attr} {update_value}")
+        commands with this form <class_name>.<method>(<arguments>)"""
+        try:
+            command = parse_command(lines)
+        except ValueError:
+            command = None
+        if command is None or command.method not in self.query_methods and \
+                command.method not in ("show", "destroy", "update"):
+            print(f"*** Unknown syntax: {lines}", file=self.stdout)
+            return
+        if command.class_name not in self.class_mapping:
+            print("** class doesn't exist **", file=self.stdout)
+            return
+        if command.method in self.query_methods:
+            handlers = {"all": self.__all, "count": self.__count,
+                        "where": self.__where, "nearby": self.__nearby,
+                        "within": self.__within, "search": self.__search,
+                        "aggregate": self.__aggregate}
+            handlers[command.method](command.class_name, command.args,
+                                     command.kwargs)
+            return
+        instance = self.__find(command.class_name, command.args)
+        if instance is None:
+            return
+        if command.method == "show":
+            print(instance, file=self.stdout)
+            return
+        if command.method == "destroy":
+            storage.delete(instance)
+            storage.save()
+            return
+        args = command.args[1:]
+        if len(args) == 1 and isinstance(args[0], dict):
+            args = [item for pair in args[0].items() for item in pair]
+        if not args or not all(isinstance(name, str) for name in args[::2]):
+            print("** attribute name missing **", file=self.stdout)
+        elif len(args) % 2:
+            print("** value missing **", file=self.stdout)
+        else:
+            self.__update(instance, dict(zip(args[::2], args[1::2])))
+
+    def __find(self, class_name, args):
+        """Returns the instance of class_name whose id is the first of
+        args, or None once the reason there is none is printed."""
+        if class_name not in self.class_mapping:
+            print("** class doesn't exist **", file=self.stdout)
+            return None
+        if not args:
+            print("** instance id missing **", file=self.stdout)
+            return None
+        instance = storage.get(class_name, str(args[0]))
+        if instance is None:
+            print("** no instance found **", file=self.stdout)
+        return instance
+
+    def __update(self, instance, attributes):
+        """Sets the attributes of instance with storage.update_many(),
+        which converts the values of the declared ones and saves once, the
+        strings of the others converted by convert_value(); id and
+        timestamps are kept."""
+        attributes = {name: value for name, value in attributes.items()
+                      if name not in ("id", "created_at", "updated_at")}
+        if not attributes:
+            return
+        try:
+            for name, value in attributes.items():
+                if isinstance(value, str) and name not in instance._fields:
+                    attributes[name] = convert_value(
+                        getattr(instance, name, None), value)
+            storage.update_many(f"{type(instance).__name__}.{instance.id}",
+                                attributes)
+        except ValueError as error:
+            print(f"** invalid value, {error} **", file=self.stdout)
+
+    def parse_script(self, lines):
+        """Returns the (line number, command, argument, line) of each
+        command of a script, leaving out blank lines and the comments
+        starting with #, and the list of the lines holding no command."""
+        commands = []
+        unknown = []
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            command, arg, line = self.parseline(line)
+            if command in self.class_mapping and arg.startswith("."):
+                command = None
+            elif not command or not hasattr(self, "do_" + command):
+                unknown.append((number, line))
+                continue
+            commands.append((number, command, arg, line))
+        return commands, unknown
+
+    def run_script(self, lines, name="<stdin>", stderr=None):
+        """Runs the commands of a script, given as lines, saving once at
+        its end, and returns the number of errors.
+
+        The whole script is parsed first and nothing runs if a line holds
+        no command. Its begin, commit and rollback lines work as they do
+        one at a time; a begin left open is rolled back and reported.
+        Error messages go to stderr with their line number, followed by
+        the number of commands run per second."""
+        stderr = stderr or sys.stderr
+        output = ScriptOutput(name, self.stdout, stderr)
+        commands, unknown = self.parse_script(lines)
+        for output.line, line in unknown:
+            output.error(f"*** Unknown syntax: {line}")
+        if unknown:
+            return output.errors
+        self.stdout = output
+        count = 0
+        opened = []
+        start = time.perf_counter()
+        storage.begin()
+        try:
+            for output.line, command, arg, line in commands:
+                count += 1
+                if command in ("begin", "commit", "rollback"):
+                    self.__script_batch(command, opened, output.line)
+                    continue
+                try:
+                    if command:
+                        stop = getattr(self, "do_" + command)(arg)
+                    else:
+                        stop = self.default(line)
+                except Exception as error:
+                    print(f"** error: {error} **", file=output)
+                    stop = False
+                if stop:
+                    break
+        except BaseException:
+            storage.rollback()
+            raise
+        finally:
+            self.stdout = output.stdout
+        if opened:
+            storage.rollback()
+            output.line = opened[0]
+            output.error("** begin without commit, its changes are "
+                         "discarded **")
+        else:
+            storage.commit()
+        seconds = time.perf_counter() - start
+        print(f"{name}: {count} commands in {seconds:.3f} s, "
+              f"{count / max(seconds, 1e-9):.0f} commands/s, "
+              f"{output.errors} errors", file=stderr)
+        return output.errors
+
+    @staticmethod
+    def __script_batch(command, opened, number):
+        """Runs the begin, commit or rollback of line number of a script,
+        whose other commands run in a batch of its own: that batch is
+        committed before the first begin and started again once the
+        batches of the script end. opened holds the lines of the begins
+        not committed yet."""
+        if command == "begin":
+            if not opened:
+                storage.commit()
+            storage.begin()
+            opened.append(number)
+            return
+        if not opened:
+            return
+        if command == "commit":
+            storage.commit()
+            opened.pop()
+        else:
+            storage.rollback()
+            opened.clear()
+        if not opened:
+            storage.begin()
 
     def do_quit(self, arg):
         """Quit command to exit the program"""
@@ -66,19 +430,31 @@ class HBNBCommand(cmd.Cmd):
         """handling ctrl+D"""
         return True
 
+    def do_begin(self, arg):
+        """Starts a batch: changes are only saved by commit"""
+        storage.begin()
+
+    def do_commit(self, arg):
+        """Ends the batch started by begin and saves its changes once"""
+        storage.commit()
+
+    def do_rollback(self, arg):
+        """Ends the batch started by begin and discards its changes"""
+        storage.rollback()
+
     def do_create(self, arg):
         """creates a new instance of a specified class and prints its ID"""
         if not arg:
-            print("** class name missing **")
+            print("** class name missing **", file=self.stdout)
             return
         class_name = arg.split()[0]
 
         if class_name in HBNBCommand.class_mapping:
             obj = HBNBCommand.class_mapping[class_name]()
             obj.save()
-            print(obj.id)
+            print(obj.id, file=self.stdout)
         else:
-            print("** class doesn't exist **")
+            print("** class doesn't exist **", file=self.stdout)
 
     def do_show(self, arg):
         """Prints the string representation of an
@@ -86,46 +462,259 @@ class HBNBCommand(cmd.Cmd):
         args = arg.split()
 
         if not args:
-            print("** class name missing **")
+            print("** class name missing **", file=self.stdout)
             return
 
-        class_name = args[0]
+        instance = self.__find(args[0], args[1:])
 
-        if class_name not in HBNBCommand.class_mapping:
-            print("** class doesn't exist **")
+        if instance is None:
             return
 
-        if len(args) < 2:
-            print("** instance id missing **")
+        print(instance, file=self.stdout)
+
+    def do_all(self, arg):
+        """Prints all string representation of all
+        instances based or not on the class name, each line as soon as
+        it is formatted:
+        all [<class name>] [limit=<n>] [offset=<n>] [cursor=<id>]
+        [--format=jsonl]
+        cursor starts after the instance of that id, such as the last
+        one of the previous page, and --format=jsonl prints the JSON
+        dictionary of each instance instead."""
+        words = arg.replace(',', ' ').split()
+        class_name = None
+        if words and '=' not in words[0]:
+            class_name = words.pop(0)
+            if class_name not in self.class_mapping:
+                print("** class doesn't exist **", file=self.stdout)
+                return
+        options = {}
+        for word in words:
+            name, equal, value = word.partition('=')
+            if not equal:
+                print("** invalid query **", file=self.stdout)
+                return
+            options[name.lstrip('-')] = value.strip('"\'')
+        self.__all(class_name, [], options)
+
+    def __all(self, class_name, args, options):
+        """Prints the instances of class_name, or of every class when it
+        is None, paged by the limit, offset and cursor of options and
+        printed in their format."""
+        try:
+            if args or set(options) - {"limit", "offset", "cursor",
+                                       "format"}:
+                raise ValueError(options)
+            offset = int(options.get("offset", 0))
+            limit = options.get("limit")
+            limit = None if limit is None else offset + int(limit)
+            if offset < 0 or limit is not None and limit < offset or \
+                    options.get("format", "text") not in ("text", "jsonl"):
+                raise ValueError(options)
+        except (ValueError, TypeError):
+            print("** invalid query **", file=self.stdout)
+            return
+        objects = storage.all(class_name)
+        items = iter(objects.items())
+        cursor = options.get("cursor")
+        if cursor is not None:
+            cursor = str(cursor)
+            if class_name and not cursor.startswith(class_name + '.'):
+                cursor = f"{class_name}.{cursor}"
+            if cursor not in objects:
+                print("** no instance found **", file=self.stdout)
+                return
+            for key, obj in items:
+                if key == cursor:
+                    break
+        objects = (obj for key, obj in islice(items, offset, limit))
+        self.stdout.writelines(format_lines(
+            objects, options.get("format") == "jsonl"))
+
+    def do_where(self, arg):
+        """Prints the instances of a class matching conditions, such as
+        where Place price_by_night__lt=100, max_guest__gte=4, sorted with
+        order_by="price_by_night" and cut with offset=0, limit=20."""
+        class_name, _, conditions = arg.strip().partition(' ')
+        if not class_name:
+            print("** class name missing **", file=self.stdout)
+            return
+        if class_name not in self.class_mapping:
+            print("** class doesn't exist **", file=self.stdout)
+            return
+        try:
+            args, kwargs = parse_arguments(conditions)
+        except ValueError:
+            print("** invalid query **", file=self.stdout)
             return
+        self.__where(class_name, args, kwargs)
 
-        instance_id = args[1]
-        key = "{}.{}".format(class_name, instance_id)
+    def __where(self, class_name, args, kwargs):
+        """Prints the instances of class_name matching the conditions of
+        kwargs, sorted and cut by its order_by, offset and limit."""
+        try:
+            if args:
+                raise ValueError(args)
+            kwargs = dict(kwargs)
+            order = kwargs.pop("order_by", ())
+            offset = kwargs.pop("offset", 0)
+            limit = kwargs.pop("limit", None)
+            if isinstance(order, str):
+                order = (order,)
+            query = storage.query(class_name).where(**kwargs) \
+                .order_by(*order).offset(offset).limit(limit)
+            objects = query.all()
+        except (ValueError, TypeError):
+            print("** invalid query **", file=self.stdout)
+            return
+        for obj in objects:
+            print(f"[{str(obj)} {obj.to_dict()}]", file=self.stdout)
+
+    def do_aggregate(self, arg):
+        """Prints one line per group of instances of a class with its count
+        and aggregates, largest group first, such as
+        aggregate Place "city_id", avg="price_by_night", limit=10
+        where sum, avg, min and max each take an attribute or a list."""
+        class_name, _, arguments = arg.strip().partition(' ')
+        if not class_name:
+            print("** class name missing **", file=self.stdout)
+            return
+        if class_name not in self.class_mapping:
+            print("** class doesn't exist **", file=self.stdout)
+            return
+        try:
+            args, kwargs = parse_arguments(arguments)
+        except ValueError:
+            print("** invalid query **", file=self.stdout)
+            return
+        self.__aggregate(class_name, args, kwargs)
 
-        if key not in storage.all():
-            print("** no instance found **")
+    def __aggregate(self, class_name, args, kwargs):
+        """Prints one line per group of the instances of class_name on the
+        attribute of args, with the aggregates of kwargs."""
+        try:
+            if len(args) != 1 or not isinstance(args[0], str):
+                raise ValueError(args)
+            rows = storage.aggregate(class_name, args[0], **kwargs)
+        except (ValueError, TypeError):
+            print("** invalid query **", file=self.stdout)
+            return
+        for row in rows:
+            print(row, file=self.stdout)
+
+    def do_nearby(self, arg):
+        """Prints the instances of a class located within a radius of a
+        point, nearest first: nearby Place <lat> <lon> <radius_km> [limit]"""
+        class_name, _, location = arg.strip().partition(' ')
+        if not class_name:
+            print("** class name missing **", file=self.stdout)
+            return
+        if class_name not in self.class_mapping:
+            print("** class doesn't exist **", file=self.stdout)
             return
+        self.__nearby(class_name, location.replace(',', ' ').split(), {})
 
-        print(storage.all()[key])
+    def __nearby(self, class_name, args, kwargs):
+        """Prints the instances of class_name within the radius of args
+        around their latitude and longitude, nearest first."""
+        try:
+            values = [float(value) for value in args]
+            if len(values) not in (3, 4) or kwargs:
+                raise ValueError(args)
+            limit = int(values[3]) if len(values) == 4 else None
+            objects = storage.nearby(class_name, *values[:3], limit)
+        except (ValueError, TypeError):
+            print("** invalid query **", file=self.stdout)
+            return
+        for obj in objects:
+            print(f"[{str(obj)} {obj.to_dict()}]", file=self.stdout)
+
+    def do_within(self, arg):
+        """Prints the instances of a class located inside a box:
+        within Place <south> <west> <north> <east>"""
+        class_name, _, box = arg.strip().partition(' ')
+        if not class_name:
+            print("** class name missing **", file=self.stdout)
+            return
+        if class_name not in self.class_mapping:
+            print("** class doesn't exist **", file=self.stdout)
+            return
+        self.__within(class_name, box.replace(',', ' ').split(), {})
 
-    def do_all(self, arg):
-        """Prints all string representation of all
-        instances based or not on the class name."""
-        args = arg.split()
-        if not args:
-            objects = storage.all().values()
+    def __within(self, class_name, args, kwargs):
+        """Prints the instances of class_name inside the box of args: south,
+        west, north and east."""
+        try:
+            values = [float(value) for value in args]
+            if len(values) != 4 or kwargs:
+                raise ValueError(args)
+        except (ValueError, TypeError):
+            print("** invalid query **", file=self.stdout)
+            return
+        for obj in storage.within(class_name, *values).values():
+            print(f"[{str(obj)} {obj.to_dict()}]", file=self.stdout)
+
+    def do_search(self, arg):
+        """Prints the instances whose text contains the given words, best
+        match first: search [<class name>] <words>"""
+        words = arg.split()
+        class_name = None
+        if words and words[0] in self.class_mapping:
+            class_name = words.pop(0)
+        self.__search(class_name, words, {})
+
+    def __search(self, class_name, args, kwargs):
+        """Prints the instances of class_name, or of every class when it
+        is None, whose text contains the words of args."""
+        if kwargs or not all(isinstance(arg, str) for arg in args):
+            print("** invalid query **", file=self.stdout)
+            return
+        words = " ".join(args)
+        if not words.strip():
+            print("** search text missing **", file=self.stdout)
+            return
+        for obj in storage.search(words, class_name):
+            print(f"[{str(obj)} {obj.to_dict()}]", file=self.stdout)
+
+    def do_import(self, arg):
+        """Stores the instances of a class read from a JSON Lines file, or
+        a CSV file with a header row, and prints their number:
+        import <class name> <file>"""
+        class_name, path = self.__bulk_arguments(arg)
+        if path is None:
+            return
+        try:
+            count = storage.import_file(class_name, path)
+        except FileNotFoundError:
+            print("** file doesn't exist **", file=self.stdout)
+            return
+        except ValueError as error:
+            print(f"** invalid record, {error} **", file=self.stdout)
+            return
+        print(count, file=self.stdout)
+
+    def do_export(self, arg):
+        """Writes the instances of a class to a JSON Lines file, or a CSV
+        file when its name ends with .csv, and prints their number:
+        export <class name> <file>"""
+        class_name, path = self.__bulk_arguments(arg)
+        if path is not None:
+            print(storage.export_file(class_name, path), file=self.stdout)
+
+    def __bulk_arguments(self, arg):
+        """Returns the class name and file path of an import or export
+        command, with a None path once the error is printed."""
+        class_name, _, path = arg.strip().partition(' ')
+        path = path.strip().strip('"\'')
+        if not class_name:
+            print("** class name missing **", file=self.stdout)
+        elif class_name not in self.class_mapping:
+            print("** class doesn't exist **", file=self.stdout)
+        elif not path:
+            print("** file name missing **", file=self.stdout)
         else:
-            class_name = args[0]
-            if class_name not in self.class_mapping:
-                print("** class doesn't exist **")
-                return
-            objects = [obj for obj in storage.all().values()
-                       if obj.__class__.__name__ == class_name]
-        formatted_objects = []
-        for obj in objects:
-            formatted_objects.append(f"[{str(obj)} {obj.to_dict()}]")
-        for formatted_obj in formatted_objects:
-            print(formatted_obj)
+            return class_name, path
+        return class_name, None
 
     def do_count(self, arg):
         """
@@ -133,37 +722,42 @@ class HBNBCommand(cmd.Cmd):
         Usage: <class name>.count()
         Example: User.count()
         """
-        count = len([val for key, val in storage.all().items() if
-                     key.startswith(arg[0])])
-        print(count)
-
-    def do_destroy(self, arg):
-        """Deletes an instance based on the class
-        name and id (save the change into the JSON file)."""
         args = arg.split()
 
         if not args:
-            print("** class name missing **")
+            print("** class name missing **", file=self.stdout)
             return
 
         class_name = args[0]
 
         if class_name not in HBNBCommand.class_mapping:
-            print("** class doesn't exist **")
+            print("** class doesn't exist **", file=self.stdout)
             return
 
-        if len(args) < 2:
-            print("** instance id missing **")
+        self.__count(class_name, args[1:], {})
+
+    def __count(self, class_name, args, kwargs):
+        """Prints the number of instances of class_name."""
+        if args or kwargs:
+            print("** invalid query **", file=self.stdout)
             return
+        print(storage.count(class_name), file=self.stdout)
 
-        instance_id = args[1]
-        key = "{}.{}".format(class_name, instance_id)
+    def do_destroy(self, arg):
+        """Deletes an instance based on the class
+        name and id (save the change into the JSON file)."""
+        args = arg.split()
+
+        if not args:
+            print("** class name missing **", file=self.stdout)
+            return
+
+        instance = self.__find(args[0], args[1:])
 
-        if key not in storage.all():
-            print("** no instance found **")
+        if instance is None:
             return
 
-        del storage.all()[key]
+        storage.delete(instance)
         storage.save()
 
     def do_update(self, arg):
@@ -175,65 +769,48 @@ class HBNBCommand(cmd.Cmd):
         args = arg.split()
 
         if not args:
-            print("** class name missing **")
+            print("** class name missing **", file=self.stdout)
             return
 
-        class_name = args[0]
+        instance = self.__find(args[0], args[1:])
 
-        if class_name not in HBNBCommand.class_mapping:
-            print("** class doesn't exist **")
-            return
-
-        if len(args) < 2:
-            print("** instance id missing **")
-            return
-
-        instance_id = args[1]
-        key = "{}.{}".format(class_name, instance_id)
-
-        if key not in storage.all():
-            print("** no instance found **")
+        if instance is None:
             return
 
         if len(args) < 3:
-            print("** attribute name missing **")
+            print("** attribute name missing **", file=self.stdout)
             return
 
         attribute_name = args[2]
-        instance = storage.all()[key]
 
         if len(args) < 4:
-            print("** value missing **")
+            print("** value missing **", file=self.stdout)
             return
 
-        value = args[3]
-
-        if attribute_name in ["id", "created_at", "updated_at"]:
-            return
-        try:
-            attr = getattr(instance, attribute_name, None)
-        except Exception:
-            pass
-
-        value = str(value)
-        value = value.strip('"')
-        if attr is not None:
-            if isinstance(attr, int):
-                value = int(value)
-            if isinstance(attr, float):
-                value = float(value)
-        else:
-            try:
-                value = int(value)
-            except ValueError:
-                try:
-                    value = float(value)
-                except ValueError:
-                    pass
-
-        setattr(instance, attribute_name, value)
-        instance.save()
+        self.__update(instance, {attribute_name: args[3].strip('"')})
 
 
 if __name__ == '__main__':
-    HBNBCommand().cmdloop()
+    parser = argparse.ArgumentParser(
+        description="Console of the HBNB objects, interactive unless a "
+                    "script is given or piped to it.")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--serve", metavar="ADDRESS",
+                      help="serve console sessions on HOST:PORT or "
+                           "unix:PATH")
+    mode.add_argument("--script", metavar="FILE",
+                      help="run the commands of FILE, saving once")
+    options = parser.parse_args()
+    if options.serve:
+        import server
+        server.main(options.serve)
+    elif options.script:
+        with open(options.script, encoding="utf-8") as file:
+            lines = file.readlines()
+        sys.exit(1 if HBNBCommand().run_script(lines, options.script)
+                 else 0)
+    elif not sys.stdin.isatty():
+        sys.exit(1 if HBNBCommand().run_script(sys.stdin.readlines())
+                 else 0)
+    else:
+        HBNBCommand().cmdloop()
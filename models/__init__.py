@@ -1,8 +1,19 @@
 #!/usr/bin/python3
 """
 This module initializes the storage engine.
+
+HBNB_TYPE_STORAGE=db selects the SQLite engine, HBNB_TYPE_STORAGE=mmap
+the memory-mapped record engine, any other value the JSON file engine.
 """
+import os
 from models.engine.file_storage import FileStorage
 
-storage = FileStorage()
+if os.getenv("HBNB_TYPE_STORAGE") == "db":
+    from models.engine.db_storage import DBStorage
+    storage = DBStorage()
+elif os.getenv("HBNB_TYPE_STORAGE") == "mmap":
+    from models.engine.mmap_storage import MmapStorage
+    storage = MmapStorage()
+else:
+    storage = FileStorage()
 storage.reload()
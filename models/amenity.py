@@ -2,11 +2,19 @@
 """
 Amenity class for the AirBnB clone project.
 """
-from models.base_model import BaseModel
+import models
+from models.base_model import BaseModel, compact
 
 
+@compact
 class Amenity(BaseModel):
     """
     Amenity class that inherits from BaseModel.
     """
     name = ""
+
+    @property
+    def places(self):
+        """The Place instances listing this Amenity in amenity_ids."""
+        related = models.storage.related("Place", "amenity_ids", self.id)
+        return list(related.values())
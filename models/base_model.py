@@ -5,8 +5,47 @@ This module defines the BaseModel class, which serves as the base class
 for other classes.
 """
 
+import os
 import uuid
 from datetime import datetime
+import models
+from models.timestamp import parse_datetime, format_datetime
+
+COMPACT = os.getenv("HBNB_COMPACT_MODELS") == "1"
+_ORDERS = {}
+
+
+def compact(cls):
+    """
+    Class decorator recording the attributes declared on a model class,
+    with their defaults, in cls._fields.
+
+    When HBNB_COMPACT_MODELS=1, the class is rebuilt so these attributes
+    are stored in __slots__ instead of the instance __dict__, which only
+    keeps id, the timestamps and the extra attributes set by update.
+    An attribute that was never set still reads as its declared default.
+    The order in which the attributes were first set is kept in the
+    _order slot, a tuple shared by the instances set in the same order.
+
+    Args:
+        cls (type): The model class.
+
+    Returns:
+        type: cls, or its compact rebuild.
+    """
+    fields = {name: value for name, value in vars(cls).items()
+              if not name.startswith("_") and not callable(value) and
+              not hasattr(value, "__get__")}
+    if not COMPACT:
+        cls._fields = fields
+        return cls
+    namespace = {name: value for name, value in vars(cls).items()
+                 if name not in fields and
+                 name not in ("__dict__", "__weakref__")}
+    namespace["__slots__"] = tuple(fields) + ("_order",)
+    namespace["_fields"] = fields
+    namespace["_slots"] = tuple(fields)
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
 
 
 class BaseModel:
@@ -17,7 +56,15 @@ class BaseModel:
         id (str): A unique identifier generated using UUID.
         created_at (datetime): The creation timestamp.
         updated_at (datetime): The last update timestamp.
+
+    Setting any attribute marks the instance as dirty so storage knows it
+    has to serialize it again on the next save, and tells storage about
+    the attributes it indexes. The flag lives in a slot,
+    outside __dict__, so it never shows up in __str__ or to_dict().
     """
+    __slots__ = ("__dict__", "__weakref__", "_dirty")
+    _fields = {}
+    _slots = ()
 
     def __init__(self, *args, **kwargs):
         """
@@ -31,25 +78,79 @@ class BaseModel:
             **kwargs: Dictionary with attribute values.
         """
         from . import storage
-        tf = "%Y-%m-%dT%H:%M:%S.%f"
         if kwargs:
             if "id" not in kwargs:
                 kwargs["id"] = str(uuid.uuid4())
             if "created_at" in kwargs:
-                kwargs["created_at"] = datetime.strptime(kwargs["created_at"],
-                                                         tf)
+                kwargs["created_at"] = parse_datetime(kwargs["created_at"])
+            else:
+                kwargs["created_at"] = datetime.now()
             if "updated_at" in kwargs:
-                kwargs["updated_at"] = datetime.strptime(kwargs["updated_at"],
-                                                         tf)
-            for key, value in kwargs.items():
-                if key != '__class__':
-                    setattr(self, key, value)
+                kwargs["updated_at"] = parse_datetime(kwargs["updated_at"])
+            else:
+                kwargs["updated_at"] = kwargs["created_at"]
+            kwargs.pop('__class__', None)
+            if self._slots:
+                self.__ordered(tuple(kwargs))
+            for name in self._slots:
+                if name in kwargs:
+                    object.__setattr__(self, name, kwargs.pop(name))
+            self.__dict__.update(kwargs)
+            self._dirty = True
         else:
+            if self._slots:
+                self.__ordered(())
             self.id = str(uuid.uuid4())
             self.created_at = datetime.now()
             self.updated_at = self.created_at
             storage.new(self)
 
+    def __setattr__(self, name, value):
+        """Sets the attribute and marks the instance as dirty."""
+        object.__setattr__(self, name, value)
+        if name != "_dirty":
+            clean = getattr(self, "_dirty", True) is False
+            object.__setattr__(self, "_dirty", True)
+            if clean:
+                models.storage.modified(self)
+            if self._slots and name not in self._order:
+                self.__ordered(self._order + (name,))
+            if name in models.storage.watched:
+                models.storage.changed(self, name)
+
+    def __getattr__(self, name):
+        """Returns the declared default of a slot that was never set."""
+        try:
+            return type(self)._fields[name]
+        except KeyError:
+            raise AttributeError("'{}' object has no attribute '{}'".format(
+                type(self).__name__, name)) from None
+
+    def __ordered(self, order):
+        """Sets the _order slot of a compact instance to order, shared
+        with the other instances whose attributes were set in that order."""
+        object.__setattr__(self, "_order", _ORDERS.setdefault(order, order))
+
+    def __attributes(self):
+        """
+        Returns the attributes of the instance, including the ones stored
+        in slots by a compact model, in the order __dict__ would list them:
+        the order in which they were first set.
+        """
+        if not self._slots:
+            return self.__dict__
+        attributes = {}
+        for name in self._order:
+            if name in self.__dict__:
+                attributes[name] = self.__dict__[name]
+            elif name in self._slots:
+                try:
+                    attributes[name] = object.__getattribute__(self, name)
+                except AttributeError:
+                    pass
+        attributes.update(self.__dict__)
+        return attributes
+
     def __str__(self):
         """
         Returns a string representation of the BaseModel.
@@ -59,12 +160,16 @@ class BaseModel:
             and dictionary representation.
         """
         return "[{}] ({}) {}".format(self.__class__.__name__,
-                                     self.id, self.__dict__)
+                                     self.id, self.__attributes())
 
     def save(self):
         from . import storage
-        """Update the `updated_at` attribute with the current datetime."""
+        """Update the `updated_at` attribute with the current datetime,
+        index again the watched attributes, which may have been changed in
+        place, and save the storage."""
         self.updated_at = datetime.now()
+        for name in storage.watched:
+            storage.changed(self, name)
         storage.save()
 
     def to_dict(self):
@@ -76,8 +181,8 @@ class BaseModel:
             with proper formatting.
         """
         class_name = self.__class__.__name__
-        data = self.__dict__.copy()
+        data = self.__attributes().copy()
         data['__class__'] = class_name
-        data['created_at'] = self.created_at.isoformat()
-        data['updated_at'] = self.updated_at.isoformat()
+        data['created_at'] = format_datetime(self.created_at)
+        data['updated_at'] = format_datetime(self.updated_at)
         return data
@@ -2,12 +2,20 @@
 """
 City class for the AirBnB clone project.
 """
-from models.base_model import BaseModel
+import models
+from models.base_model import BaseModel, compact
 
 
+@compact
 class City(BaseModel):
     """
     City class that inherits from BaseModel.
     """
     state_id = ""
     name = ""
+
+    @property
+    def places(self):
+        """The Place instances whose city_id is the id of this City."""
+        related = models.storage.related("Place", "city_id", self.id)
+        return list(related.values())
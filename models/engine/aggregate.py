@@ -0,0 +1,215 @@
+#!/usr/bin/python3
+"""
+This module groups objects by an attribute and aggregates other attributes
+over each group, such as the average Place.price_by_night of every city.
+
+The attributes are first extracted into columns, one list per attribute,
+and the columns are reduced with NumPy when it is installed, or with plain
+Python otherwise.
+"""
+from collections import Counter
+from operator import attrgetter
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+FUNCTIONS = ("sum", "avg", "min", "max")
+
+
+def aggregate(objects, group_by, limit=None, **aggregations):
+    """
+    Groups objects by their group_by attribute and aggregates each group.
+
+    A group_by value that is a list, such as Place.amenity_ids, puts the
+    object in the group of every item of the list. Only the values that are
+    numbers are aggregated; the others are left out of sum, avg, min and
+    max, which are None for a group without any.
+
+    Args:
+        objects: An iterable of the objects to aggregate.
+        group_by (str): The attribute to group on.
+        limit (int): The number of groups to return, all when None.
+        aggregations: Maps each of sum, avg, min and max to the attribute,
+            or tuple of attributes, to aggregate with it.
+
+    Returns:
+        list: One dictionary per group, largest group first, holding the
+        group_by value, the number of objects in "count" and every
+        aggregate under "<function>_<attribute>".
+
+    Raises:
+        ValueError: If an aggregation is not one of sum, avg, min and max.
+    """
+    columns = {}
+    for function, attributes in aggregations.items():
+        if function not in FUNCTIONS:
+            raise ValueError("Unknown aggregation: {}".format(function))
+        if isinstance(attributes, str):
+            attributes = (attributes,)
+        for attribute in attributes:
+            columns.setdefault(attribute, []).append(function)
+    objects = list(objects)
+    groups = extract(objects, group_by)
+    rows = None
+    if set(map(type, groups)) & {list, tuple}:
+        rows = [i for i, value in enumerate(groups) for item in
+                (value if isinstance(value, (list, tuple)) else (value,))]
+        groups = [item for value in groups for item in
+                  (value if isinstance(value, (list, tuple)) else (value,))]
+    try:
+        labels = {label: code for code, label in
+                  enumerate(dict.fromkeys(groups))}
+    except TypeError:
+        groups = [_hashable(value) for value in groups]
+        labels = {label: code for code, label in
+                  enumerate(dict.fromkeys(groups))}
+    codes = list(map(labels.__getitem__, groups))
+    count, reduce = _count_python, _reduce_python
+    if numpy is not None:
+        count, reduce = _count_numpy, _reduce_numpy
+        codes = numpy.array(codes, dtype=numpy.intp)
+    results = {"count": count(codes, len(labels))}
+    for attribute, functions in columns.items():
+        values = _numbers(extract(objects, attribute))
+        if rows is not None:
+            values = [values[i] for i in rows]
+        reduced = reduce(functions, codes, values, len(labels))
+        for function in functions:
+            results["{}_{}".format(function, attribute)] = reduced[function]
+    table = [dict({group_by: label},
+                  **{name: column[code] for name, column in results.items()})
+             for label, code in labels.items()]
+    table.sort(key=lambda row: (-row["count"], str(row[group_by])))
+    return table if limit is None else table[:limit]
+
+
+def extract(objects, attribute):
+    """
+    Returns the column of the values of attribute of objects, None for
+    the objects without it.
+    """
+    getter = attrgetter(attribute)
+    try:
+        return list(map(getter, objects))
+    except AttributeError:
+        return [getattr(obj, attribute, None) for obj in objects]
+
+
+def _numbers(column):
+    """
+    Returns column with None in place of the values that are not numbers.
+    """
+    if set(map(type, column)) <= {int, float}:
+        return column
+    return [value if isinstance(value, (int, float)) and
+            not isinstance(value, bool) else None for value in column]
+
+
+def _hashable(value):
+    """Returns value, or its text when it cannot be a dictionary key."""
+    try:
+        hash(value)
+    except TypeError:
+        return str(value)
+    return value
+
+
+def _count_python(codes, size):
+    """Returns the number of codes of each of the size groups."""
+    counts = Counter(codes)
+    return [counts[code] for code in range(size)]
+
+
+def _reduce_python(functions, codes, values, size):
+    """
+    Returns a dictionary mapping each of functions to its result over the
+    values of each of the size groups, codes giving the group of each
+    value.
+    """
+    counts = [0] * size
+    totals = [0] * size
+    lows = [None] * size
+    highs = [None] * size
+    for code, value in zip(codes, values):
+        if value is None:
+            continue
+        counts[code] += 1
+        totals[code] += value
+        low = lows[code]
+        if low is None or value < low:
+            lows[code] = value
+        high = highs[code]
+        if high is None or value > high:
+            highs[code] = value
+    results = {
+        "sum": [total if count else None
+                for total, count in zip(totals, counts)],
+        "avg": [total / count if count else None
+                for total, count in zip(totals, counts)],
+        "min": lows,
+        "max": highs
+    }
+    return {function: results[function] for function in functions}
+
+
+def _count_numpy(codes, size):
+    """Returns the number of codes of each of the size groups."""
+    return numpy.bincount(codes, minlength=size).tolist()
+
+
+def _reduce_numpy(functions, codes, values, size):
+    """
+    Returns a dictionary mapping each of functions to its result over the
+    values of each of the size groups with NumPy, codes giving the group
+    of each value.
+
+    Columns of ints are summed exactly in int64 and columns of floats in
+    float64; a column mixing ints and floats, or whose sums could overflow
+    int64, is reduced by _reduce_python() so the results keep its types.
+    """
+    kinds = set(map(type, values))
+    if type(None) in kinds:
+        kinds.discard(type(None))
+        present = numpy.array([value is not None for value in values],
+                              dtype=bool)
+        numbers = [value for value in values if value is not None]
+    else:
+        present = None
+        numbers = values
+    integral = kinds <= {int}
+    if not integral and kinds != {float} or integral and numbers and \
+            max(max(numbers), -min(numbers)) * len(numbers) >= 2 ** 63:
+        return _reduce_python(functions, codes.tolist(), values, size)
+    if present is not None:
+        codes = codes[present]
+    data = numpy.array(numbers, dtype=numpy.int64 if integral
+                       else numpy.float64)
+    counts = numpy.bincount(codes, minlength=size)
+    found = counts.tolist()
+    results = {}
+    if "sum" in functions or "avg" in functions:
+        if integral:
+            totals = numpy.zeros(size, dtype=numpy.int64)
+            numpy.add.at(totals, codes, data)
+            results["sum"] = totals.tolist()
+            results["avg"] = [total / count if count else None
+                              for total, count in zip(results["sum"], found)]
+        else:
+            totals = numpy.bincount(codes, weights=data, minlength=size)
+            results["sum"] = totals.tolist()
+            results["avg"] = (totals / numpy.maximum(counts, 1)).tolist()
+    if "min" in functions or "max" in functions:
+        order = numpy.argsort(codes, kind="stable")
+        codes, data = codes[order], data[order]
+        starts = numpy.flatnonzero(numpy.concatenate(
+            ([True], codes[1:] != codes[:-1])))
+        for function, reducer in (("min", numpy.minimum),
+                                  ("max", numpy.maximum)):
+            reduced = numpy.zeros(size, dtype=data.dtype)
+            if len(codes):
+                reduced[codes[starts]] = reducer.reduceat(data, starts)
+            results[function] = reduced.tolist()
+    return {function: [result if count else None for result, count
+                       in zip(results[function], found)]
+            for function in functions}
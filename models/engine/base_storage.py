@@ -0,0 +1,309 @@
+#!/usr/bin/python3
+"""
+This module defines the BaseStorage class, the interface every storage
+engine implements.
+"""
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from models.base_model import BaseModel
+from models.engine import bulk
+from models.engine.aggregate import aggregate
+from models.engine.geo import bounding_box, distance_km, in_box
+from models.engine.query import Query
+from models.engine.text_index import TextIndex, rank
+from models.user import User
+from models.state import State
+from models.city import City
+from models.amenity import Amenity
+from models.place import Place
+from models.review import Review
+
+
+class BaseStorage(ABC):
+    """
+    Abstract storage engine.
+
+    Objects are identified by the key <class name>.<id>. Every method
+    taking a cls argument accepts either the class or its name.
+
+    Between begin() and commit(), save() only records that a save is due
+    and commit() performs it once; rollback() instead restores the objects
+    stored when begin() was called. Nested begin() calls join the
+    outermost batch.
+
+    Attributes:
+        classes (dict): Maps each class name to its model class.
+        watched (frozenset): The attribute names whose changes an engine
+            wants to hear about through changed().
+        text_fields (dict): Maps each class name to the text attributes
+            search() looks into.
+    """
+    classes = {
+        'BaseModel': BaseModel,
+        'User': User,
+        'State': State,
+        'City': City,
+        'Amenity': Amenity,
+        'Place': Place,
+        'Review': Review
+    }
+    watched = frozenset()
+    text_fields = {
+        'Place': ('name', 'description'),
+        'Review': ('text',)
+    }
+
+    @abstractmethod
+    def all(self, cls=None):
+        """
+        Returns a dictionary of the objects of cls, or of every object,
+        keyed by <class name>.id.
+        """
+
+    @abstractmethod
+    def new(self, obj):
+        """
+        Adds obj to the storage.
+        """
+
+    @abstractmethod
+    def save(self):
+        """
+        Persists every change made since the last save.
+        """
+
+    @abstractmethod
+    def reload(self):
+        """
+        Loads the persisted objects.
+        """
+
+    @abstractmethod
+    def delete(self, obj=None):
+        """
+        Removes obj from the storage.
+        """
+
+    @abstractmethod
+    def get(self, cls, id):
+        """
+        Returns the object of class cls with the given id, or None.
+        """
+
+    @abstractmethod
+    def count(self, cls=None):
+        """
+        Returns the number of objects of cls, or of every object.
+        """
+
+    @abstractmethod
+    def begin(self):
+        """
+        Starts deferring saves until the matching commit().
+        """
+
+    @abstractmethod
+    def commit(self):
+        """
+        Ends the batch started by begin(), saving once if a save was
+        requested inside it.
+        """
+
+    @abstractmethod
+    def rollback(self):
+        """
+        Ends the batch started by begin(), discarding its changes.
+        """
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager running its block between begin() and commit(),
+        or rollback() when the block raises.
+        """
+        self.begin()
+        try:
+            yield self
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit()
+
+    def changed(self, obj, name):
+        """
+        Called by BaseModel when the watched attribute name of obj is set.
+        """
+
+    def modified(self, obj):
+        """
+        Called by BaseModel when an attribute of obj is set while obj is
+        clean, saved or loaded as it is.
+        """
+
+    def refresh(self):
+        """
+        Brings the stored objects up to date with the changes other
+        processes saved, for the engines that keep them in memory.
+        """
+
+    def related(self, cls, attribute, id):
+        """
+        Returns the objects of cls whose attribute refers to id, keyed by
+        <class name>.id. A list attribute refers to every id it contains.
+        """
+        related = {}
+        for key, obj in self.all(cls).items():
+            value = getattr(obj, attribute, None)
+            if value == id or isinstance(value, (list, tuple, set)) and \
+                    id in value:
+                related[key] = obj
+        return related
+
+    def nearby(self, cls, lat, lon, radius_km, limit=None):
+        """
+        Returns the objects of cls whose latitude and longitude lie within
+        radius_km of the point (lat, lon), nearest first, and at most limit
+        of them.
+
+        Raises:
+            ValueError: If the point or the radius is out of range.
+        """
+        bounding_box(lat, lon, radius_km)
+        found = []
+        for key, obj in self.all(cls).items():
+            try:
+                distance = distance_km(lat, lon, obj.latitude, obj.longitude)
+            except (AttributeError, TypeError):
+                continue
+            if distance <= radius_km:
+                found.append((distance, key, obj))
+        found.sort(key=lambda entry: entry[:2])
+        return [obj for distance, key, obj in found][:limit]
+
+    def within(self, cls, south, west, north, east):
+        """
+        Returns the objects of cls whose latitude and longitude lie inside
+        the box, keyed by <class name>.id. The box crosses the antimeridian
+        when west is greater than east.
+        """
+        found = {}
+        for key, obj in self.all(cls).items():
+            try:
+                if in_box(obj.latitude, obj.longitude,
+                          south, west, north, east):
+                    found[key] = obj
+            except (AttributeError, TypeError):
+                continue
+        return found
+
+    def search(self, text, cls=None, limit=None):
+        """
+        Returns the objects whose text_fields contain words of text, best
+        match first by BM25, and at most limit of them. Only the objects
+        of cls are searched when it is given.
+        """
+        indexes = [TextIndex(self.text_fields[class_name],
+                             self.all(class_name))
+                   for class_name in self._text_classes(cls)]
+        return [obj for score, key, obj in rank(indexes, text, limit)]
+
+    def _text_classes(self, cls=None):
+        """
+        Returns the names of the classes of text_fields search() looks
+        into, only cls when it is given.
+        """
+        if cls is None:
+            return list(self.text_fields)
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        return [class_name] if class_name in self.text_fields else []
+
+    def aggregate(self, cls, group_by, limit=None, **aggregations):
+        """
+        Groups the objects of cls by their group_by attribute and returns
+        one dictionary per group with its count and the sum, avg, min or
+        max of the attributes given by aggregations, largest group first,
+        as models.engine.aggregate.aggregate() does.
+        """
+        return aggregate(self.all(cls).values(), group_by, limit,
+                         **aggregations)
+
+    def update_many(self, key, mapping):
+        """
+        Sets the attributes of mapping on the object stored under key,
+        <class name>.<id>, then bumps its updated_at and saves once, and
+        returns the object.
+
+        The values of the attributes its class declares are converted to
+        the type of their default by bulk.coerce(), so "4" sets the int 4
+        of Place.max_guest; the others are set as given. The id, the
+        timestamps and __class__ are left unchanged.
+
+        Raises:
+            KeyError: If no object is stored under key.
+            ValueError: If a value cannot be converted, nothing being set.
+        """
+        class_name, _, id = key.partition(".")
+        obj = self.get(class_name, id)
+        if obj is None:
+            raise KeyError(key)
+        fields = type(obj)._fields
+        attributes = {name: value for name, value in mapping.items()
+                      if name not in bulk.RESERVED + ("__class__",)}
+        attributes.update(bulk.coerce(type(obj), {
+            name: value for name, value in attributes.items()
+            if name in fields and value is not None}))
+        for name, value in attributes.items():
+            setattr(obj, name, value)
+        obj.updated_at = datetime.now()
+        self.new(obj)
+        self.save()
+        return obj
+
+    def import_file(self, cls, path, processes=None):
+        """
+        Stores the objects of cls read from the JSON Lines or CSV file at
+        path, replacing the stored objects with the same id, with a single
+        save, and returns their number.
+
+        Every record is checked and converted by bulk.read() before any
+        object is stored, so an invalid file stores nothing.
+
+        Raises:
+            ValueError: If a record is invalid, with its line number.
+            OSError: If the file cannot be read.
+        """
+        if isinstance(cls, str):
+            cls = self.classes[cls]
+        objects = [cls(**attributes)
+                   for attributes in bulk.read(path, cls, processes)]
+        with self.batch():
+            for obj in objects:
+                self.new(obj)
+            self.save()
+        return len(objects)
+
+    def export_file(self, cls, path):
+        """
+        Writes the objects of cls to the file at path as JSON Lines, or as
+        CSV when path ends with .csv, and returns their number.
+
+        Raises:
+            OSError: If the file cannot be written.
+        """
+        if isinstance(cls, str):
+            cls = self.classes[cls]
+        return bulk.write(path, cls, self.all(cls).values())
+
+    def query(self, cls):
+        """
+        Returns a Query over the objects of cls.
+        """
+        return Query(self, cls)
+
+    def sorted_index(self, cls, attribute):
+        """
+        Returns the SortedIndex of attribute over the objects of cls that
+        query() may use, or None when the engine keeps none.
+        """
+        return None
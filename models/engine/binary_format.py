@@ -0,0 +1,273 @@
+#!/usr/bin/python3
+"""
+This module defines a compact binary snapshot format for the objects of
+FileStorage, and converters between it and the JSON file.
+
+A snapshot groups the records by class and stores each attribute as a
+column: integers and floats as packed 64-bit values, timestamps as epoch
+microseconds and strings as indexes into a table where each distinct
+string (ids, class names, attribute names, repeated values) appears once.
+Any value that fits none of these, such as a list, is kept as JSON text.
+
+Usage: python3 -m models.engine.binary_format to-binary|to-json SRC DST
+"""
+import json
+import struct
+import sys
+from array import array
+from datetime import datetime, timedelta
+from models.engine.json_stream import iter_items
+from models.timestamp import parse_datetime, format_datetime
+
+MAGIC = b"HBNB\x01"
+EPOCH = datetime(1970, 1, 1)
+INT, FLOAT, STRING, TIMESTAMP, JSON = b"qdstj"
+_MISSING = object()
+
+
+def dumps(records):
+    """
+    Encodes records into a binary snapshot.
+
+    Args:
+        records: An iterable of (key, dictionary) pairs, the key being
+        <class name>.<id>.
+
+    Returns:
+        bytes: The snapshot.
+    """
+    sections = {}
+    for key, data in records:
+        class_name, _, obj_id = key.partition(".")
+        sections.setdefault(class_name, []).append((obj_id, data))
+    strings = _StringTable()
+    body = [struct.pack("<I", len(sections))]
+    for class_name, rows in sections.items():
+        names = {}
+        for obj_id, data in rows:
+            names.update(dict.fromkeys(data))
+        body.append(struct.pack("<III", strings.index(class_name), len(rows),
+                                len(names)))
+        body.append(_pack("I", [strings.index(obj_id) for obj_id, d in rows]))
+        for name in names:
+            values = [data.get(name, _MISSING) for obj_id, data in rows]
+            body.append(struct.pack("<I", strings.index(name)))
+            body.append(_encode_column(values, strings))
+    return MAGIC + strings.dump() + b"".join(body)
+
+
+def loads(snapshot):
+    """
+    Decodes a binary snapshot.
+
+    Args:
+        snapshot (bytes): The snapshot written by dumps().
+
+    Yields:
+        tuple: (key, dictionary) for every record.
+
+    Raises:
+        ValueError: If snapshot is not a binary snapshot.
+    """
+    if snapshot[:len(MAGIC)] != MAGIC:
+        raise ValueError("Not a binary snapshot")
+    view = memoryview(snapshot)
+    strings, pos = _StringTable.load(view, len(MAGIC))
+    section_count, = struct.unpack_from("<I", view, pos)
+    pos += 4
+    for i in range(section_count):
+        class_index, row_count, column_count = struct.unpack_from(
+            "<III", view, pos)
+        pos += 12
+        ids, pos = _unpack("I", view, pos, row_count)
+        names = []
+        columns = []
+        for j in range(column_count):
+            name_index, = struct.unpack_from("<I", view, pos)
+            values, pos = _decode_column(view, pos + 4, row_count, strings)
+            names.append(strings[name_index])
+            columns.append(values)
+        prefix = strings[class_index] + "."
+        for obj_id, row in zip(ids, zip(*columns) if columns else
+                               [()] * row_count):
+            yield prefix + strings[obj_id], {
+                name: value for name, value in zip(names, row)
+                if value is not _MISSING}
+
+
+def json_to_binary(src, dst):
+    """
+    Converts the JSON file src into the binary snapshot dst.
+    """
+    with open(src, "r", encoding="utf-8") as file:
+        snapshot = dumps(iter_items(file))
+    with open(dst, "wb") as file:
+        file.write(snapshot)
+
+
+def binary_to_json(src, dst):
+    """
+    Converts the binary snapshot src into the JSON file dst.
+    """
+    with open(src, "rb") as file:
+        records = loads(file.read())
+        with open(dst, "w", encoding="utf-8") as out:
+            json.dump(dict(records), out)
+
+
+class _StringTable:
+    """
+    Table of distinct strings, referenced by their index.
+    """
+
+    def __init__(self, strings=None):
+        self.strings = strings or []
+        self.indexes = {}
+
+    def index(self, string):
+        """Returns the index of string, adding it if needed."""
+        index = self.indexes.get(string)
+        if index is None:
+            index = self.indexes[string] = len(self.strings)
+            self.strings.append(string)
+        return index
+
+    def dump(self):
+        """Returns the encoded table."""
+        encoded = [string.encode("utf-8") for string in self.strings]
+        return struct.pack("<I", len(encoded)) + \
+            _pack("I", [len(data) for data in encoded]) + b"".join(encoded)
+
+    @classmethod
+    def load(cls, view, pos):
+        """Decodes the table at pos, returning it and the next position."""
+        count, = struct.unpack_from("<I", view, pos)
+        lengths, pos = _unpack("I", view, pos + 4, count)
+        strings = []
+        for length in lengths:
+            strings.append(str(view[pos:pos + length], "utf-8"))
+            pos += length
+        return strings, pos
+
+
+def _pack(typecode, values):
+    """Packs values as little-endian values of the array typecode."""
+    packed = array(typecode, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack(typecode, view, pos, count):
+    """Unpacks count values of the array typecode at pos."""
+    values = array(typecode)
+    end = pos + count * values.itemsize
+    values.frombytes(view[pos:end])
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tolist(), end
+
+
+def _timestamps(values):
+    """
+    Returns values as epoch microseconds, or None unless every value is
+    a timestamp that format_datetime() writes back identically.
+    """
+    micros = []
+    one = timedelta(microseconds=1)
+    for value in values:
+        if not (len(value) == 19 or len(value) == 26 and
+                value[19] == "." and not value.endswith("000000")) or \
+                value[10] != "T":
+            return None
+        try:
+            parsed = parse_datetime(value)
+        except ValueError:
+            return None
+        if parsed.tzinfo is not None:
+            return None
+        micros.append((parsed - EPOCH) // one)
+    return micros
+
+
+def _encode_values(values, strings):
+    """
+    Returns the type code able to hold every value and the packed values.
+    """
+    if all(type(value) is int and -2 ** 63 <= value < 2 ** 63
+           for value in values):
+        return INT, _pack("q", values)
+    if all(type(value) is float for value in values):
+        return FLOAT, _pack("d", values)
+    index = strings.index
+    if not all(type(value) is str for value in values):
+        return JSON, _pack("I", [index(json.dumps(value))
+                                 for value in values])
+    micros = _timestamps(values)
+    if micros is not None:
+        return TIMESTAMP, _pack("q", micros)
+    return STRING, _pack("I", [index(value) for value in values])
+
+
+def _encode_column(values, strings):
+    """
+    Encodes a column: its type, a presence bitmap unless every row has
+    a value, then the present values.
+    """
+    present = [value for value in values if value is not _MISSING]
+    column_type, data = _encode_values(present, strings)
+    if len(present) == len(values):
+        header = struct.pack("<BB", column_type, 1)
+    else:
+        bitmap = bytearray((len(values) + 7) // 8)
+        for i, value in enumerate(values):
+            if value is not _MISSING:
+                bitmap[i >> 3] |= 1 << (i & 7)
+        header = struct.pack("<BB", column_type, 0) + bytes(bitmap)
+    return header + struct.pack("<I", len(present)) + data
+
+
+def _decode_column(view, pos, row_count, strings):
+    """
+    Decodes the column at pos into one value per row, _MISSING for the
+    rows without a value, returning it and the next position.
+    """
+    column_type, complete = struct.unpack_from("<BB", view, pos)
+    pos += 2
+    if not complete:
+        bitmap = bytes(view[pos:pos + (row_count + 7) // 8])
+        pos += len(bitmap)
+    count, = struct.unpack_from("<I", view, pos)
+    pos += 4
+    if column_type == FLOAT:
+        present, pos = _unpack("d", view, pos, count)
+    elif column_type in (INT, TIMESTAMP):
+        present, pos = _unpack("q", view, pos, count)
+    else:
+        present, pos = _unpack("I", view, pos, count)
+    if column_type == TIMESTAMP:
+        present = [format_datetime(EPOCH + timedelta(microseconds=value))
+                   for value in present]
+    elif column_type == STRING:
+        present = [strings[index] for index in present]
+    elif column_type == JSON:
+        present = [json.loads(strings[index]) for index in present]
+    if complete:
+        return present, pos
+    values = iter(present)
+    return [next(values) if bitmap[i >> 3] >> (i & 7) & 1 else _MISSING
+            for i in range(row_count)], pos
+
+
+def main(argv):
+    """Runs the converter command line."""
+    commands = {"to-binary": json_to_binary, "to-json": binary_to_json}
+    if len(argv) != 4 or argv[1] not in commands:
+        print("Usage: {} to-binary|to-json SRC DST".format(argv[0]))
+        return 1
+    commands[argv[1]](argv[2], argv[3])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
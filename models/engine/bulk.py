@@ -0,0 +1,232 @@
+#!/usr/bin/python3
+"""
+This module reads and writes the objects of a class as JSON Lines or CSV
+records, for storage.import_file() and storage.export_file().
+
+Every record read is checked against the attributes the class declares
+and its values are converted to the types of their defaults, so a CSV
+cell "4" becomes the int 4 of Place.max_guest. Large files are parsed in
+a pool of processes, one chunk of lines at a time.
+"""
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from models.timestamp import parse_datetime
+
+CHUNK_LINES = 10000
+PARALLEL_BYTES = 1 << 22
+RESERVED = ("id", "created_at", "updated_at")
+
+
+def file_format(path):
+    """
+    Returns "csv" for a path ending with .csv, "jsonl" otherwise.
+    """
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def coerce(cls, record, text=False):
+    """
+    Returns the attributes of record, a dictionary read from a file, with
+    the values of the attributes cls declares converted to the type of
+    their default.
+
+    Empty values are left out, so the objects keep the declared default,
+    as are the empty strings of text records such as CSV cells.
+
+    Args:
+        cls (type or tuple): The model class, or the (class name, declared
+            attributes) pair of a class.
+        record (dict): The attribute values read.
+        text (bool): Whether every value of record is a string.
+
+    Raises:
+        ValueError: If an attribute is not declared by cls, a value cannot
+            be converted or the record belongs to another class.
+    """
+    class_name, fields = cls if isinstance(cls, tuple) else \
+        (cls.__name__, cls._fields)
+    attributes = {}
+    for name, value in record.items():
+        if value is None or text and value == "":
+            continue
+        if name == "__class__":
+            if value != class_name:
+                raise ValueError("Record of class {}".format(value))
+        elif name in RESERVED:
+            if not isinstance(value, str):
+                raise ValueError("Invalid {}: {!r}".format(name, value))
+            if name != "id":
+                parse_datetime(value)
+            attributes[name] = value
+        elif name in fields:
+            attributes[name] = _convert(name, value, type(fields[name]))
+        else:
+            raise ValueError("Unknown attribute: {}".format(name))
+    return attributes
+
+
+def _convert(name, value, kind):
+    """
+    Returns value converted to kind, the type of the default of the
+    attribute name.
+
+    Raises:
+        ValueError: If value cannot be converted.
+    """
+    try:
+        if kind is list:
+            if isinstance(value, str):
+                value = json.loads(value)
+            if isinstance(value, list):
+                return value
+        elif isinstance(value, bool):
+            pass
+        elif kind is int:
+            if isinstance(value, float) and value.is_integer():
+                return int(value)
+            if isinstance(value, (int, str)):
+                return int(value)
+        elif kind is float:
+            if isinstance(value, (int, float, str)):
+                return float(value)
+        elif kind is str:
+            if isinstance(value, str):
+                return value
+        else:
+            return value
+    except ValueError:
+        pass
+    raise ValueError("Invalid {} for {}: {!r}".format(kind.__name__, name,
+                                                      value))
+
+
+def read(path, cls, processes=None):
+    """
+    Returns the attributes of the objects of cls stored in the JSON Lines
+    or CSV file at path, converted by coerce().
+
+    A JSON Lines file holds one JSON object per line; a CSV file starts
+    with a header row naming the attribute of each column.
+
+    Args:
+        path (str): The path of the file, read as CSV when it ends with
+            .csv.
+        cls (type): The model class.
+        processes (int): The number of processes parsing the file, one
+            per CPU when None and the file holds more than PARALLEL_BYTES.
+
+    Raises:
+        ValueError: If a record is invalid, with its line number.
+        OSError: If the file cannot be read.
+    """
+    format = file_format(path)
+    if processes is None:
+        processes = 1
+        if os.path.getsize(path) > PARALLEL_BYTES:
+            processes = os.cpu_count() or 1
+    arguments = (format, (cls.__name__, dict(cls._fields)))
+    chunks = _chunks(path, format)
+    if processes <= 1:
+        return [attributes for header, chunk in chunks
+                for attributes in _parse(*arguments, header, chunk)]
+    with ProcessPoolExecutor(processes) as pool:
+        futures = [pool.submit(_parse, *arguments, header, chunk)
+                   for header, chunk in chunks]
+        return [attributes for future in futures
+                for attributes in future.result()]
+
+
+def _chunks(path, format):
+    """
+    Yields the header row of a CSV file, None for JSON Lines, and a list
+    of CHUNK_LINES (line number, line or row) pairs of the file at a time,
+    skipping the blank lines.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        if format == "csv":
+            reader = csv.reader(file)
+            header = next(reader, None)
+            items = ((reader.line_num, row) for row in reader if row)
+        else:
+            header = None
+            items = ((number, line) for number, line in enumerate(file, 1)
+                     if line.strip())
+        while True:
+            chunk = list(islice(items, CHUNK_LINES))
+            if not chunk:
+                return
+            yield header, chunk
+
+
+def _parse(format, cls, header, chunk):
+    """
+    Returns the attributes of the records of chunk, a list of (line
+    number, line or row) pairs, for cls, a (class name, declared
+    attributes) pair. Runs in the processes of the pool.
+
+    Raises:
+        ValueError: If a record is invalid, with its line number.
+    """
+    records = []
+    for number, item in chunk:
+        try:
+            if format == "csv":
+                if len(item) != len(header):
+                    raise ValueError("Expected {} cells, found {}".format(
+                        len(header), len(item)))
+                record = dict(zip(header, item))
+            else:
+                record = json.loads(item)
+                if not isinstance(record, dict):
+                    raise ValueError("Not a JSON object")
+            records.append(coerce(cls, record, format == "csv"))
+        except ValueError as error:
+            raise ValueError("line {}: {}".format(number, error)) from None
+    return records
+
+
+def write(path, cls, objects):
+    """
+    Writes objects of cls to the file at path as JSON Lines, or as CSV
+    when path ends with .csv, and returns their number.
+
+    Only the id, the timestamps and the attributes cls declares are
+    written, so the file can be read back by read(), and the attributes an
+    object leaves to their default are left out, as empty cells in CSV.
+    The file is written next to path and renamed over it once complete.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    columns = RESERVED + tuple(cls._fields)
+    tmp_path = path + ".tmp"
+    count = 0
+    with open(tmp_path, "w", encoding="utf-8", newline="") as file:
+        if file_format(path) == "csv":
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            for obj in objects:
+                data = obj.to_dict()
+                writer.writerow([_cell(data.get(name)) for name in columns])
+                count += 1
+        else:
+            for obj in objects:
+                data = obj.to_dict()
+                file.write(json.dumps({name: data[name] for name in columns
+                                       if name in data}) + "\n")
+                count += 1
+    os.replace(tmp_path, path)
+    return count
+
+
+def _cell(value):
+    """
+    Returns value as written to a CSV cell, lists as JSON text and unset
+    attributes as an empty cell.
+    """
+    if value is None:
+        return ""
+    return json.dumps(value) if isinstance(value, list) else value
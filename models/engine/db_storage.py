@@ -0,0 +1,187 @@
+#!/usr/bin/python3
+"""
+This module defines the DBStorage class, a storage engine keeping every
+object as one row of an SQLite database.
+"""
+import json
+import os
+import sqlite3
+from models.engine.base_storage import BaseStorage
+
+
+class DBStorage(BaseStorage):
+    """
+    DBStorage class storing objects in SQLite through the sqlite3 module.
+
+    Every class in classes gets its own table (id TEXT PRIMARY KEY,
+    data TEXT) where data is the JSON of to_dict(). new() and delete()
+    write their row at once, save() writes the rows of the dirty objects
+    and commits, so a change never rewrites more than the rows it touches.
+    Objects already read are kept in an identity map so each row is only
+    instantiated once. A batch is one SQLite transaction.
+
+    The database file is taken from HBNB_SQLITE_PATH, hbnb.db by default.
+    """
+
+    def __init__(self):
+        """
+        Opens the database connection.
+        """
+        self.__path = os.getenv("HBNB_SQLITE_PATH", "hbnb.db")
+        self.__connection = sqlite3.connect(self.__path,
+                                            check_same_thread=False)
+        self.__objects = {}
+        self.__batch_depth = 0
+        self.__batch_save = False
+
+    def all(self, cls=None):
+        """
+        Returns a dictionary of the objects of cls, or of every object,
+        keyed by <class name>.id.
+        """
+        if cls is None:
+            objects = {}
+            for class_name in self.classes:
+                objects.update(self.all(class_name))
+            return objects
+        class_name = self.__class_name(cls)
+        rows = self.__connection.execute(
+            'SELECT id, data FROM "{}"'.format(class_name))
+        return {"{}.{}".format(class_name, row[0]):
+                self.__instantiate(class_name, row[0], row[1])
+                for row in rows}
+
+    def new(self, obj):
+        """
+        Adds obj to the current transaction.
+        """
+        class_name = obj.__class__.__name__
+        self.__objects["{}.{}".format(class_name, obj.id)] = obj
+        self.__write(obj)
+
+    def save(self):
+        """
+        Writes the rows of the dirty objects and commits the transaction.
+        """
+        if self.__batch_depth:
+            self.__batch_save = True
+            return
+        for obj in self.__objects.values():
+            if getattr(obj, "_dirty", True):
+                self.__write(obj)
+        self.__connection.commit()
+
+    def reload(self):
+        """
+        Creates the missing tables.
+        """
+        for class_name in self.classes:
+            self.__connection.execute(
+                'CREATE TABLE IF NOT EXISTS "{}" '
+                '(id TEXT PRIMARY KEY, data TEXT NOT NULL)'.format(class_name))
+        self.__connection.commit()
+
+    def delete(self, obj=None):
+        """
+        Deletes the row of obj in the current transaction.
+        """
+        if obj is None:
+            return
+        class_name = obj.__class__.__name__
+        self.__objects.pop("{}.{}".format(class_name, obj.id), None)
+        self.__connection.execute(
+            'DELETE FROM "{}" WHERE id = ?'.format(class_name), (obj.id,))
+
+    def get(self, cls, id):
+        """
+        Returns the object of class cls with the given id, or None.
+        """
+        class_name = self.__class_name(cls)
+        obj = self.__objects.get("{}.{}".format(class_name, id))
+        if obj is not None:
+            return obj
+        row = self.__connection.execute(
+            'SELECT data FROM "{}" WHERE id = ?'.format(class_name),
+            (id,)).fetchone()
+        if row is None:
+            return None
+        return self.__instantiate(class_name, id, row[0])
+
+    def count(self, cls=None):
+        """
+        Returns the number of objects of cls, or of every object.
+        """
+        if cls is None:
+            return sum(self.count(class_name) for class_name in self.classes)
+        return self.__connection.execute(
+            'SELECT COUNT(*) FROM "{}"'.format(
+                self.__class_name(cls))).fetchone()[0]
+
+    def begin(self):
+        """
+        Starts deferring saves until the matching commit().
+        """
+        if not self.__batch_depth:
+            self.__connection.commit()
+            self.__batch_save = False
+        self.__batch_depth += 1
+
+    def commit(self):
+        """
+        Ends the batch started by begin(), saving once if a save was
+        requested inside it.
+        """
+        if not self.__batch_depth:
+            return
+        self.__batch_depth -= 1
+        if not self.__batch_depth and self.__batch_save:
+            self.save()
+
+    def rollback(self):
+        """
+        Ends the batch started by begin(), rolling back its transaction.
+        Objects read before are read again from the database.
+        """
+        if not self.__batch_depth:
+            return
+        self.__batch_depth = 0
+        self.__connection.rollback()
+        self.__objects = {}
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        self.__connection.close()
+
+    def __class_name(self, cls):
+        """
+        Returns the name of cls, checking it is a known class.
+        """
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        if class_name not in self.classes:
+            raise KeyError(class_name)
+        return class_name
+
+    def __instantiate(self, class_name, id, data):
+        """
+        Returns the object of the row id of the table class_name, reusing
+        the identity map.
+        """
+        key = "{}.{}".format(class_name, id)
+        obj = self.__objects.get(key)
+        if obj is None:
+            obj = self.classes[class_name](**json.loads(data))
+            obj._dirty = False
+            self.__objects[key] = obj
+        return obj
+
+    def __write(self, obj):
+        """
+        Inserts or replaces the row of obj.
+        """
+        self.__connection.execute(
+            'INSERT OR REPLACE INTO "{}" (id, data) VALUES (?, ?)'.format(
+                obj.__class__.__name__),
+            (obj.id, json.dumps(obj.to_dict())))
+        obj._dirty = False
@@ -1,66 +1,834 @@
 #!/usr/bin/python3
 import json
 import os
-from models.base_model import BaseModel
-from models.user import User
-from models.state import State
-from models.city import City
-from models.amenity import Amenity
-from models.place import Place
-from models.review import Review
+import threading
+from contextlib import contextmanager
+from models.engine.base_storage import BaseStorage
+from models.engine import binary_format
+from models.engine.journal import Journal
+from models.engine.indexes import GeoIndex, ReferenceIndex, SortedIndex
+from models.engine.json_stream import iter_items
+from models.engine.rwlock import RWLock
+from models.engine.text_index import TextIndex, rank
+from models.engine.writer import BackgroundWriter, write_atomic
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 
-class FileStorage:
+class FileStorage(BaseStorage):
     """
     FileStorage class for serializing and deserializing instances to/from
     a JSON file.
+
+    When journaled is True, save() appends only the objects changed since
+    the last save to a write-ahead log next to the JSON file, and the log
+    is folded back into the JSON file once it holds journal_threshold
+    records. The keys of the changed objects are collected by new(),
+    delete() and modified() as they change, so a save never scans every
+    object.
+
+    The serialized JSON of every object is cached between saves and only
+    regenerated for objects whose dirty flag is set, so a save after a
+    single change only serializes that object again.
+
+    Objects are also kept in one bucket per class name, so all(cls) and
+    count(cls) only touch the objects of that class.
+
+    When lazy is True, reload() only keeps the raw dictionaries read from
+    the file and an object is instantiated the first time it is reached
+    through all() or get().
+
+    reload() decodes the JSON file one object at a time, so the whole
+    file is never held in memory as a dictionary of dictionaries.
+
+    The JSON file is always replaced atomically. When background is True
+    the write happens on a dedicated thread that coalesces bursts of saves
+    into one write, and flush() waits for it to reach the disk.
+
+    When snapshot_format is "binary", the objects are saved in the compact
+    format of models/engine/binary_format.py to a .hbnb file next to the
+    JSON file instead; the JSON file is still read when no .hbnb file
+    exists yet.
+
+    related() answers from reverse indexes over the reference attributes
+    listed in references. An index is built the first time it is used and
+    kept up to date by new(), delete() and changed(); changing a list such
+    as amenity_ids in place is only seen once the save() of the object
+    calls changed() for it.
+
+    query() takes the objects from a sorted index for the attributes
+    listed in sorted_attributes, maintained the same way, instead of
+    scanning the class.
+
+    nearby() and within() find the objects of the classes listed in
+    locations through a grid index of their latitude and longitude.
+
+    search() ranks the objects from inverted indexes of their text_fields.
+    After a save the indexes are also written to a .search file next to
+    the JSON file, so the next process only tokenizes the objects whose
+    text changed since.
+
+    Rolling back a batch restores which objects are stored, not the
+    attributes changed on objects that stay stored.
+
+    Storage is safe to use from several threads. Changes hold a
+    reader/writer lock for writing, and lookups hold it for reading, so
+    they run together between changes. The dictionary of every object is
+    copied on write: once all() has returned it or a save has started
+    serializing it, the next change replaces it with a changed copy, so
+    the caller iterating it and the save keep an unchanging snapshot
+    without blocking writers. Saves run one at a time, outside the lock
+    but for the moment they take their snapshot.
+
+    When shared is True, several processes can use the same JSON file.
+    Saves hold an exclusive fcntl advisory lock on a .lock file next to
+    it, and reads of the file a shared one. Before every save and lookup,
+    the inode, size and modification time of the file and the size of
+    the journal tell whether another process saved since this one last
+    read or wrote them. If so, refresh() merges those changes into the
+    stored objects: only the records appended to the journal are read,
+    or else the file is compared object by object with the stored ones.
+    The objects this process changed and has not saved yet are kept, so
+    no process overwrites the changes another one saved, apart from
+    changes to the same object, where the last save wins. Without fcntl
+    the changes are still merged but saves are not locked.
     """
     __file_path = "file.json"
     __objects = {}
+    __pending = {}
+    __dirty = set()
+    __fragments = {}
+    __buckets = {}
+    __indexed = None
+    __raw = {}
+    __batch = None
+    __batch_depth = 0
+    __writer = None
+    __indexes = {}
+    __journal = None
+    __handed_out = False
+    __lock = RWLock()
+    __cache_lock = threading.RLock()
+    __saving = threading.RLock()
+    __signature = None
+    __lock_file = None
+    __file_mutex = threading.RLock()
+    __file_depth = 0
 
-    classes = {
-        'BaseModel': BaseModel,
-        'User': User,
-        'State': State,
-        'City': City,
-        'Amenity': Amenity,
-        'Place': Place,
-        'Review': Review
+    journaled = os.getenv("HBNB_FILE_JOURNAL") == "1"
+    journal_threshold = 1000
+    lazy = os.getenv("HBNB_LAZY_RELOAD") == "1"
+    background = os.getenv("HBNB_BACKGROUND_SAVE") == "1"
+    snapshot_format = os.getenv("HBNB_SNAPSHOT_FORMAT", "json")
+    shared = os.getenv("HBNB_SHARED_FILE") == "1"
+    references = {
+        'City': ('state_id',),
+        'Place': ('city_id', 'user_id', 'amenity_ids'),
+        'Review': ('place_id', 'user_id')
+    }
+    sorted_attributes = {
+        'Place': ('price_by_night', 'max_guest', 'number_rooms',
+                  'number_bathrooms')
+    }
+    locations = {
+        'Place': ('latitude', 'longitude')
     }
 
-    def all(self):
+    def all(self, cls=None):
         """./
         Returns the dictionary with all objects of a specific class.
+
+        Args:
+            cls (type or str): The class, or class name, to filter on.
+            When None, the dictionary of every object is returned; storage
+            no longer changes it once returned, so it can be iterated
+            while other threads change storage.
         """
-        return FileStorage.__objects
+        self.refresh()
+        with FileStorage.__lock.read():
+            if cls is None:
+                with FileStorage.__cache_lock:
+                    self.__sync_buckets()
+                    for class_name in list(FileStorage.__raw):
+                        self.__materialize(class_name)
+                    FileStorage.__handed_out = True
+                    return FileStorage.__objects
+            self.__materialize(cls)
+            return dict(self.__bucket(cls))
+
+    def get(self, cls, id):
+        """
+        Returns the object of class cls with the given id, or None.
+
+        Args:
+            cls (type or str): The class, or class name, of the object.
+            id (str): The id of the object.
+        """
+        self.refresh()
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        key = "{}.{}".format(cls, id)
+        obj = FileStorage.__objects.get(key)
+        if obj is None:
+            with FileStorage.__lock.read(), FileStorage.__cache_lock:
+                self.__sync_buckets()
+                data = FileStorage.__raw.get(cls, {}).pop(key, None)
+                if data is not None:
+                    obj = self.__instantiate(key, data)
+                else:
+                    obj = FileStorage.__objects.get(key)
+        return obj
+
+    def count(self, cls=None):
+        """
+        Returns the number of objects in storage, or of one class.
+
+        Args:
+            cls (type or str): The class, or class name, to count.
+        """
+        self.refresh()
+        with FileStorage.__lock.read():
+            if cls is None:
+                self.__sync_buckets()
+                return len(FileStorage.__objects) + \
+                    sum(map(len, FileStorage.__raw.values()))
+            bucket = self.__bucket(cls)
+            raw = FileStorage.__raw.get(
+                cls if isinstance(cls, str) else cls.__name__, {})
+            return len(bucket) + len(raw)
 
     def new(self, obj):
         """
         Sets in __objects the obj with key <obj class name>.id.
         """
+        class_name = obj.__class__.__name__
+        key = "{}.{}".format(class_name, obj.id)
+        with FileStorage.__lock.write():
+            self.__writable()[key] = obj
+            self.__buckets.setdefault(class_name, {})[key] = obj
+            self.__raw.get(class_name, {}).pop(key, None)
+            self.__pending[key] = obj
+            for index in self.__indexes.get(class_name, {}).values():
+                index.update(key, obj)
+
+    def changed(self, obj, name):
+        """
+        Updates the index of the attribute name after it changed on obj.
+        """
+        class_name = obj.__class__.__name__
+        key = "{}.{}".format(class_name, obj.id)
+        if FileStorage.__objects.get(key) is not obj:
+            return
+        with FileStorage.__lock.write():
+            for index in self.__indexes.get(class_name, {}).values():
+                if name in index.attributes and \
+                        FileStorage.__objects.get(key) is obj:
+                    index.update(key, obj)
+
+    def modified(self, obj):
+        """
+        Records that the stored obj changed since it was saved or loaded.
+        """
+        key = "{}.{}".format(obj.__class__.__name__, obj.id)
+        with FileStorage.__lock.write():
+            if FileStorage.__objects.get(key) is obj:
+                FileStorage.__dirty.add(key)
+
+    def related(self, cls, attribute, id):
+        """
+        Returns the objects of cls whose attribute refers to id, keyed by
+        <class name>.id, through the reverse index of attribute when it is
+        one of the references.
+        """
+        self.refresh()
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        if attribute not in self.references.get(class_name, ()):
+            return super().related(cls, attribute, id)
+        with FileStorage.__lock.read():
+            return self.__index(class_name, ReferenceIndex,
+                                attribute).lookup(id)
+
+    def sorted_index(self, cls, attribute):
+        """
+        Returns the sorted index of attribute over the objects of cls when
+        it is one of the sorted_attributes, or None.
+        """
+        self.refresh()
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        if attribute not in self.sorted_attributes.get(class_name, ()):
+            return None
+        with FileStorage.__lock.read():
+            return self.__index(class_name, SortedIndex, attribute)
+
+    def nearby(self, cls, lat, lon, radius_km, limit=None):
+        """
+        Returns the objects of cls within radius_km of the point (lat, lon),
+        nearest first, through the grid index when cls is in locations.
+        """
+        self.refresh()
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        if class_name not in self.locations:
+            return super().nearby(cls, lat, lon, radius_km, limit)
+        with FileStorage.__lock.read():
+            index = self.__index(class_name, GeoIndex,
+                                 *self.locations[class_name])
+            return [obj for distance, key, obj
+                    in index.nearby(lat, lon, radius_km, limit)]
+
+    def within(self, cls, south, west, north, east):
+        """
+        Returns the objects of cls inside the box, keyed by <class
+        name>.id, through the grid index when cls is in locations.
+        """
+        self.refresh()
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        if class_name not in self.locations:
+            return super().within(cls, south, west, north, east)
+        with FileStorage.__lock.read():
+            index = self.__index(class_name, GeoIndex,
+                                 *self.locations[class_name])
+            return index.within(south, west, north, east)
+
+    def search(self, text, cls=None, limit=None):
+        """
+        Returns the objects whose text_fields contain words of text, best
+        match first by BM25, through the inverted indexes of text_fields.
+        """
+        self.refresh()
+        with FileStorage.__lock.read():
+            indexes = self.__text_indexes(self._text_classes(cls))
+            return [obj for score, key, obj in rank(indexes, text, limit)]
+
+    def delete(self, obj=None):
+        """
+        Deletes obj from __objects if it is inside.
+        """
+        if obj is None:
+            return
         key = "{}.{}".format(obj.__class__.__name__, obj.id)
-        self.__objects[key] = obj
+        with FileStorage.__lock.write():
+            if self.__remove(key):
+                self.__pending[key] = None
 
     def save(self):
         """
-        Serializes __objects to the JSON file.
+        Serializes __objects to the JSON file, or appends the objects
+        added, removed or changed since the last save to the journal when
+        journaled.
+
+        Only taking the snapshot to save holds the lock; the
+        serialization and the write only keep other saves waiting. When
+        shared, the changes other processes saved are merged first.
+        """
+        with FileStorage.__saving, self.__file_lock(True):
+            with FileStorage.__lock.write():
+                if FileStorage.__batch_depth:
+                    FileStorage.__batch["save"] = True
+                    return
+                self.__merge()
+                pending, FileStorage.__pending = FileStorage.__pending, {}
+                dirty, FileStorage.__dirty = FileStorage.__dirty, set()
+                if not self.journaled:
+                    snapshot = self.__snapshot()
+                else:
+                    for key in dirty:
+                        obj = FileStorage.__objects.get(key)
+                        if key not in pending and obj is not None:
+                            pending[key] = obj
+            try:
+                if not self.journaled:
+                    self.__write_snapshot(*snapshot)
+                    self.__write_text_indexes()
+                    if self.__get_journal().records:
+                        self.flush()
+                        self.__get_journal().truncate()
+                else:
+                    changes = {}
+                    for key, obj in pending.items():
+                        if obj is not None:
+                            obj._dirty = False
+                            obj = obj.to_dict()
+                        changes[key] = obj
+                    self.__get_journal().append(changes)
+            except BaseException:
+                with FileStorage.__lock.write():
+                    pending.update(FileStorage.__pending)
+                    FileStorage.__pending = pending
+                raise
+            if self.journaled and \
+                    self.__get_journal().records >= self.journal_threshold:
+                self.compact()
+
+    def begin(self):
+        """
+        Starts deferring saves until the matching commit().
         """
-        serialized_objects = {key: obj.to_dict() for key, obj in
-                              self.__objects.items()}
-        with open(self.__file_path, "w", encoding="utf-8") as file:
-            json.dump(serialized_objects, file)
+        with FileStorage.__lock.write():
+            if not FileStorage.__batch_depth:
+                self.__sync_buckets()
+                FileStorage.__batch = {
+                    "save": False,
+                    "objects": dict(FileStorage.__objects),
+                    "raw": {class_name: dict(raw) for class_name, raw
+                            in FileStorage.__raw.items()},
+                    "pending": dict(FileStorage.__pending)
+                }
+            FileStorage.__batch_depth += 1
+
+    def commit(self):
+        """
+        Ends the batch started by begin(), saving once if a save was
+        requested inside it.
+        """
+        with FileStorage.__lock.write():
+            if not FileStorage.__batch_depth:
+                return
+            FileStorage.__batch_depth -= 1
+            if FileStorage.__batch_depth:
+                return
+            batch, FileStorage.__batch = FileStorage.__batch, None
+        if batch["save"]:
+            self.save()
+
+    def rollback(self):
+        """
+        Ends the batch started by begin(), restoring the stored objects.
+        """
+        with FileStorage.__lock.write():
+            if not FileStorage.__batch_depth:
+                return
+            batch, FileStorage.__batch = FileStorage.__batch, None
+            FileStorage.__batch_depth = 0
+            objects = self.__writable()
+            objects.clear()
+            objects.update(batch["objects"])
+            FileStorage.__indexed = None
+            self.__sync_buckets()
+            FileStorage.__raw = batch["raw"]
+            FileStorage.__pending = batch["pending"]
+
+    def compact(self):
+        """
+        Folds the journal into the JSON file and empties the journal.
+        """
+        with FileStorage.__saving, self.__file_lock(True):
+            with FileStorage.__lock.write():
+                self.__merge()
+                snapshot = self.__snapshot()
+            self.__write_snapshot(*snapshot)
+            self.__write_text_indexes()
+            self.flush()
+            self.__get_journal().truncate()
+
+    def flush(self):
+        """
+        Waits until every save handed to the background writer is on disk.
+        """
+        if FileStorage.__writer is not None:
+            FileStorage.__writer.flush()
 
     def reload(self):
         ''' deserializes the JSON file to __object
         '''
-        loaded_dict = {}
+        with self.__file_lock(False), FileStorage.__lock.write():
+            FileStorage.__signature = self.__stat_snapshot()
+            for k, v in self.__read_snapshot():
+                self.__load(k, v)
+            for k, v in self.__get_journal().replay():
+                if v is None:
+                    self.__remove(k)
+                else:
+                    self.__load(k, v)
+            FileStorage.__pending = {}
+            FileStorage.__dirty = set()
+
+    def refresh(self):
+        """
+        Merges the changes other processes saved to the JSON file since
+        this process last read or wrote it, when shared.
+        """
+        if not self.shared or not self.__outdated():
+            return
+        with self.__file_lock(False), FileStorage.__lock.write():
+            self.__merge()
+
+    def __read_snapshot(self):
+        """
+        Yields the key and dictionary of every object of the snapshot
+        file, or of the JSON file when there is no binary snapshot yet.
+        """
+        if os.path.exists(self.__snapshot_path()) and \
+                self.snapshot_format == "binary":
+            with open(self.__snapshot_path(), 'rb') as f:
+                yield from binary_format.loads(f.read())
+            return
         try:
-            with open(FileStorage.__file_path, 'r') as f:
-                loaded_dict = json.load(f)
+            f = open(FileStorage.__file_path, 'r', encoding="utf-8")
         except FileNotFoundError:
             return
-        for k, v in loaded_dict.items():
-            class_name = k.split('.')[0]
-            if class_name in self.classes:
-                obj = self.classes[class_name](**v)
-                self.new(obj)
+        with f:
+            yield from iter_items(f)
+
+    def __stat_snapshot(self):
+        """
+        Returns the path, inode, size and modification time of the file
+        __read_snapshot() reads, or None when it is missing.
+        """
+        path = FileStorage.__file_path
+        if self.snapshot_format == "binary" and \
+                os.path.exists(self.__snapshot_path()):
+            path = self.__snapshot_path()
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return path, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def __outdated(self):
+        """
+        Returns True if another process may have saved since this one last
+        read or wrote the snapshot file and the journal.
+        """
+        journal = self.__get_journal()
+        return self.__stat_snapshot() != FileStorage.__signature or \
+            journal.size() != journal.offset
+
+    def __merge(self):
+        """
+        Merges the changes other processes saved into the stored objects,
+        when shared and outdated. Only the records appended to the journal
+        are read while the snapshot file is unchanged; otherwise the whole
+        file is compared with the stored objects. The storage lock and the
+        file lock must be held.
+        """
+        if not self.shared or not self.__outdated():
+            return
+        journal = self.__get_journal()
+        signature = self.__stat_snapshot()
+        if signature == FileStorage.__signature and \
+                journal.size() >= journal.offset:
+            for key, data in journal.tail():
+                self.__apply(key, data)
+            return
+        records = dict(self.__read_snapshot())
+        records.update(journal.replay())
+        FileStorage.__signature = signature
+        for key, data in records.items():
+            self.__apply(key, data)
+        stored = list(FileStorage.__objects)
+        for raw in FileStorage.__raw.values():
+            stored.extend(raw)
+        for key in stored:
+            if key not in records and not self.__changed(key):
+                self.__remove(key)
+
+    def __apply(self, key, data):
+        """
+        Stores the object dictionary data another process saved under key,
+        or removes the object when data is None, unless this process
+        changed it since its last save.
+        """
+        if self.__changed(key):
+            return
+        if data is None:
+            self.__remove(key)
+            return
+        obj = FileStorage.__objects.get(key)
+        if obj is not None and obj.to_dict() == data or \
+                FileStorage.__raw.get(key.split('.')[0], {}).get(key) == data:
+            return
+        self.__load(key, data)
+        FileStorage.__pending.pop(key, None)
+
+    def __changed(self, key):
+        """
+        Returns whether the object stored under key was added, removed or
+        changed since the last save.
+        """
+        return key in FileStorage.__pending or \
+            getattr(FileStorage.__objects.get(key), "_dirty", False)
+
+    def __load(self, key, data):
+        """
+        Instantiates the object dictionary data stored under key, or only
+        keeps data aside until the object is first accessed when lazy.
+        """
+        class_name = key.split('.')[0]
+        if class_name not in self.classes:
+            return
+        if self.lazy:
+            self.__remove(key)
+            self.__raw.setdefault(class_name, {})[key] = data
+            self.__indexes.pop(class_name, None)
+        else:
+            obj = self.classes[class_name](**data)
+            obj._dirty = False
+            self.new(obj)
+
+    def __instantiate(self, key, data):
+        """
+        Turns the raw dictionary data kept by a lazy reload into an object
+        stored under key.
+        """
+        class_name = key.split('.')[0]
+        obj = self.classes[class_name](**data)
+        obj._dirty = False
+        self.__writable()[key] = obj
+        self.__buckets.setdefault(class_name, {})[key] = obj
+        return obj
+
+    def __materialize(self, cls):
+        """
+        Instantiates every object of cls still kept raw by a lazy reload.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        with FileStorage.__cache_lock:
+            self.__sync_buckets()
+            raw = FileStorage.__raw.pop(cls, {})
+            for key, data in raw.items():
+                self.__instantiate(key, data)
+
+    def __remove(self, key):
+        """
+        Removes the object stored under key, returning False if missing.
+        """
+        self.__sync_buckets()
+        class_name = key.split('.')[0]
+        if self.__raw.get(class_name, {}).pop(key, None) is not None:
+            return True
+        if key not in self.__objects:
+            return False
+        del self.__writable()[key]
+        self.__buckets.get(class_name, {}).pop(key, None)
+        for index in self.__indexes.get(class_name, {}).values():
+            index.remove(key)
+        return True
+
+    def __index(self, class_name, index_class, *attributes, **options):
+        """
+        Returns the index_class index of attributes over the objects of
+        class_name, building it the first time with options.
+        """
+        name = (index_class.__name__,) + attributes
+        index = self.__indexes.get(class_name, {}).get(name)
+        if index is not None:
+            return index
+        with FileStorage.__cache_lock:
+            self.__materialize(class_name)
+            bucket = self.__bucket(class_name)
+            indexes = FileStorage.__indexes.setdefault(class_name, {})
+            if name not in indexes:
+                index = index_class(*attributes, bucket, **options)
+                indexes[name] = index
+                FileStorage.watched = \
+                    FileStorage.watched | set(index.attributes)
+            return indexes[name]
+
+    def __text_indexes(self, class_names):
+        """
+        Returns the inverted indexes of the text_fields of class_names,
+        building the missing ones from the .search file.
+        """
+        indexes = []
+        saved = None
+        for class_name in class_names:
+            fields = tuple(self.text_fields[class_name])
+            name = (TextIndex.__name__, fields)
+            if name not in self.__indexes.get(class_name, {}):
+                if saved is None:
+                    saved = self.__read_text_indexes()
+                indexes.append(self.__index(class_name, TextIndex, fields,
+                                            saved=saved.get(class_name)))
+            else:
+                indexes.append(self.__indexes[class_name][name])
+        return indexes
+
+    def __read_text_indexes(self):
+        """
+        Returns the inverted indexes saved in the .search file, keyed by
+        class name, or an empty dictionary.
+        """
+        try:
+            with open(self.__file_path + ".search", "r",
+                      encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def __write_text_indexes(self):
+        """
+        Writes the inverted indexes to the .search file when one changed
+        since it was last written.
+        """
+        with FileStorage.__lock.read():
+            indexes = self.__text_indexes([
+                class_name for class_name in self.text_fields
+                if (TextIndex.__name__, tuple(self.text_fields[class_name]))
+                in self.__indexes.get(class_name, {})])
+            if not any(index.changed for index in indexes):
+                return
+            indexes = self.__text_indexes(list(self.text_fields))
+            text = json.dumps({class_name: index.dump() for class_name, index
+                               in zip(self.text_fields, indexes)})
+        write_atomic(self.__file_path + ".search", text)
+
+    def __bucket(self, cls):
+        """
+        Returns the bucket of objects of cls, keyed by <class name>.id.
+        """
+        if not isinstance(cls, str):
+            cls = cls.__name__
+        self.__sync_buckets()
+        return self.__buckets.get(cls, {})
+
+    def __sync_buckets(self):
+        """
+        Rebuilds the class buckets when __objects was replaced, or changed
+        in size, behind the back of new() and delete(). Replacing
+        __objects also drops the records a lazy reload kept raw.
+        """
+        objects = FileStorage.__objects
+        if FileStorage.__indexed is objects and \
+                sum(map(len, FileStorage.__buckets.values())) == len(objects):
+            return
+        with FileStorage.__cache_lock:
+            if FileStorage.__indexed is not objects:
+                FileStorage.__raw = {}
+            buckets = {}
+            for key, obj in list(objects.items()):
+                buckets.setdefault(key.split('.')[0], {})[key] = obj
+            FileStorage.__buckets = buckets
+            FileStorage.__indexed = objects
+            FileStorage.__indexes = {}
+
+    def __writable(self):
+        """
+        Returns the dictionary of every object for a change, first
+        replacing it with a copy when all() or a save holds it.
+        """
+        self.__sync_buckets()
+        if FileStorage.__handed_out:
+            FileStorage.__objects = dict(FileStorage.__objects)
+            FileStorage.__indexed = FileStorage.__objects
+            FileStorage.__handed_out = False
+        return FileStorage.__objects
+
+    def __snapshot(self):
+        """
+        Returns the dictionary of every object, which changes now copy
+        instead of changing, and a copy of the records kept raw by a lazy
+        reload.
+        """
+        self.__sync_buckets()
+        FileStorage.__handed_out = True
+        return FileStorage.__objects, {class_name: dict(raw) for class_name,
+                                       raw in FileStorage.__raw.items()}
+
+    def __write_snapshot(self, objects, raw):
+        """
+        Writes objects and the raw records of a lazy reload, as returned by
+        __snapshot(), to the snapshot file, on the background writer when
+        background is True.
+        """
+        path = self.__snapshot_path()
+        if self.snapshot_format == "binary":
+            text = binary_format.dumps(self.__records(objects, raw))
+        else:
+            text = "{" + ", ".join(self.__serialize(objects, raw)) + "}"
+        if not self.background:
+            write_atomic(path, text)
+        else:
+            if FileStorage.__writer is None or \
+                    FileStorage.__writer.path != path:
+                self.flush()
+                FileStorage.__writer = BackgroundWriter(path)
+            FileStorage.__writer.submit(text)
+        if self.shared:
+            self.flush()
+            FileStorage.__signature = self.__stat_snapshot()
+
+    def __snapshot_path(self):
+        """
+        Returns the path of the file save() writes every object to.
+        """
+        if self.snapshot_format == "binary":
+            return os.path.splitext(self.__file_path)[0] + ".hbnb"
+        return self.__file_path
+
+    def __records(self, objects, raw):
+        """
+        Yields the key and dictionary of objects and of the raw records.
+        """
+        for key, obj in objects.items():
+            yield key, obj.to_dict()
+        for records in raw.values():
+            yield from records.items()
+
+    def __serialize(self, objects, raw):
+        """
+        Returns the '"<key>": <object JSON>' fragment of objects and of the
+        raw records, reusing the cached fragment of the objects that are
+        not dirty. The dirty flag is cleared before serializing, so a
+        change made meanwhile by another thread sets it again.
+        """
+        cache = FileStorage.__fragments
+        fragments = {}
+        for key, obj in objects.items():
+            cached = cache.get(key)
+            if cached is None or cached[0] is not obj or \
+                    getattr(obj, "_dirty", True):
+                obj._dirty = False
+                text = "{}: {}".format(json.dumps(key),
+                                       json.dumps(obj.to_dict()))
+                cached = (obj, text)
+            fragments[key] = cached
+        for records in raw.values():
+            for key, data in records.items():
+                cached = cache.get(key)
+                if cached is None or cached[0] is not data:
+                    cached = (data, "{}: {}".format(json.dumps(key),
+                                                    json.dumps(data)))
+                fragments[key] = cached
+        FileStorage.__fragments = fragments
+        return [text for obj, text in fragments.values()]
+
+    @contextmanager
+    def __file_lock(self, exclusive):
+        """
+        Context manager holding the fcntl lock of the .lock file next to
+        the JSON file when shared, exclusive to write the file or shared
+        to read it. The lock belongs to the process, so its threads take
+        it one at a time.
+        """
+        with FileStorage.__file_mutex:
+            lock_file = None
+            if self.shared and fcntl is not None and \
+                    not FileStorage.__file_depth:
+                path = FileStorage.__file_path + ".lock"
+                lock_file = FileStorage.__lock_file
+                if lock_file is None or lock_file.name != path:
+                    if lock_file is not None:
+                        lock_file.close()
+                    lock_file = FileStorage.__lock_file = open(path, "a")
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive
+                            else fcntl.LOCK_SH)
+            FileStorage.__file_depth += 1
+            try:
+                yield
+            finally:
+                FileStorage.__file_depth -= 1
+                if lock_file is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def __get_journal(self):
+        """
+        Returns the journal bound to the current JSON file path.
+        """
+        path = self.__file_path + ".log"
+        if FileStorage.__journal is None or \
+                FileStorage.__journal.path != path:
+            FileStorage.__journal = Journal(path)
+        return FileStorage.__journal
@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+This module defines the geometry behind the geospatial queries of the
+storage engines: distances on the Earth and latitude/longitude boxes.
+"""
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def distance_km(lat1, lon1, lat2, lon2):
+    """
+    Returns the great-circle distance in kilometers between two points
+    given in degrees, with the haversine formula.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    half_dphi = (phi2 - phi1) / 2
+    half_dlambda = math.radians(lon2 - lon1) / 2
+    a = math.sin(half_dphi) ** 2 + \
+        math.cos(phi1) * math.cos(phi2) * math.sin(half_dlambda) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat, lon, radius_km):
+    """
+    Returns the (south, west, north, east) box holding every point within
+    radius_km of the point (lat, lon). The box spans every longitude, from
+    -180 to 180, when the circle reaches a pole.
+
+    Raises:
+        ValueError: If the point or the radius is out of range.
+    """
+    check_point(lat, lon)
+    if radius_km < 0:
+        raise ValueError("Negative radius: {}".format(radius_km))
+    angle = radius_km / EARTH_RADIUS_KM
+    south = lat - math.degrees(angle)
+    north = lat + math.degrees(angle)
+    if south <= -90 or north >= 90:
+        return max(south, -90.0), -180.0, min(north, 90.0), 180.0
+    dlon = math.degrees(math.asin(math.sin(angle) /
+                                  math.cos(math.radians(lat))))
+    return south, normalize_longitude(lon - dlon), \
+        north, normalize_longitude(lon + dlon)
+
+
+def in_box(lat, lon, south, west, north, east):
+    """
+    Returns True if the point (lat, lon) lies in the box, which crosses
+    the antimeridian when west is greater than east.
+    """
+    if not south <= lat <= north:
+        return False
+    lon = normalize_longitude(lon)
+    if west <= east:
+        return west <= lon <= east
+    return lon >= west or lon <= east
+
+
+def normalize_longitude(lon):
+    """
+    Returns lon brought into [-180, 180), keeping 180 itself.
+    """
+    if -180 <= lon <= 180:
+        return lon
+    return (lon + 180) % 360 - 180
+
+
+def check_point(lat, lon):
+    """
+    Raises ValueError unless lat and lon are numbers and lat lies within
+    [-90, 90].
+    """
+    if not is_coordinate(lat) or not is_coordinate(lon) or \
+            not -90 <= lat <= 90:
+        raise ValueError("Invalid point: ({}, {})".format(lat, lon))
+
+
+def is_coordinate(value):
+    """
+    Returns True if value is a finite number usable as a coordinate.
+    """
+    return isinstance(value, (int, float)) and \
+        not isinstance(value, bool) and math.isfinite(value)
@@ -0,0 +1,296 @@
+#!/usr/bin/python3
+"""
+This module defines the secondary indexes FileStorage maintains over the
+attributes of the stored objects.
+"""
+import bisect
+import math
+from models.engine.geo import (bounding_box, distance_km, in_box,
+                               is_coordinate, normalize_longitude)
+
+_MAX_KEY = "\U0010ffff"
+
+
+class ReferenceIndex:
+    """
+    Reverse index of a reference attribute, such as City.state_id, mapping
+    each referenced id to the objects referring to it. A list attribute,
+    such as Place.amenity_ids, refers to every id it contains.
+
+    Attributes:
+        attribute (str): The indexed attribute.
+        attributes (tuple): The attributes whose changes update the index.
+    """
+
+    def __init__(self, attribute, objects):
+        """
+        Builds the index of attribute over objects.
+
+        Args:
+            attribute (str): The indexed attribute.
+            objects (dict): The objects to index, keyed by <class name>.id.
+        """
+        self.attribute = attribute
+        self.attributes = (attribute,)
+        self.__refs = {}
+        self.__ids = {}
+        for key, obj in objects.items():
+            self.add(key, obj)
+
+    def add(self, key, obj):
+        """
+        Indexes obj, stored under key.
+        """
+        value = getattr(obj, self.attribute, None)
+        if isinstance(value, (list, tuple, set)):
+            ids = tuple(value)
+        elif value is None or value == "":
+            ids = ()
+        else:
+            ids = (value,)
+        self.__ids[key] = ids
+        for ref in ids:
+            self.__refs.setdefault(ref, {})[key] = obj
+
+    def remove(self, key):
+        """
+        Removes the object stored under key from the index.
+        """
+        for ref in self.__ids.pop(key, ()):
+            refs = self.__refs.get(ref)
+            if refs is not None:
+                refs.pop(key, None)
+                if not refs:
+                    del self.__refs[ref]
+
+    def update(self, key, obj):
+        """
+        Indexes obj again after its attribute changed.
+        """
+        self.remove(key)
+        self.add(key, obj)
+
+    def lookup(self, ref):
+        """
+        Returns the objects referring to ref, keyed by <class name>.id.
+        """
+        return dict(self.__refs.get(ref, {}))
+
+
+class SortedIndex:
+    """
+    Index keeping the objects ordered by a numeric attribute, such as
+    Place.price_by_night, to answer range conditions without a scan.
+    Objects whose attribute is not a number are left out.
+
+    Attributes:
+        attribute (str): The indexed attribute.
+        attributes (tuple): The attributes whose changes update the index.
+    """
+
+    def __init__(self, attribute, objects):
+        """
+        Builds the index of attribute over objects.
+
+        Args:
+            attribute (str): The indexed attribute.
+            objects (dict): The objects to index, keyed by <class name>.id.
+        """
+        self.attribute = attribute
+        self.attributes = (attribute,)
+        self.__entries = []
+        self.__values = {}
+        self.__objects = {}
+        for key, obj in objects.items():
+            value = getattr(obj, attribute, None)
+            if isinstance(value, (int, float)):
+                self.__entries.append((value, key))
+                self.__values[key] = value
+                self.__objects[key] = obj
+        self.__entries.sort()
+
+    def __len__(self):
+        """Returns the number of indexed objects."""
+        return len(self.__entries)
+
+    def add(self, key, obj):
+        """
+        Indexes obj, stored under key.
+        """
+        value = getattr(obj, self.attribute, None)
+        if isinstance(value, (int, float)):
+            bisect.insort(self.__entries, (value, key))
+            self.__values[key] = value
+            self.__objects[key] = obj
+
+    def remove(self, key):
+        """
+        Removes the object stored under key from the index.
+        """
+        if key not in self.__values:
+            return
+        value = self.__values.pop(key)
+        del self.__objects[key]
+        del self.__entries[bisect.bisect_left(self.__entries, (value, key))]
+
+    def update(self, key, obj):
+        """
+        Indexes obj again after its attribute changed.
+        """
+        self.remove(key)
+        self.add(key, obj)
+
+    def select(self, op=None, value=None):
+        """
+        Returns the (key, object) pairs whose attribute satisfies the
+        comparison op ("eq", "lt", "lte", "gt" or "gte") with value, in
+        ascending order of the attribute. Every pair when op is None.
+
+        The entries are sliced in one step, so selecting while another
+        thread changes the index is safe: an object changed meanwhile is
+        only left out or found at its former place.
+        """
+        start, end = 0, len(self.__entries)
+        low, high = (value, ""), (value, _MAX_KEY)
+        if op in ("eq", "gt", "gte"):
+            start = bisect.bisect_left(self.__entries,
+                                       high if op == "gt" else low)
+        if op in ("eq", "lt", "lte"):
+            end = bisect.bisect_left(self.__entries,
+                                     low if op == "lt" else high)
+        objects = self.__objects
+        selected = [(key, objects.get(key))
+                    for entry, key in self.__entries[start:end]]
+        return [(key, obj) for key, obj in selected if obj is not None]
+
+
+class GeoIndex:
+    """
+    Grid index of the objects located by a latitude and a longitude
+    attribute, such as Place.latitude and Place.longitude, to find the
+    objects near a point or inside a box without a scan. The world is cut
+    into square cells of cell_degrees, and only the cells a search area
+    overlaps are visited. Objects without a valid location are left out.
+
+    Attributes:
+        attributes (tuple): The latitude and longitude attributes.
+        cell_degrees (float): The side of a cell, in degrees.
+    """
+    cell_degrees = 0.1
+
+    def __init__(self, latitude, longitude, objects):
+        """
+        Builds the index of the location of objects.
+
+        Args:
+            latitude (str): The latitude attribute, in degrees.
+            longitude (str): The longitude attribute, in degrees.
+            objects (dict): The objects to index, keyed by <class name>.id.
+        """
+        self.attributes = (latitude, longitude)
+        self.__rows = math.ceil(180 / self.cell_degrees)
+        self.__columns = math.ceil(360 / self.cell_degrees)
+        self.__cells = {}
+        self.__locations = {}
+        for key, obj in objects.items():
+            self.add(key, obj)
+
+    def __len__(self):
+        """Returns the number of indexed objects."""
+        return len(self.__locations)
+
+    def add(self, key, obj):
+        """
+        Indexes obj, stored under key.
+        """
+        lat = getattr(obj, self.attributes[0], None)
+        lon = getattr(obj, self.attributes[1], None)
+        if not is_coordinate(lat) or not is_coordinate(lon) or \
+                not -90 <= lat <= 90:
+            return
+        cell = (self.__row(lat), self.__column(lon))
+        self.__cells.setdefault(cell, {})[key] = (lat, lon, obj)
+        self.__locations[key] = cell
+
+    def remove(self, key):
+        """
+        Removes the object stored under key from the index.
+        """
+        cell = self.__locations.pop(key, None)
+        if cell is not None:
+            entries = self.__cells[cell]
+            del entries[key]
+            if not entries:
+                del self.__cells[cell]
+
+    def update(self, key, obj):
+        """
+        Indexes obj again after its location changed.
+        """
+        self.remove(key)
+        self.add(key, obj)
+
+    def nearby(self, lat, lon, radius_km, limit=None):
+        """
+        Returns the (distance in km, key, object) triples of the objects
+        within radius_km of the point (lat, lon), nearest first, and at
+        most limit of them.
+
+        Raises:
+            ValueError: If the point or the radius is out of range.
+        """
+        found = []
+        for key, (obj_lat, obj_lon, obj) in \
+                self.__search(*bounding_box(lat, lon, radius_km)):
+            distance = distance_km(lat, lon, obj_lat, obj_lon)
+            if distance <= radius_km:
+                found.append((distance, key, obj))
+        found.sort(key=lambda entry: entry[:2])
+        return found if limit is None else found[:limit]
+
+    def within(self, south, west, north, east):
+        """
+        Returns the objects inside the box, keyed by <class name>.id. The
+        box crosses the antimeridian when west is greater than east.
+        """
+        return {key: obj for key, (lat, lon, obj) in
+                self.__search(south, west, north, east)
+                if in_box(lat, lon, south, west, north, east)}
+
+    def __search(self, south, west, north, east):
+        """
+        Yields the (key, (latitude, longitude, object)) entries of the
+        cells the box overlaps.
+        """
+        rows = range(self.__row(max(south, -90)), self.__row(min(north, 90))
+                     + 1)
+        if east - west >= 360:
+            columns = range(self.__columns)
+        else:
+            first, last = self.__column(west), self.__column(east)
+            if first <= last and normalize_longitude(west) <= \
+                    normalize_longitude(east):
+                columns = range(first, last + 1)
+            else:
+                columns = list(range(first, self.__columns)) + \
+                    list(range(last + 1))
+        if len(rows) * len(columns) > len(self.__cells):
+            columns = set(columns)
+            cells = [entries for (row, column), entries
+                     in self.__cells.items()
+                     if row in rows and column in columns]
+        else:
+            cells = [self.__cells[cell] for cell in
+                     ((row, column) for row in rows for column in columns)
+                     if cell in self.__cells]
+        for entries in cells:
+            yield from entries.items()
+
+    def __row(self, lat):
+        """Returns the row of the cells holding latitude lat."""
+        return min(int((lat + 90) // self.cell_degrees), self.__rows - 1)
+
+    def __column(self, lon):
+        """Returns the column of the cells holding longitude lon."""
+        lon = normalize_longitude(lon)
+        return int((lon + 180) // self.cell_degrees) % self.__columns
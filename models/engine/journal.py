@@ -0,0 +1,115 @@
+#!/usr/bin/python3
+"""
+This module defines the Journal class, an append-only write-ahead log
+used by FileStorage to persist single object changes without rewriting
+the whole JSON file.
+"""
+import json
+import os
+
+
+class Journal:
+    """
+    Append-only log of storage mutations.
+
+    Every line of the log file is a compact JSON array, either
+    ["set", <key>, <object dictionary>] or ["del", <key>].
+
+    Attributes:
+        path (str): The path of the log file.
+        records (int): The number of records currently in the log.
+        offset (int): The size of the log read or written so far, past
+            which tail() finds the records appended by other processes.
+    """
+
+    def __init__(self, path):
+        """
+        Initializes a journal bound to the log file at path.
+
+        Args:
+            path (str): The path of the log file.
+        """
+        self.path = path
+        self.records = 0
+        self.offset = 0
+
+    def append(self, changes):
+        """
+        Appends a batch of changes to the log.
+
+        Args:
+            changes (dict): Maps each key to its object dictionary,
+            or to None when the object was destroyed.
+        """
+        lines = []
+        for key, data in changes.items():
+            if data is None:
+                lines.append(json.dumps(["del", key]))
+            else:
+                lines.append(json.dumps(["set", key, data]))
+        if not lines:
+            return
+        with open(self.path, "ab") as file:
+            file.write(("\n".join(lines) + "\n").encode("utf-8"))
+            file.flush()
+            self.offset = file.tell()
+        self.records += len(lines)
+
+    def replay(self):
+        """
+        Yields the records of the log in the order they were written.
+
+        A torn last line left behind by a crash mid-append is skipped.
+
+        Yields:
+            tuple: (key, object dictionary) or (key, None) for a deletion.
+        """
+        self.records = 0
+        self.offset = 0
+        yield from self.tail()
+
+    def tail(self):
+        """
+        Yields the records written past offset, such as the ones appended
+        by another process, and moves offset past them. A last line still
+        being written is left for the next call.
+
+        Yields:
+            tuple: (key, object dictionary) or (key, None) for a deletion.
+        """
+        try:
+            file = open(self.path, "rb")
+        except FileNotFoundError:
+            return
+        with file:
+            file.seek(self.offset)
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    if not line.endswith(b"\n"):
+                        return
+                    self.offset += len(line)
+                    continue
+                self.offset += len(line)
+                self.records += 1
+                if record[0] == "del":
+                    yield record[1], None
+                else:
+                    yield record[1], record[2]
+
+    def size(self):
+        """Returns the size of the log file, 0 when it is missing."""
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def truncate(self):
+        """Removes every record from the log."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.records = 0
+        self.offset = 0
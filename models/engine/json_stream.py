@@ -0,0 +1,105 @@
+#!/usr/bin/python3
+"""
+This module reads the top-level object of a JSON file one key/value pair
+at a time, so a file larger than memory never has to be parsed at once.
+"""
+import json
+
+WHITESPACE = " \t\n\r"
+
+
+def iter_items(file, chunk_size=1 << 16):
+    """
+    Yields the key/value pairs of the JSON object stored in file.
+
+    Only the pair being decoded is held in memory, next to a read buffer
+    of about chunk_size characters.
+
+    Args:
+        file: A text file object positioned at the start of the JSON.
+        chunk_size (int): The number of characters read at a time.
+
+    Yields:
+        tuple: (key, value) for every member of the object.
+
+    Raises:
+        ValueError: If the file is not a JSON object.
+    """
+    reader = _Reader(file, chunk_size)
+    if reader.next_char() != "{":
+        raise ValueError("Expecting '{' at the start of the JSON file")
+    reader.pos += 1
+    if reader.next_char() == "}":
+        return
+    while True:
+        key = reader.decode()
+        if reader.next_char() != ":":
+            raise ValueError("Expecting ':' after key {!r}".format(key))
+        reader.pos += 1
+        reader.next_char()
+        yield key, reader.decode()
+        char = reader.next_char()
+        reader.pos += 1
+        if char == "}":
+            return
+        if char != ",":
+            raise ValueError(
+                "Expecting ',' or '}}' after key {!r}".format(key))
+        reader.next_char()
+
+
+class _Reader:
+    """
+    Read buffer over a text file, decoding one JSON value at a time.
+    """
+
+    def __init__(self, file, chunk_size):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def fill(self):
+        """
+        Drops the consumed part of the buffer and reads another chunk.
+        Returns False at the end of the file.
+        """
+        chunk = self.file.read(self.chunk_size)
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        if not chunk:
+            self.eof = True
+        return bool(chunk)
+
+    def next_char(self):
+        """
+        Skips whitespace and returns the next character, "" at the end.
+        """
+        while True:
+            while self.pos < len(self.buffer) and \
+                    self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def decode(self):
+        """
+        Decodes the value starting at the current position, reading more
+        of the file until the value is complete.
+        """
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.eof or not self.fill():
+                    raise
+                continue
+            if end == len(self.buffer) and not self.eof:
+                self.fill()
+                continue
+            self.pos = end
+            return value
@@ -0,0 +1,288 @@
+#!/usr/bin/python3
+"""
+This module defines the MmapStorage class, a storage engine reading each
+object straight from a memory-mapped data file through an index of
+record offsets.
+"""
+import json
+import mmap
+import os
+from models.engine.base_storage import BaseStorage
+from models.engine.writer import write_atomic
+
+
+class MmapStorage(BaseStorage):
+    """
+    MmapStorage class keeping objects in an append-only data file.
+
+    Every line of the data file is a JSON record, [<key>, <to_dict()>] or
+    [<key>, null] once the object is destroyed. The index file maps each
+    key to the offset and length of its latest record with one line per
+    change, "+ <key> <offset> <length>" or "- <key> <offset> <length>".
+    Startup only reads the index; show, update and destroy read or append
+    the one record they touch through an mmap of the data file. Records a
+    crash left out of the index are recovered from the end of the data
+    file. compact() drops the superseded records.
+
+    The data file is taken from HBNB_MMAP_PATH, hbnb.dat by default, and
+    the index is kept next to it with a .idx suffix.
+    """
+
+    def __init__(self):
+        """
+        Initializes the storage on the data file of HBNB_MMAP_PATH.
+        """
+        self.__path = os.getenv("HBNB_MMAP_PATH", "hbnb.dat")
+        self.__index_path = self.__path + ".idx"
+        self.__index = {}
+        self.__objects = {}
+        self.__deleted = set()
+        self.__map = None
+        self.__size = 0
+        self.__batch = None
+        self.__batch_depth = 0
+
+    def all(self, cls=None):
+        """
+        Returns a dictionary of the objects of cls, or of every object,
+        keyed by <class name>.id.
+        """
+        if cls is None:
+            objects = {}
+            for class_name in self.classes:
+                objects.update(self.all(class_name))
+            return objects
+        class_name = self.__class_name(cls)
+        objects = {}
+        for obj_id in list(self.__index.get(class_name, {})):
+            objects["{}.{}".format(class_name, obj_id)] = \
+                self.get(class_name, obj_id)
+        return objects
+
+    def new(self, obj):
+        """
+        Adds obj to the storage; its record is written by save().
+        """
+        class_name = obj.__class__.__name__
+        key = "{}.{}".format(class_name, obj.id)
+        self.__objects[key] = obj
+        self.__deleted.discard(key)
+        self.__index.setdefault(class_name, {}).setdefault(obj.id, None)
+        obj._dirty = True
+
+    def save(self):
+        """
+        Appends the records of the dirty and destroyed objects.
+        """
+        if self.__batch_depth:
+            self.__batch["save"] = True
+            return
+        records = []
+        for key, obj in self.__objects.items():
+            if getattr(obj, "_dirty", True):
+                records.append((key, obj.to_dict()))
+                obj._dirty = False
+        records.extend((key, None) for key in self.__deleted)
+        self.__deleted = set()
+        if not records:
+            return
+        entries = []
+        with open(self.__path, "ab") as data:
+            offset = data.tell()
+            for key, record in records:
+                line = json.dumps([key, record]).encode("utf-8") + b"\n"
+                data.write(line)
+                entries.append("{} {} {} {}\n".format(
+                    "-" if record is None else "+", key, offset, len(line)))
+                self.__apply(entries[-1].split())
+                offset += len(line)
+            data.flush()
+        with open(self.__index_path, "a", encoding="utf-8") as index:
+            index.write("".join(entries))
+        self.__remap()
+
+    def reload(self):
+        """
+        Reads the index, then recovers the records appended to the data
+        file after the last index entry.
+        """
+        self.__index = {}
+        end = 0
+        try:
+            with open(self.__index_path, "r", encoding="utf-8") as index:
+                for line in index:
+                    entry = line.split()
+                    if len(entry) == 4:
+                        self.__apply(entry)
+                        end = max(end, int(entry[2]) + int(entry[3]))
+        except FileNotFoundError:
+            pass
+        self.__remap()
+        if self.__size > end:
+            self.__recover(end)
+
+    def delete(self, obj=None):
+        """
+        Destroys obj; the tombstone record is written by save().
+        """
+        if obj is None:
+            return
+        class_name = obj.__class__.__name__
+        key = "{}.{}".format(class_name, obj.id)
+        self.__objects.pop(key, None)
+        if self.__index.get(class_name, {}).pop(obj.id, False) is not False:
+            self.__deleted.add(key)
+
+    def get(self, cls, id):
+        """
+        Returns the object of class cls with the given id, or None, reading
+        only its record.
+        """
+        class_name = self.__class_name(cls)
+        key = "{}.{}".format(class_name, id)
+        obj = self.__objects.get(key)
+        if obj is not None:
+            return obj
+        location = self.__index.get(class_name, {}).get(id)
+        if location is None:
+            return None
+        offset, length = location
+        record = json.loads(self.__map[offset:offset + length])[1]
+        obj = self.classes[class_name](**record)
+        obj._dirty = False
+        self.__objects[key] = obj
+        return obj
+
+    def count(self, cls=None):
+        """
+        Returns the number of objects of cls, or of every object.
+        """
+        if cls is None:
+            return sum(map(len, self.__index.values()))
+        return len(self.__index.get(self.__class_name(cls), {}))
+
+    def begin(self):
+        """
+        Starts deferring saves until the matching commit().
+        """
+        if not self.__batch_depth:
+            self.__batch = {
+                "save": False,
+                "index": {class_name: dict(ids) for class_name, ids
+                          in self.__index.items()},
+                "deleted": set(self.__deleted)
+            }
+        self.__batch_depth += 1
+
+    def commit(self):
+        """
+        Ends the batch started by begin(), saving once if a save was
+        requested inside it.
+        """
+        if not self.__batch_depth:
+            return
+        self.__batch_depth -= 1
+        if not self.__batch_depth:
+            batch, self.__batch = self.__batch, None
+            if batch["save"]:
+                self.save()
+
+    def rollback(self):
+        """
+        Ends the batch started by begin(), restoring the index. Objects
+        read before are read again from the data file, and those never
+        saved are dropped.
+        """
+        if not self.__batch_depth:
+            return
+        batch, self.__batch = self.__batch, None
+        self.__batch_depth = 0
+        self.__index = {class_name: {obj_id: location
+                                     for obj_id, location in ids.items()
+                                     if location is not None}
+                        for class_name, ids in batch["index"].items()}
+        self.__deleted = batch["deleted"]
+        self.__objects = {}
+
+    def compact(self):
+        """
+        Rewrites the data file and the index with only the latest record
+        of every stored object.
+        """
+        self.save()
+        lines = []
+        entries = []
+        offset = 0
+        for class_name, ids in self.__index.items():
+            for obj_id, (start, length) in ids.items():
+                key = "{}.{}".format(class_name, obj_id)
+                lines.append(self.__map[start:start + length])
+                entries.append("+ {} {} {}\n".format(key, offset, length))
+                offset += length
+        self.close()
+        write_atomic(self.__path, b"".join(lines))
+        write_atomic(self.__index_path, "".join(entries))
+        self.reload()
+
+    def close(self):
+        """
+        Unmaps the data file.
+        """
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+
+    def __class_name(self, cls):
+        """
+        Returns the name of cls, checking it is a known class.
+        """
+        class_name = cls if isinstance(cls, str) else cls.__name__
+        if class_name not in self.classes:
+            raise KeyError(class_name)
+        return class_name
+
+    def __apply(self, entry):
+        """
+        Applies an index entry, split into its four fields.
+        """
+        class_name, _, obj_id = entry[1].partition(".")
+        ids = self.__index.setdefault(class_name, {})
+        if entry[0] == "-":
+            ids.pop(obj_id, None)
+        else:
+            ids[obj_id] = (int(entry[2]), int(entry[3]))
+
+    def __remap(self):
+        """
+        Maps the current content of the data file.
+        """
+        self.close()
+        try:
+            self.__size = os.path.getsize(self.__path)
+        except FileNotFoundError:
+            self.__size = 0
+        if not self.__size:
+            return
+        with open(self.__path, "rb") as data:
+            self.__map = mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __recover(self, offset):
+        """
+        Indexes the complete records of the data file from offset on.
+        """
+        entries = []
+        while offset < self.__size:
+            end = self.__map.find(b"\n", offset)
+            if end < 0:
+                break
+            try:
+                key, record = json.loads(self.__map[offset:end])
+            except ValueError:
+                break
+            entry = "{} {} {} {}\n".format("-" if record is None else "+",
+                                           key, offset, end + 1 - offset)
+            self.__apply(entry.split())
+            entries.append(entry)
+            offset = end + 1
+        with open(self.__index_path, "a", encoding="utf-8") as index:
+            index.write("".join(entries))
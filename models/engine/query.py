@@ -0,0 +1,198 @@
+#!/usr/bin/python3
+"""
+This module defines the Query class, filtering and sorting the objects of
+one class of a storage engine by their attributes.
+"""
+import operator
+
+OPERATORS = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "lt": operator.lt,
+    "lte": operator.le,
+    "gt": operator.gt,
+    "gte": operator.ge,
+    "in": lambda value, values: value in values
+}
+RANGE_OPERATORS = ("eq", "lt", "lte", "gt", "gte")
+
+
+class Query:
+    """
+    Query over the objects of one class, built by chaining where(),
+    order_by(), offset() and limit(), for example:
+
+        storage.query(Place).where(price_by_night__lt=100,
+                                   max_guest__gte=4) \\
+            .order_by("price_by_night").limit(20).all()
+
+    A condition is written <attribute>__<operator>=<value>, the operator
+    being one of eq, ne, lt, lte, gt, gte and in, and eq when omitted. An
+    object missing the attribute, or whose value cannot be compared with
+    the condition value, does not match.
+
+    When the storage keeps a sorted index of an attribute compared with a
+    number, the objects are taken from the index instead of a scan of the
+    whole class.
+    """
+
+    def __init__(self, storage, cls):
+        """
+        Initializes a query over every object of cls.
+
+        Args:
+            storage (BaseStorage): The storage engine holding the objects.
+            cls (type or str): The class, or class name, to query.
+        """
+        self.storage = storage
+        self.class_name = cls if isinstance(cls, str) else cls.__name__
+        self.__conditions = []
+        self.__order = []
+        self.__offset = 0
+        self.__limit = None
+
+    def where(self, **conditions):
+        """
+        Returns a query also requiring every condition.
+
+        Raises:
+            ValueError: If a condition has an unknown operator.
+        """
+        query = self.__copy()
+        for name, value in conditions.items():
+            attribute, _, op = name.partition("__")
+            op = op or "eq"
+            if op not in OPERATORS or not attribute:
+                raise ValueError("Invalid condition: {}".format(name))
+            query.__conditions.append((attribute, op, value))
+        return query
+
+    def order_by(self, *attributes):
+        """
+        Returns a query sorting on attributes, in descending order for the
+        ones prefixed with "-". Numbers sort before strings, and objects
+        missing the attribute come after the others, or before them in
+        descending order.
+        """
+        query = self.__copy()
+        query.__order = [(name.lstrip("-"), name.startswith("-"))
+                         for name in attributes]
+        return query
+
+    def offset(self, count):
+        """
+        Returns a query skipping the first count results.
+        """
+        query = self.__copy()
+        query.__offset = count
+        return query
+
+    def limit(self, count):
+        """
+        Returns a query stopping after count results.
+        """
+        query = self.__copy()
+        query.__limit = count
+        return query
+
+    def all(self):
+        """
+        Returns the list of matching objects.
+        """
+        candidates, ordered = self.__candidates()
+        matches = [obj for obj in candidates if self.__match(obj)]
+        if not ordered:
+            for attribute, descending in reversed(self.__order):
+                matches.sort(key=lambda obj: _sort_key(obj, attribute),
+                             reverse=descending)
+        end = None if self.__limit is None else self.__offset + self.__limit
+        return matches[self.__offset:end]
+
+    def first(self):
+        """
+        Returns the first matching object, or None.
+        """
+        matches = self.limit(1).all()
+        return matches[0] if matches else None
+
+    def count(self):
+        """
+        Returns the number of matching objects.
+        """
+        return len(self.all())
+
+    def __iter__(self):
+        """
+        Iterates over the matching objects.
+        """
+        return iter(self.all())
+
+    def __copy(self):
+        """
+        Returns a copy of the query.
+        """
+        query = Query(self.storage, self.class_name)
+        query.__conditions = list(self.__conditions)
+        query.__order = list(self.__order)
+        query.__offset = self.__offset
+        query.__limit = self.__limit
+        return query
+
+    def __candidates(self):
+        """
+        Returns the objects the conditions are checked against, and whether
+        they already come in the requested order.
+
+        The narrowest sorted index selection among the conditions is used;
+        without any, every object of the class is scanned. With no
+        condition but a single ascending sort on an indexed attribute, the
+        objects holding a number come from the index in order.
+        """
+        best = None
+        for attribute, op, value in self.__conditions:
+            if op not in RANGE_OPERATORS or \
+                    not isinstance(value, (int, float)):
+                continue
+            index = self.storage.sorted_index(self.class_name, attribute)
+            if index is None:
+                continue
+            selected = index.select(op, value)
+            if best is None or len(selected) < len(best[1]):
+                best = (attribute, selected)
+        if best is not None:
+            ordered = self.__order == [(best[0], False)]
+            return [obj for key, obj in best[1]], ordered
+        if len(self.__order) == 1 and not self.__order[0][1]:
+            attribute = self.__order[0][0]
+            index = self.storage.sorted_index(self.class_name, attribute)
+            if index is not None and \
+                    len(index) == self.storage.count(self.class_name):
+                return [obj for key, obj in index.select()], True
+        return list(self.storage.all(self.class_name).values()), False
+
+    def __match(self, obj):
+        """
+        Returns True if obj satisfies every condition.
+        """
+        for attribute, op, value in self.__conditions:
+            try:
+                if not OPERATORS[op](getattr(obj, attribute), value):
+                    return False
+            except (AttributeError, TypeError):
+                return False
+        return True
+
+
+def _sort_key(obj, attribute):
+    """
+    Returns the key sorting obj on attribute, so that values of different
+    types never get compared.
+    """
+    value = getattr(obj, attribute, None)
+    if isinstance(value, (int, float)):
+        return (0, value)
+    if isinstance(value, str):
+        return (1, value)
+    if value is None:
+        return (3, 0)
+    return (2, str(value))
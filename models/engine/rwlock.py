@@ -0,0 +1,168 @@
+#!/usr/bin/python3
+"""
+This module defines the RWLock class, a reader/writer lock letting any
+number of threads read shared state at once while a thread changing it
+has it to itself.
+"""
+import threading
+
+
+class RWLock:
+    """
+    Reader/writer lock held either by any number of readers or by a single
+    writer.
+
+    A waiting writer stops new readers from entering, so a steady stream
+    of readers cannot starve it. Both sides are reentrant: a thread may
+    take the lock again on the side it holds, and a writer may also read.
+    A reader cannot become a writer without releasing the lock first, as
+    two readers doing so would wait for each other forever.
+    """
+
+    def __init__(self):
+        """
+        Initializes a lock held by no thread.
+        """
+        self.__mutex = threading.Lock()
+        self.__condition = threading.Condition(self.__mutex)
+        self.__readers = {}
+        self.__writer = None
+        self.__depth = 0
+        self.__waiting = 0
+        self.__sleeping = 0
+        self.__read = _Holder(self.acquire_read, self.release_read)
+        self.__write = _Holder(self.acquire_write, self.release_write)
+
+    def acquire_read(self):
+        """
+        Waits until no thread writes or waits to write, then holds the
+        lock for reading.
+        """
+        me = threading.get_ident()
+        with self.__mutex:
+            if self.__writer == me:
+                self.__depth += 1
+                return
+            if me in self.__readers:
+                self.__readers[me] += 1
+                return
+            while self.__writer is not None or self.__waiting:
+                self.__wait()
+            self.__readers[me] = 1
+
+    def release_read(self):
+        """
+        Releases the lock taken by acquire_read().
+        """
+        me = threading.get_ident()
+        with self.__mutex:
+            if self.__writer == me:
+                self.__release_write()
+                return
+            depth = self.__readers.pop(me) - 1
+            if depth:
+                self.__readers[me] = depth
+            elif not self.__readers:
+                self.__wake()
+
+    def acquire_write(self):
+        """
+        Waits until no other thread holds the lock, then holds it for
+        writing.
+
+        Raises:
+            RuntimeError: If the calling thread holds the lock for reading.
+        """
+        me = threading.get_ident()
+        if self.__writer == me:
+            self.__depth += 1
+            return
+        with self.__mutex:
+            if me in self.__readers:
+                raise RuntimeError("A reader cannot take the lock to write")
+            if self.__writer is not None or self.__readers:
+                self.__waiting += 1
+                try:
+                    while self.__writer is not None or self.__readers:
+                        self.__wait()
+                finally:
+                    self.__waiting -= 1
+            self.__writer = me
+            self.__depth = 1
+
+    def release_write(self):
+        """
+        Releases the lock taken by acquire_write().
+        """
+        if self.__depth > 1 and self.__writer == threading.get_ident():
+            self.__depth -= 1
+            return
+        with self.__mutex:
+            self.__release_write()
+
+    def read(self):
+        """
+        Returns a context manager holding the lock for reading over its
+        block.
+        """
+        return self.__read
+
+    def write(self):
+        """
+        Returns a context manager holding the lock for writing over its
+        block.
+        """
+        return self.__write
+
+    def __release_write(self):
+        """
+        Releases one level of the write lock, waking the waiting threads
+        once the writer holds it no more. The mutex must be held.
+        """
+        if self.__writer != threading.get_ident():
+            raise RuntimeError("The lock is not held for writing")
+        self.__depth -= 1
+        if not self.__depth:
+            self.__writer = None
+            self.__wake()
+
+    def __wait(self):
+        """
+        Sleeps until another thread releases the lock. The mutex must be
+        held.
+        """
+        self.__sleeping += 1
+        try:
+            self.__condition.wait()
+        finally:
+            self.__sleeping -= 1
+
+    def __wake(self):
+        """
+        Wakes the sleeping threads, if any. The mutex must be held.
+        """
+        if self.__sleeping:
+            self.__condition.notify_all()
+
+
+class _Holder:
+    """
+    Context manager calling acquire on entering its block and release on
+    leaving it.
+    """
+    __slots__ = ("acquire", "release")
+
+    def __init__(self, acquire, release):
+        """
+        Initializes a context manager for the acquire and release methods.
+        """
+        self.acquire = acquire
+        self.release = release
+
+    def __enter__(self):
+        """Calls acquire."""
+        self.acquire()
+
+    def __exit__(self, *exc_info):
+        """Calls release."""
+        self.release()
@@ -0,0 +1,198 @@
+#!/usr/bin/python3
+"""
+This module defines the full-text index behind storage.search(), an
+inverted index of the words of text attributes ranked with BM25.
+"""
+import math
+import re
+import zlib
+from collections import Counter
+
+WORD = re.compile(r"\w+")
+K1 = 1.2
+B = 0.75
+
+
+def tokenize(text):
+    """
+    Returns the lowercase words of text.
+    """
+    return WORD.findall(text.casefold())
+
+
+class TextIndex:
+    """
+    Inverted index of the words of text attributes, such as Place.name and
+    Place.description, mapping each word to the objects containing it and
+    how many times.
+
+    Every object is stored with a checksum of its text, so an index saved
+    with dump() and given back to the constructor only tokenizes again the
+    objects whose text changed since.
+
+    Attributes:
+        attributes (tuple): The indexed attributes.
+        changed (bool): Whether the index changed since the last dump().
+    """
+
+    def __init__(self, attributes, objects, saved=None):
+        """
+        Builds the index of attributes over objects.
+
+        Args:
+            attributes (tuple): The indexed attributes.
+            objects (dict): The objects to index, keyed by <class name>.id.
+            saved (dict): An index of the same attributes returned by
+                dump(), reused for the objects whose text is unchanged.
+        """
+        self.attributes = tuple(attributes)
+        self.__postings = {}
+        self.__documents = {}
+        self.__objects = {}
+        self.__length = 0
+        self.changed = False
+        if saved is not None and \
+                tuple(saved.get("attributes", ())) == self.attributes:
+            self.__postings = saved["postings"]
+            self.__documents = {key: tuple(document) for key, document
+                                in saved["documents"].items()}
+            self.__length = sum(document[1] for document
+                                in self.__documents.values())
+            for key in list(self.__documents):
+                obj = objects.get(key)
+                if obj is None or \
+                        self.__documents[key][0] != self.__checksum(obj):
+                    self.remove(key)
+        for key, obj in objects.items():
+            if key in self.__documents:
+                self.__objects[key] = obj
+            else:
+                self.add(key, obj)
+
+    def __len__(self):
+        """Returns the number of indexed objects."""
+        return len(self.__documents)
+
+    def add(self, key, obj):
+        """
+        Indexes obj, stored under key.
+        """
+        words = tokenize(self.__text(obj))
+        counts = Counter(words)
+        for word, count in counts.items():
+            self.__postings.setdefault(word, {})[key] = count
+        self.__documents[key] = (self.__checksum(obj), len(words),
+                                 list(counts))
+        self.__objects[key] = obj
+        self.__length += len(words)
+        self.changed = True
+
+    def remove(self, key):
+        """
+        Removes the object stored under key from the index.
+        """
+        document = self.__documents.pop(key, None)
+        if document is None:
+            return
+        self.__objects.pop(key, None)
+        self.__length -= document[1]
+        for word in document[2]:
+            postings = self.__postings.get(word)
+            if postings is not None:
+                postings.pop(key, None)
+                if not postings:
+                    del self.__postings[word]
+        self.changed = True
+
+    def update(self, key, obj):
+        """
+        Indexes obj again after its text changed.
+        """
+        document = self.__documents.get(key)
+        if document is not None and document[0] == self.__checksum(obj):
+            self.__objects[key] = obj
+            return
+        self.remove(key)
+        self.add(key, obj)
+
+    def statistics(self, words):
+        """
+        Returns the number of indexed objects, their total number of words
+        and the number of objects containing each of words.
+        """
+        return len(self.__documents), self.__length, \
+            {word: len(self.__postings.get(word, ())) for word in words}
+
+    def scores(self, weights, average_length):
+        """
+        Returns the BM25 score of every object containing one of the words
+        of weights, a mapping of each word to its inverse document
+        frequency, keyed by <class name>.id.
+        """
+        scores = {}
+        documents = self.__documents
+        for word, weight in weights.items():
+            for key, count in self.__postings.get(word, {}).items():
+                norm = K1 * (1 - B + B * documents[key][1] / average_length)
+                scores[key] = scores.get(key, 0) + \
+                    weight * count * (K1 + 1) / (count + norm)
+        return scores
+
+    def get(self, key):
+        """
+        Returns the indexed object stored under key.
+        """
+        return self.__objects[key]
+
+    def dump(self):
+        """
+        Returns the index as a dictionary the constructor accepts as saved,
+        made of JSON types only.
+        """
+        self.changed = False
+        return {"attributes": list(self.attributes),
+                "postings": self.__postings,
+                "documents": self.__documents}
+
+    def __text(self, obj):
+        """
+        Returns the text of the indexed attributes of obj.
+        """
+        values = (getattr(obj, attribute, "")
+                  for attribute in self.attributes)
+        return "\n".join(value for value in values if isinstance(value, str))
+
+    def __checksum(self, obj):
+        """
+        Returns the checksum of the text of obj.
+        """
+        return zlib.crc32(self.__text(obj).encode("utf-8", "surrogatepass"))
+
+
+def rank(indexes, text, limit=None):
+    """
+    Returns the objects of indexes containing words of text as (score,
+    key, object) triples, best first, and at most limit of them. The
+    scores are computed over all the indexes as one collection.
+    """
+    words = list(dict.fromkeys(tokenize(text)))
+    count = length = 0
+    frequencies = dict.fromkeys(words, 0)
+    for index in indexes:
+        index_count, index_length, index_frequencies = \
+            index.statistics(words)
+        count += index_count
+        length += index_length
+        for word, frequency in index_frequencies.items():
+            frequencies[word] += frequency
+    if not count or not length:
+        return []
+    weights = {word: math.log(1 + (count - frequency + 0.5) /
+                              (frequency + 0.5))
+               for word, frequency in frequencies.items() if frequency}
+    found = []
+    for index in indexes:
+        for key, score in index.scores(weights, length / count).items():
+            found.append((score, key, index.get(key)))
+    found.sort(key=lambda entry: (-entry[0], entry[1]))
+    return found if limit is None else found[:limit]
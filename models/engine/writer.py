@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+"""
+This module writes files atomically, either on the calling thread with
+write_atomic() or on a dedicated thread with the BackgroundWriter class.
+"""
+import atexit
+import os
+import threading
+
+
+def write_atomic(path, text):
+    """
+    Replaces the file at path with text, which may also be bytes.
+
+    The text is written to a temporary file next to path, synced to disk
+    and renamed over path, so a crash leaves either the old or the new
+    content, never a truncated file.
+
+    Args:
+        path (str): The path of the file.
+        text (str): The new content of the file.
+    """
+    tmp_path = path + ".tmp"
+    if isinstance(text, bytes):
+        file = open(tmp_path, "wb")
+    else:
+        file = open(tmp_path, "w", encoding="utf-8")
+    with file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class BackgroundWriter:
+    """
+    Writes the content submitted for a file on a dedicated thread.
+
+    Only the latest content matters, so submissions made while a write is
+    in progress are coalesced into a single write of the last one.
+
+    Attributes:
+        path (str): The path of the file.
+    """
+
+    def __init__(self, path):
+        """
+        Initializes a writer for the file at path. The thread starts on
+        the first submission.
+
+        Args:
+            path (str): The path of the file.
+        """
+        self.path = path
+        self.__condition = threading.Condition()
+        self.__text = None
+        self.__submitted = 0
+        self.__written = 0
+        self.__error = None
+        self.__thread = None
+
+    def submit(self, text):
+        """
+        Schedules text to become the content of the file.
+
+        Args:
+            text (str): The new content of the file.
+        """
+        with self.__condition:
+            self.__text = text
+            self.__submitted += 1
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__run,
+                                                 daemon=True)
+                self.__thread.start()
+                atexit.register(self.flush)
+            self.__condition.notify_all()
+
+    def flush(self):
+        """
+        Waits until everything submitted so far is on disk.
+
+        Raises:
+            OSError: If the last write failed.
+        """
+        with self.__condition:
+            target = self.__submitted
+            while self.__written < target:
+                self.__condition.wait()
+            error, self.__error = self.__error, None
+        if error is not None:
+            raise error
+
+    def __run(self):
+        """
+        Writes the latest submitted content each time there is one.
+        """
+        while True:
+            with self.__condition:
+                while self.__text is None:
+                    self.__condition.wait()
+                text, self.__text = self.__text, None
+                generation = self.__submitted
+            error = None
+            try:
+                write_atomic(self.path, text)
+            except OSError as write_error:
+                error = write_error
+            with self.__condition:
+                if error is not None:
+                    self.__error = error
+                self.__written = generation
+                self.__condition.notify_all()
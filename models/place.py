@@ -2,9 +2,11 @@
 """
 Place class for the AirBnB clone project.
 """
-from models.base_model import BaseModel
+import models
+from models.base_model import BaseModel, compact
 
 
+@compact
 class Place(BaseModel):
     """
     Place class that inherits from BaseModel.
@@ -20,3 +22,19 @@ class Place(BaseModel):
     latitude = 0.0
     longitude = 0.0
     amenity_ids = []
+
+    @property
+    def reviews(self):
+        """The Review instances whose place_id is the id of this Place."""
+        related = models.storage.related("Review", "place_id", self.id)
+        return list(related.values())
+
+    @property
+    def amenities(self):
+        """The Amenity instances whose ids are listed in amenity_ids."""
+        amenities = []
+        for amenity_id in self.amenity_ids:
+            amenity = models.storage.get("Amenity", amenity_id)
+            if amenity is not None:
+                amenities.append(amenity)
+        return amenities
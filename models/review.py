@@ -2,9 +2,10 @@
 """
 Review class for the AirBnB clone project.
 """
-from models.base_model import BaseModel
+from models.base_model import BaseModel, compact
 
 
+@compact
 class Review(BaseModel):
     """
     Review class that inherits from BaseModel.
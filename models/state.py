@@ -2,11 +2,19 @@
 """
 State class for the AirBnB clone project.
 """
-from models.base_model import BaseModel
+import models
+from models.base_model import BaseModel, compact
 
 
+@compact
 class State(BaseModel):
     """
     State class that inherits from BaseModel.
     """
     name = ""
+
+    @property
+    def cities(self):
+        """The City instances whose state_id is the id of this State."""
+        related = models.storage.related("City", "state_id", self.id)
+        return list(related.values())
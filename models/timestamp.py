@@ -0,0 +1,41 @@
+#!/usr/bin/python3
+"""
+This module converts the timestamps of the models to and from the ISO 8601
+strings stored in file.json.
+"""
+from datetime import datetime
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%f"
+
+
+def parse_datetime(value):
+    """
+    Parses a timestamp written by format_datetime.
+
+    datetime.fromisoformat is implemented in C and is several times faster
+    than datetime.strptime; strptime is kept as a fallback for the Python
+    versions and strings fromisoformat does not handle.
+
+    Args:
+        value (str): The ISO 8601 timestamp.
+
+    Returns:
+        datetime: The parsed timestamp.
+    """
+    try:
+        return datetime.fromisoformat(value)
+    except (AttributeError, ValueError):
+        return datetime.strptime(value, TIME_FORMAT)
+
+
+def format_datetime(value):
+    """
+    Formats a timestamp the way it is stored in file.json.
+
+    Args:
+        value (datetime): The timestamp.
+
+    Returns:
+        str: The ISO 8601 timestamp.
+    """
+    return value.isoformat()
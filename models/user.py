@@ -2,12 +2,26 @@
 """
 Module for User class
 """
-from models.base_model import BaseModel
+import models
+from models.base_model import BaseModel, compact
 
 
+@compact
 class User(BaseModel):
     """User class that inherits from BaseModel"""
     email = ""
     password = ""
     first_name = ""
     last_name = ""
+
+    @property
+    def places(self):
+        """The Place instances whose user_id is the id of this User."""
+        related = models.storage.related("Place", "user_id", self.id)
+        return list(related.values())
+
+    @property
+    def reviews(self):
+        """The Review instances whose user_id is the id of this User."""
+        related = models.storage.related("Review", "user_id", self.id)
+        return list(related.values())
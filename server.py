@@ -0,0 +1,234 @@
+#!/usr/bin/python3
+"""
+Serves the console over a local TCP or Unix socket, so several operators
+and scripts share one in-memory dataset instead of racing on file.json.
+
+Every connection is a console session: it reads one command per line,
+with the grammar of console.py, and answers with the command output,
+sent as it is printed, followed by the prompt. Commands run on worker
+threads, so the event loop keeps accepting sessions and sending output
+while they run: the commands that change the storage run one at a time,
+while those that only read it, such as show, all or count, run
+concurrently and only wait for the command changing the storage to
+finish. A session
+that runs begin owns the storage until its commit or rollback: the other
+sessions wait before each command, so they never see its uncommitted
+changes, and a session closed inside a batch is rolled back.
+
+Usage: ./console.py --serve HOST:PORT | unix:PATH
+"""
+import asyncio
+import io
+import threading
+from console import CALL, HBNBCommand
+from models import storage
+
+
+class SessionOutput:
+    """
+    Sends what the console of a session prints to its client as soon as
+    it is printed, from the event loop or from a worker thread.
+
+    Attributes:
+        limit (int): The number of bytes a worker thread sends before
+            waiting for the client to receive them.
+    """
+
+    limit = 65536
+
+    def __init__(self, writer):
+        """
+        Initializes the output of the session of writer; must be called
+        on the event loop.
+        """
+        self.__writer = writer
+        self.__loop = asyncio.get_running_loop()
+        self.__thread = threading.get_ident()
+        self.__unsent = 0
+
+    def write(self, text):
+        """
+        Sends text to the client and returns its length.
+        """
+        data = text.encode("utf-8")
+        if threading.get_ident() == self.__thread:
+            self.__writer.write(data)
+            return len(text)
+        self.__loop.call_soon_threadsafe(self.__writer.write, data)
+        self.__unsent += len(data)
+        if self.__unsent >= self.limit:
+            self.__unsent = 0
+            asyncio.run_coroutine_threadsafe(self.__writer.drain(),
+                                             self.__loop).result()
+        return len(text)
+
+    def writelines(self, lines):
+        """
+        Sends every line of lines to the client.
+        """
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        """
+        Does nothing: write() already sent the text.
+        """
+
+
+class ConsoleServer:
+    """
+    Runs the console sessions of the clients of one socket.
+
+    Attributes:
+        sessions (int): The number of connected sessions.
+        reads (frozenset): The commands that only read the storage.
+    """
+
+    reads = frozenset(HBNBCommand.query_methods + ("show", "export", "help"))
+
+    def __init__(self):
+        """
+        Initializes a server with no session.
+        """
+        self.sessions = 0
+        self.__batch = asyncio.Lock()
+        self.__idle = asyncio.Condition()
+        self.__readers = 0
+        self.__owner = None
+        self.__depth = 0
+
+    async def start(self, address):
+        """
+        Starts accepting sessions on address, HOST:PORT or unix:PATH, and
+        returns the asyncio server.
+
+        Raises:
+            ValueError: If address is neither HOST:PORT nor unix:PATH.
+        """
+        if address.startswith("unix:"):
+            return await asyncio.start_unix_server(self.handle,
+                                                   path=address[5:])
+        host, _, port = address.rpartition(":")
+        if not port.isdigit():
+            raise ValueError("Invalid address: {}".format(address))
+        return await asyncio.start_server(self.handle, host or "127.0.0.1",
+                                          int(port))
+
+    async def handle(self, reader, writer):
+        """
+        Runs the console session of a client until it quits or
+        disconnects.
+        """
+        console = HBNBCommand(stdin=io.StringIO(),
+                              stdout=SessionOutput(writer))
+        self.sessions += 1
+        try:
+            writer.write(console.prompt.encode("utf-8"))
+            await writer.drain()
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command = line.decode("utf-8", "replace").strip()
+                stop = await self.execute(console, command)
+                if not stop:
+                    writer.write(console.prompt.encode("utf-8"))
+                await writer.drain()
+                if stop:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions -= 1
+            if self.__owner is console:
+                storage.rollback()
+                await self.__release()
+            writer.close()
+
+    async def execute(self, console, command):
+        """
+        Runs command in the session of console once no other session owns
+        a batch, and returns True when the session should end.
+
+        A command that only reads the storage runs on a worker thread
+        alongside the other reads; any other command waits for them to
+        finish and runs on a worker thread alone.
+        """
+        word = command.split()[0] if command.split() else ""
+        call = CALL.match(command)
+        name = call.group(2) if call else word
+        if name in self.reads and self.__owner is not console:
+            return await self.__read(console, command)
+        if self.__owner is not console:
+            await self.__batch.acquire()
+            self.__owner = console
+            async with self.__idle:
+                await self.__idle.wait_for(lambda: not self.__readers)
+        stop = await asyncio.to_thread(self.__run, console, command)
+        if word == "begin":
+            self.__depth += 1
+        elif word == "commit":
+            self.__depth = max(self.__depth - 1, 0)
+        elif word == "rollback":
+            self.__depth = 0
+        if not self.__depth:
+            await self.__release()
+        return stop
+
+    async def __read(self, console, command):
+        """
+        Runs command, which only reads the storage, on a worker thread
+        once no other session changes the storage, and returns True when
+        the session should end.
+        """
+        async with self.__idle:
+            await self.__idle.wait_for(lambda: not self.__batch.locked())
+            self.__readers += 1
+        try:
+            return await asyncio.to_thread(self.__run, console, command)
+        finally:
+            async with self.__idle:
+                self.__readers -= 1
+                self.__idle.notify_all()
+
+    @staticmethod
+    def __run(console, command):
+        """
+        Runs command in console, printing the error it raises, and returns
+        True when the session should end.
+        """
+        try:
+            return console.onecmd(command)
+        except Exception as error:
+            print("** error: {} **".format(error), file=console.stdout)
+            return False
+
+    async def __release(self):
+        """
+        Lets the next waiting session run a command.
+        """
+        self.__owner = None
+        self.__depth = 0
+        self.__batch.release()
+        async with self.__idle:
+            self.__idle.notify_all()
+
+
+async def serve(address):
+    """
+    Serves console sessions on address until cancelled.
+    """
+    server = await ConsoleServer().start(address)
+    async with server:
+        print("Serving the console on {}".format(address))
+        await server.serve_forever()
+
+
+def main(address):
+    """
+    Serves console sessions on address until interrupted.
+    """
+    try:
+        asyncio.run(serve(address))
+    except KeyboardInterrupt:
+        pass
@@ -1,12 +1,23 @@
 #!/usr/bin/python3
 """a inittest for the consol module
 """
+import json
+import os
+import random
+import string
+import subprocess
+import sys
+import tempfile
 import unittest
+from contextlib import ExitStack
 from console import HBNBCommand
+from console import parse_arguments
+from console import parse_command
 from models import FileStorage
 from models import storage
 from io import StringIO
 from models.base_model import BaseModel
+from models.place import Place
 from unittest.mock import patch
 
 
@@ -295,6 +306,396 @@ class TestHBNBCommand(unittest.TestCase):
                 for formatted_obj in formatted_objects:
                     self.assertIn(formatted_obj, output)
 
+    def test_do_all_pages(self):
+        """prints the page of instances given by offset and limit"""
+        for i in range(3):
+            storage.new(Place())
+        lines = [f"[{str(obj)} {obj.to_dict()}]"
+                 for obj in storage.all("Place").values()]
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd("all Place offset=1 limit=2")
+            self.assertEqual(lines[1:3], f.getvalue().splitlines())
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd("Place.all(limit=1)")
+            self.assertEqual(lines[:1], f.getvalue().splitlines())
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd("all limit=0")
+            self.assertEqual("", f.getvalue())
+
+    def test_do_all_cursor(self):
+        """prints the instances following the cursor"""
+        for i in range(3):
+            storage.new(Place())
+        keys = list(storage.all("Place"))
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd(f"all Place cursor={keys[-3][6:]} limit=1")
+            HBNBCommand().onecmd(f"all cursor={keys[-2]}")
+            output = f.getvalue().splitlines()
+        self.assertIn(keys[-2][6:], output[0])
+        self.assertIn(keys[-1][6:], output[1])
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd("all Place cursor=missing")
+            self.assertEqual("** no instance found **",
+                             f.getvalue().strip())
+
+    def test_do_all_jsonl(self):
+        """prints the dictionary of each instance as JSON"""
+        storage.new(Place(name="Loft"))
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd("all Place --format=jsonl")
+            lines = f.getvalue().splitlines()
+        self.assertEqual([obj.to_dict() for obj
+                          in storage.all("Place").values()],
+                         [json.loads(line) for line in lines])
+
+    def test_do_all_invalid_query(self):
+        """prints an error message for malformed options"""
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd("all Place limit=many")
+            HBNBCommand().onecmd("all Place offset=-1")
+            HBNBCommand().onecmd("all Place --format=xml")
+            HBNBCommand().onecmd("all Place sort=id")
+            self.assertEqual(["** invalid query **"] * 4,
+                             f.getvalue().splitlines())
+
+    def test_do_count(self):
+        """prints the number of instances of the class"""
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd("User.count()")
+            self.assertEqual(str(storage.count("User")), f.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd('User.count("x")')
+            HBNBCommand().onecmd("User.count(limit=1)")
+            self.assertEqual(["** invalid query **"] * 2,
+                             f.getvalue().splitlines())
+
+    def test_do_count_invalid_class_name(self):
+        """prints an error message for an unknown class"""
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd("count InvalidClass")
+            self.assertEqual("** class doesn't exist **",
+                             f.getvalue().strip())
+
+    def test_where(self):
+        """prints the instances matching the conditions, in order"""
+        cheap = Place(price_by_night=40, max_guest=4)
+        pricey = Place(price_by_night=400, max_guest=4)
+        cheaper = Place(price_by_night=30, max_guest=2)
+        for place in (cheap, pricey, cheaper):
+            storage.new(place)
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd('Place.where(price_by_night__lt=100, '
+                                 'max_guest__gte=4)')
+            output = f.getvalue()
+        self.assertIn(cheap.id, output)
+        self.assertNotIn(pricey.id, output)
+        self.assertNotIn(cheaper.id, output)
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd('where Place price_by_night__lte=40, '
+                                 'order_by="-price_by_night", limit=2')
+            lines = f.getvalue().splitlines()
+        self.assertIn(cheap.id, lines[0])
+        self.assertIn(cheaper.id, lines[1])
+
+    def test_where_invalid_query(self):
+        """prints an error message for a malformed condition"""
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd("Place.where(price_by_night__about=1)")
+            HBNBCommand().onecmd("where Place price_by_night<1")
+            self.assertEqual(["** invalid query **"] * 2,
+                             f.getvalue().splitlines())
+
+    def test_nearby_and_within(self):
+        """prints the instances near a point or inside a box"""
+        sf = Place(latitude=37.77, longitude=-122.42)
+        la = Place(latitude=34.05, longitude=-118.24)
+        storage.new(sf)
+        storage.new(la)
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd("Place.nearby(37.78, -122.41, 5)")
+            HBNBCommand().onecmd("within Place 33 -119 35 -118")
+            lines = f.getvalue().splitlines()
+        self.assertIn(sf.id, lines[0])
+        self.assertIn(la.id, lines[-1])
+        self.assertNotIn(la.id, lines[0])
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd("nearby Place 95 0 5")
+            HBNBCommand().onecmd("within Place 33 -119")
+            self.assertEqual(["** invalid query **"] * 2,
+                             f.getvalue().splitlines())
+
+    def test_search(self):
+        """prints the instances whose text matches, best first"""
+        loft = Place(name="Sunlit loft", description="A sunlit sunlit loft")
+        attic = Place(name="Attic", description="Sunlit attic")
+        storage.new(loft)
+        storage.new(attic)
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd("search Place sunlit")
+            HBNBCommand().onecmd('Place.search("attic")')
+            lines = f.getvalue().splitlines()
+        self.assertIn(loft.id, lines[0])
+        self.assertIn(attic.id, lines[1])
+        self.assertIn(attic.id, lines[2])
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd("search Place")
+            self.assertEqual("** search text missing **",
+                             f.getvalue().strip())
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd('Place.search("attic", limit=1)')
+            HBNBCommand().onecmd("Place.search(1)")
+            self.assertEqual(["** invalid query **"] * 2,
+                             f.getvalue().splitlines())
+
+    def test_aggregate(self):
+        """prints one line per group with its aggregates"""
+        city_id = BaseModel().id
+        for price in (100, 50):
+            storage.new(Place(city_id=city_id, price_by_night=price))
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd('Place.aggregate("city_id", '
+                                 'avg="price_by_night")')
+            HBNBCommand().onecmd("aggregate Place city_id, max=price_by_night")
+            output = f.getvalue()
+        self.assertIn(f"{{'city_id': '{city_id}', 'count': 2, "
+                      "'avg_price_by_night': 75.0}", output)
+        self.assertIn(f"{{'city_id': '{city_id}', 'count': 2, "
+                      "'max_price_by_night': 100}", output)
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd('Place.aggregate("city_id", median=1)')
+            HBNBCommand().onecmd("aggregate Place")
+            self.assertEqual(["** invalid query **"] * 2,
+                             f.getvalue().splitlines())
+
+    def test_dot_calls_pass_arguments(self):
+        """runs dot calls on their parsed arguments, not on text handed
+        to the do_ methods"""
+        place = Place(name="Quokka, nook", max_guest=3,
+                      latitude=-45.03, longitude=168.66)
+        storage.new(place)
+        with ExitStack() as stack:
+            for method in HBNBCommand.query_methods:
+                stack.enter_context(patch.object(
+                    HBNBCommand, "do_" + method,
+                    side_effect=AssertionError(method)))
+            with patch("sys.stdout", new=StringIO()) as f:
+                for command in ("Place.count()",
+                                f'Place.all(cursor="{place.id}", limit=0)',
+                                "Place.where(max_guest=3, limit=1000000)",
+                                "Place.nearby(-45.03, 168.66, 0.1)",
+                                "Place.within(-45.1, 168.6, -45, 168.7)",
+                                'Place.search("quokka, nook")',
+                                'Place.aggregate("max_guest")'):
+                    HBNBCommand().onecmd(command)
+                output = f.getvalue()
+        self.assertNotIn("** ", output)
+        self.assertEqual(4, len([line for line in output.splitlines()
+                                 if place.id in line]))
+
+    def test_begin_commit(self):
+        """saves the changes made between begin and commit once"""
+        with patch("sys.stdout", new=StringIO()) as f:
+            with patch.object(FileStorage,
+                              "_FileStorage__write_snapshot") as write:
+                HBNBCommand().onecmd("begin")
+                HBNBCommand().onecmd("create User")
+                HBNBCommand().onecmd("create State")
+                write.assert_not_called()
+                HBNBCommand().onecmd("commit")
+            write.assert_called_once()
+
+    def test_rollback(self):
+        """discards the objects created after begin"""
+        count = storage.count("User")
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd("begin")
+            HBNBCommand().onecmd("create User")
+            HBNBCommand().onecmd("rollback")
+        self.assertEqual(count, storage.count("User"))
+
+    def test_import_export(self):
+        """writes the instances of a class to a file and reads them back"""
+        place = Place(name="Loft", max_guest=3, amenity_ids=["a", "b"])
+        storage.new(place)
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ("places.jsonl", "places.csv"):
+                path = os.path.join(directory, name)
+                with patch("sys.stdout", new=StringIO()) as f:
+                    HBNBCommand().onecmd(f"export Place {path}")
+                    self.assertEqual(str(storage.count("Place")),
+                                     f.getvalue().strip())
+                storage.delete(place)
+                with patch("sys.stdout", new=StringIO()) as f:
+                    HBNBCommand().onecmd(f"import Place {path}")
+                    self.assertEqual(str(storage.count("Place")),
+                                     f.getvalue().strip())
+                copy = storage.get("Place", place.id)
+                self.assertIsNot(place, copy)
+                self.assertEqual(place.to_dict(), copy.to_dict())
+
+    def test_import_errors(self):
+        """prints an error for a missing or invalid file"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "places.jsonl")
+            with open(path, "w") as file:
+                file.write('{"name": "Loft"}\n{"max_guest": "many"}\n')
+            with patch("sys.stdout", new=StringIO()) as f:
+                HBNBCommand().onecmd("import")
+                HBNBCommand().onecmd("import MyModel places.jsonl")
+                HBNBCommand().onecmd("export Place")
+                HBNBCommand().onecmd(f"import Place {path}.csv")
+                HBNBCommand().onecmd(f"import Place {path}")
+                self.assertEqual(["** class name missing **",
+                                  "** class doesn't exist **",
+                                  "** file name missing **",
+                                  "** file doesn't exist **",
+                                  "** invalid record, line 2: Invalid int "
+                                  "for max_guest: 'many' **"],
+                                 f.getvalue().splitlines())
+
+    def test_run_script(self):
+        """runs a script saving once and reports errors by line"""
+        script = ["# two places", "create Place", "",
+                  "create Place", "show Place nope", "Place.count()",
+                  "quit", "create Place"]
+        count = storage.count("Place")
+        output = StringIO()
+        errors = StringIO()
+        with patch.object(FileStorage,
+                          "_FileStorage__write_snapshot") as write:
+            self.assertEqual(1, HBNBCommand(stdout=output).run_script(
+                script, "places.hbnb", errors))
+            write.assert_called_once()
+        self.assertEqual(count + 2, storage.count("Place"))
+        self.assertEqual(str(count + 2), output.getvalue().split()[-1])
+        lines = errors.getvalue().splitlines()
+        self.assertEqual("places.hbnb:5: ** no instance found **", lines[0])
+        self.assertRegex(lines[1], r"^places.hbnb: 5 commands in .* "
+                                   r"commands/s, 1 errors$")
+
+    def test_run_script_batches(self):
+        """keeps the begin, commit and rollback of a script apart from
+        its own batch"""
+        places = storage.count("Place")
+        users = storage.count("User")
+        output = StringIO()
+        self.assertEqual(0, HBNBCommand(stdout=output).run_script(
+            ["create Place", "begin", "create User", "rollback",
+             "count Place", "begin", "begin", "create User", "commit",
+             "commit", "commit", "create Place", "count User"],
+            stderr=StringIO()))
+        lines = output.getvalue().splitlines()
+        self.assertEqual((str(places + 1), str(users + 1)),
+                         (lines[2], lines[5]))
+        self.assertEqual(places + 2, storage.count("Place"))
+
+    def test_run_script_begin_left_open(self):
+        """rolls back and reports a begin without commit"""
+        places = storage.count("Place")
+        users = storage.count("User")
+        errors = StringIO()
+        with patch.object(FileStorage,
+                          "_FileStorage__write_snapshot") as write:
+            self.assertEqual(1, HBNBCommand(stdout=StringIO()).run_script(
+                ["create Place", "begin", "create User"], "s.hbnb", errors))
+            write.assert_called_once()
+        self.assertEqual("s.hbnb:2: ** begin without commit, its changes "
+                         "are discarded **", errors.getvalue().splitlines()[0])
+        self.assertEqual((places + 1, users),
+                         (storage.count("Place"), storage.count("User")))
+
+    def test_run_script_all(self):
+        """lists the instances with all in a script"""
+        place = Place(name="Loft")
+        storage.new(place)
+        output = StringIO()
+        errors = StringIO()
+        self.assertEqual(0, HBNBCommand(stdout=output).run_script(
+            ["all Place", "Place.all(limit=1000000)"], stderr=errors))
+        lines = output.getvalue().splitlines()
+        self.assertEqual(2 * storage.count("Place"), len(lines))
+        self.assertEqual(2, sum(place.id in line for line in lines))
+        self.assertNotIn("** ", errors.getvalue())
+
+    def test_run_script_unknown_syntax(self):
+        """runs nothing when a line of the script holds no command"""
+        count = storage.count("Place")
+        errors = StringIO()
+        self.assertEqual(2, HBNBCommand(stdout=StringIO()).run_script(
+            ["create Place", "Place", "fly Place"], stderr=errors))
+        self.assertEqual(["<stdin>:2: *** Unknown syntax: Place",
+                          "<stdin>:3: *** Unknown syntax: fly Place"],
+                         errors.getvalue().splitlines())
+        self.assertEqual(count, storage.count("Place"))
+
+    def test_piped_script(self):
+        """runs the commands piped to the console as a script"""
+        console = os.path.join(os.path.dirname(os.path.dirname(
+            os.path.abspath(__file__))), "console.py")
+        with tempfile.TemporaryDirectory() as directory:
+            result = subprocess.run(
+                [sys.executable, console], cwd=directory,
+                input="create User\nUser.count()\n", capture_output=True,
+                text=True, timeout=60)
+            with open(os.path.join(directory, "file.json")) as file:
+                self.assertIn(result.stdout.split()[0], file.read())
+        self.assertEqual(0, result.returncode)
+        self.assertEqual("1", result.stdout.split()[1])
+        self.assertIn("2 commands in", result.stderr)
+
+    def test_dot_update(self):
+        """updates several attributes, quoted values kept whole, saving
+        once"""
+        place = Place(max_guest=1)
+        storage.new(place)
+        with patch("sys.stdout", new=StringIO()) as f:
+            with patch.object(FileStorage,
+                              "_FileStorage__write_snapshot") as write:
+                HBNBCommand().onecmd(f'Place.update("{place.id}", "name", '
+                                     '"Mr. \\"Big\\" loft", "max_guest", '
+                                     '"4")')
+                write.assert_called_once()
+            HBNBCommand().onecmd(f'Place.update("{place.id}", '
+                                 '{"latitude": 37.5, "amenity_ids": '
+                                 '["a.b", "c"], "id": "other"})')
+            self.assertEqual("", f.getvalue())
+        self.assertEqual('Mr. "Big" loft', place.name)
+        self.assertEqual(4, place.max_guest)
+        self.assertEqual(37.5, place.latitude)
+        self.assertEqual(["a.b", "c"], place.amenity_ids)
+        self.assertIs(place, storage.get("Place", place.id))
+
+    def test_dot_errors(self):
+        """prints the error of an invalid dot command"""
+        place = Place()
+        storage.new(place)
+        with patch("sys.stdout", new=StringIO()) as f:
+            HBNBCommand().onecmd('MyModel.show("1")')
+            HBNBCommand().onecmd("Place.show()")
+            HBNBCommand().onecmd('Place.destroy("nope")')
+            HBNBCommand().onecmd(f'Place.update("{place.id}")')
+            HBNBCommand().onecmd(f'Place.update("{place.id}", "name")')
+            HBNBCommand().onecmd(f'Place.update("{place.id}", {{1: 2}})')
+            HBNBCommand().onecmd(f"update Place {place.id} max_guest x")
+            HBNBCommand().onecmd(f'Place.update("{place.id}", "extra", '
+                                 '"12")')
+            HBNBCommand().onecmd(f"update Place {place.id} extra abc")
+            HBNBCommand().onecmd('Place.show("1"')
+            HBNBCommand().onecmd('Place.fly("1")')
+            self.assertEqual(["** class doesn't exist **",
+                              "** instance id missing **",
+                              "** no instance found **",
+                              "** attribute name missing **",
+                              "** value missing **",
+                              "** attribute name missing **",
+                              "** invalid value, Invalid int for "
+                              "max_guest: 'x' **",
+                              "** invalid value, invalid literal for "
+                              "int() with base 10: 'abc' **",
+                              '*** Unknown syntax: Place.show("1"',
+                              '*** Unknown syntax: Place.fly("1")'],
+                             f.getvalue().splitlines())
+
     def test_calls_do_all(self):
         """calls do_all method if 'class.all()' is in the command
         """
@@ -303,5 +704,74 @@ class TestHBNBCommand(unittest.TestCase):
             self.assertIn("[BaseModel", f.getvalue().strip())
 
 
+class TestParseCommand(unittest.TestCase):
+    """Unittests for the parser of <class name>.<method>(<arguments>)."""
+
+    def random_value(self, depth=0):
+        kind = random.randrange(9 if depth < 3 else 6)
+        if kind == 0:
+            return "".join(random.choice(string.printable + "é\u2603")
+                           for i in range(random.randrange(8)))
+        if kind == 1:
+            return random.randint(-10 ** 12, 10 ** 12)
+        if kind == 2:
+            return random.uniform(-1e6, 1e6) * 10 ** random.randint(-20, 20)
+        if kind in (3, 4, 5):
+            return random.choice((True, False, None, "name", "x.y"))
+        items = [self.random_value(depth + 1)
+                 for i in range(random.randrange(4))]
+        if kind == 6:
+            return items
+        if kind == 7:
+            return tuple(items)
+        return {str(item): item for item in items}
+
+    def test_command(self):
+        command = parse_command('Place.update("1.2", {"a": [1, -2.5e3]}, '
+                                "x='y', z=None)")
+        self.assertEqual("Place", command.class_name)
+        self.assertEqual("update", command.method)
+        self.assertEqual(["1.2", {"a": [1, -2500.0]}], command.args)
+        self.assertEqual({"x": "y", "z": None}, command.kwargs)
+        self.assertEqual('"1.2", {"a": [1, -2.5e3]}, x=\'y\', z=None',
+                         command.text)
+
+    def test_arguments(self):
+        self.assertEqual((["city_id"], {"avg": "price_by_night"}),
+                         parse_arguments('city_id, avg="price_by_night"'))
+        self.assertEqual(([(1,), ()], {}), parse_arguments("(1,), (),"))
+        for text in ("a=1, 2", "a=1, a=2", "1 2", ",", "[1,", "{[]: 1}",
+                     "{1}", "1.2.3", "price<1", "'a", "[" * 5000):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    parse_arguments(text)
+
+    def test_fuzz_round_trip(self):
+        """parses back the repr of random values"""
+        random.seed(24)
+        for i in range(500):
+            args = [self.random_value() for i in range(random.randrange(4))]
+            kwargs = {f"k{i}": self.random_value()
+                      for i in range(random.randrange(3))}
+            text = ", ".join([repr(arg) for arg in args] +
+                             [f"{name}={value!r}"
+                              for name, value in kwargs.items()])
+            command = parse_command(f"User.where({text})")
+            self.assertEqual(args, command.args)
+            self.assertEqual(kwargs, command.kwargs)
+
+    def test_fuzz_garbage(self):
+        """raises nothing but ValueError on random text"""
+        random.seed(24)
+        alphabet = "User.show(\"'\\)[]{},:=-+.e0 1aé\n"
+        for i in range(3000):
+            line = "".join(random.choice(alphabet)
+                           for i in range(random.randrange(30)))
+            try:
+                parse_command(line)
+            except ValueError:
+                pass
+
+
 if __name__ == "__main__":
     unittest.main()
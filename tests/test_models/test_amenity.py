@@ -4,6 +4,7 @@ Unittest for Amenity class.
 """
 import unittest
 from models.amenity import Amenity
+from models.place import Place
 
 
 class TestAmenity(unittest.TestCase):
@@ -17,6 +18,23 @@ class TestAmenity(unittest.TestCase):
         amenity = Amenity()
         self.assertEqual(amenity.name, "")
 
+    def test_places(self):
+        amenity = Amenity()
+        place = Place()
+        place.amenity_ids = [amenity.id]
+        self.assertEqual([place], amenity.places)
+        place.amenity_ids = []
+        self.assertEqual([], amenity.places)
+
+    def test_places_after_append(self):
+        amenity = Amenity()
+        place = Place()
+        place.amenity_ids = []
+        self.assertEqual([], amenity.places)
+        place.amenity_ids.append(amenity.id)
+        place.save()
+        self.assertEqual([place], amenity.places)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -5,13 +5,15 @@ Unittest classes:
     TestBaseModel_instantiation
     TestBaseModel_save
     TestBaseModel_to_dict
+    TestBaseModel_compact
 """
 import os
 import models
 import unittest
 from datetime import datetime
 from time import sleep
-from models.base_model import BaseModel
+from unittest.mock import patch
+from models.base_model import BaseModel, compact
 
 
 class TestBaseModel_instantiation(unittest.TestCase):
@@ -61,6 +63,14 @@ class TestBaseModel_instantiation(unittest.TestCase):
         self.assertIn("'created_at': " + dt_repr, bmstr)
         self.assertIn("'updated_at': " + dt_repr, bmstr)
 
+    def test_setattr_marks_dirty(self):
+        bm = BaseModel()
+        bm._dirty = False
+        bm.name = "Holberton"
+        self.assertTrue(bm._dirty)
+        self.assertNotIn("_dirty", bm.__dict__)
+        self.assertNotIn("_dirty", bm.to_dict())
+
     def test_args_unused(self):
         bm = BaseModel(None)
         self.assertNotIn(None, bm.__dict__.values())
@@ -73,6 +83,11 @@ class TestBaseModel_instantiation(unittest.TestCase):
         self.assertEqual(bm.created_at, dt)
         self.assertEqual(bm.updated_at, dt)
 
+    def test_instantiation_with_kwargs_without_timestamps(self):
+        bm = BaseModel(id="345")
+        self.assertEqual(datetime, type(bm.created_at))
+        self.assertEqual(bm.created_at, bm.updated_at)
+
     def test_instantiation_with_None_kwargs(self):
         with self.assertRaises(TypeError):
             BaseModel(id=None, created_at=None, updated_at=None)
@@ -137,6 +152,12 @@ class TestBaseModel_save(unittest.TestCase):
         with open("file.json", "r") as f:
             self.assertIn(bmid, f.read())
 
+    def test_save_after_delete(self):
+        bm = BaseModel()
+        models.storage.delete(bm)
+        bm.save()
+        self.assertNotIn("BaseModel." + bm.id, models.storage.all())
+
 
 class TestBaseModel_to_dict(unittest.TestCase):
     """Unittests for testing to_dict method of the BaseModel class."""
@@ -188,5 +209,70 @@ class TestBaseModel_to_dict(unittest.TestCase):
             bm.to_dict(None)
 
 
+class TestBaseModel_compact(unittest.TestCase):
+    """Unittests for testing the compact decorator."""
+
+    def make_class(self, enabled):
+        with patch("models.base_model.COMPACT", enabled):
+            @compact
+            class Listing(BaseModel):
+                name = ""
+                max_guest = 0
+        return Listing
+
+    def test_fields_recorded(self):
+        Listing = self.make_class(False)
+        self.assertEqual({"name": "", "max_guest": 0}, Listing._fields)
+        self.assertEqual((), Listing._slots)
+
+    def test_compact_uses_slots(self):
+        Listing = self.make_class(True)
+        listing = Listing(id="1")
+        listing.name = "Loft"
+        self.assertEqual(("name", "max_guest", "_order"), Listing.__slots__)
+        self.assertNotIn("name", listing.__dict__)
+        self.assertEqual("Loft", listing.name)
+
+    def test_compact_default(self):
+        listing = self.make_class(True)(id="1")
+        self.assertEqual(0, listing.max_guest)
+        with self.assertRaises(AttributeError):
+            listing.missing
+
+    def test_compact_extra_attribute(self):
+        listing = self.make_class(True)(id="1")
+        listing.pets = "yes"
+        self.assertEqual("yes", listing.__dict__["pets"])
+
+    def test_compact_output_identical(self):
+        dt = datetime.today()
+        values = {"id": "123", "created_at": dt.isoformat(),
+                  "updated_at": dt.isoformat(), "name": "Loft",
+                  "max_guest": 4, "pets": "yes"}
+        regular = self.make_class(False)(**values)
+        listing = self.make_class(True)(**values)
+        self.assertEqual(str(regular), str(listing))
+        self.assertEqual(regular.to_dict(), listing.to_dict())
+        self.assertEqual(list(regular.to_dict()), list(listing.to_dict()))
+
+    def test_compact_output_in_set_order(self):
+        dt = datetime.today()
+        regular = self.make_class(False)()
+        listing = self.make_class(True)()
+        for instance in (regular, listing):
+            instance.id = "123"
+            instance.created_at = instance.updated_at = dt
+            instance.pets = "yes"
+            instance.max_guest = 4
+            instance.name = "Loft"
+        self.assertEqual(str(regular), str(listing))
+        self.assertEqual(list(regular.to_dict()), list(listing.to_dict()))
+        values = {"max_guest": 4, "id": "1", "name": "Loft",
+                  "created_at": dt.isoformat(), "updated_at": dt.isoformat()}
+        regular = self.make_class(False)(**values)
+        listing = self.make_class(True)(**values)
+        self.assertEqual(str(regular), str(listing))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -4,6 +4,7 @@ Unittest for City class.
 """
 import unittest
 from models.city import City
+from models.place import Place
 
 
 class TestCity(unittest.TestCase):
@@ -18,6 +19,12 @@ class TestCity(unittest.TestCase):
         self.assertEqual(city.state_id, "")
         self.assertEqual(city.name, "")
 
+    def test_places(self):
+        city = City()
+        place = Place()
+        place.city_id = city.id
+        self.assertEqual([place], city.places)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/aggregate.py.
+
+Unittest classes:
+    TestAggregate
+"""
+import unittest
+from unittest.mock import patch
+from models.engine import aggregate
+from models.place import Place
+from models.review import Review
+
+
+class TestAggregate(unittest.TestCase):
+    """Unittests for testing aggregate() with and without NumPy."""
+
+    def setUp(self):
+        self.places = [
+            Place(city_id="sf", price_by_night=100, max_guest=2,
+                  amenity_ids=["wifi", "tv"]),
+            Place(city_id="sf", price_by_night=50, max_guest=4,
+                  amenity_ids=["wifi"]),
+            Place(city_id="la", price_by_night=80.5, max_guest=6,
+                  amenity_ids=[]),
+            Place(city_id="la", price_by_night="free", max_guest=1,
+                  amenity_ids=["wifi", "pool"]),
+            Place(city_id="ny", price_by_night=None)
+        ]
+
+    def check(self):
+        rows = aggregate.aggregate(self.places, "city_id",
+                                   avg="price_by_night",
+                                   sum=("price_by_night", "max_guest"),
+                                   min="max_guest", max="price_by_night")
+        self.assertEqual(["la", "sf", "ny"], [row["city_id"] for row in rows])
+        self.assertEqual({"city_id": "sf", "count": 2,
+                          "avg_price_by_night": 75, "sum_price_by_night": 150,
+                          "max_price_by_night": 100, "sum_max_guest": 6,
+                          "min_max_guest": 2}, rows[1])
+        self.assertEqual(80.5, rows[0]["avg_price_by_night"])
+        self.assertEqual(7, rows[0]["sum_max_guest"])
+        self.assertIsNone(rows[2]["avg_price_by_night"])
+        self.assertIsNone(rows[2]["sum_price_by_night"])
+        self.assertEqual(0, rows[2]["min_max_guest"])
+
+    def test_aggregate(self):
+        with patch.object(aggregate, "numpy", None):
+            self.check()
+
+    @unittest.skipIf(aggregate.numpy is None, "NumPy is not installed")
+    def test_aggregate_numpy(self):
+        self.check()
+
+    @unittest.skipIf(aggregate.numpy is None, "NumPy is not installed")
+    def test_numpy_matches_python(self):
+        places = [
+            Place(city_id="a", price_by_night=3, max_guest=2 ** 60 + 1),
+            Place(city_id="a", price_by_night=3.0, max_guest=2 ** 60 + 2),
+            Place(city_id="a", price_by_night=2.5, max_guest=2 ** 60 + 3),
+            Place(city_id="b", price_by_night=7, max_guest=1)
+        ]
+        large = [Place(city_id="c", max_guest=2 ** 62),
+                 Place(city_id="c", max_guest=2 ** 62 + 1)]
+        for objects, attributes in ((places, ("price_by_night",
+                                              "max_guest")),
+                                    (large, ("max_guest",))):
+            options = {function: attributes
+                       for function in aggregate.FUNCTIONS}
+            with patch.object(aggregate, "numpy", None):
+                expected = aggregate.aggregate(objects, "city_id", **options)
+            rows = aggregate.aggregate(objects, "city_id", **options)
+            self.assertEqual(repr(expected), repr(rows))
+        self.assertEqual(2 ** 63 + 1, rows[0]["sum_max_guest"])
+
+    def test_count_by_list_attribute(self):
+        rows = aggregate.aggregate(self.places, "amenity_ids", limit=2)
+        self.assertEqual([{"amenity_ids": "wifi", "count": 3},
+                          {"amenity_ids": "pool", "count": 1}], rows)
+
+    def test_count_only(self):
+        reviews = [Review(place_id="1"), Review(place_id="2"),
+                   Review(place_id="1")]
+        self.assertEqual([{"place_id": "1", "count": 2},
+                          {"place_id": "2", "count": 1}],
+                         aggregate.aggregate(reviews, "place_id"))
+        self.assertEqual([], aggregate.aggregate([], "place_id"))
+
+    def test_unknown_aggregation(self):
+        with self.assertRaises(ValueError):
+            aggregate.aggregate(self.places, "city_id", median="max_guest")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/binary_format.py.
+
+Unittest classes:
+    TestBinaryFormat
+    TestBinaryFormat_converters
+"""
+import json
+import os
+import unittest
+from models.engine.binary_format import (dumps, loads, json_to_binary,
+                                         binary_to_json)
+
+
+class TestBinaryFormat(unittest.TestCase):
+    """Unittests for testing dumps() and loads()."""
+
+    records = {
+        "Place.1": {"id": "1", "created_at": "2024-05-22T15:06:11.801865",
+                    "updated_at": "2024-05-22T15:06:11", "__class__": "Place",
+                    "price_by_night": 100, "latitude": 37.7,
+                    "amenity_ids": ["a", "b"], "name": "Loft"},
+        "Place.2": {"id": "2", "created_at": "2024-05-22T15:06:12.000001",
+                    "updated_at": "not a date", "__class__": "Place",
+                    "price_by_night": 2 ** 70, "pets": True},
+        "User.1": {"id": "1", "__class__": "User", "first_name": "Zoë"}
+    }
+
+    def test_round_trip(self):
+        self.assertEqual(self.records,
+                         dict(loads(dumps(self.records.items()))))
+
+    def test_empty(self):
+        self.assertEqual([], list(loads(dumps([]))))
+
+    def test_record_without_attributes(self):
+        self.assertEqual({"State.1": {}},
+                         dict(loads(dumps([("State.1", {})]))))
+
+    def test_repeated_strings_stored_once(self):
+        records = [("City.{}".format(i), {"state_id": "a" * 100})
+                   for i in range(10)]
+        self.assertLess(len(dumps(records)), 10 * 100)
+
+    def test_smaller_than_json(self):
+        records = {"Place.{}".format(i): dict(self.records["Place.1"],
+                                              id=str(i))
+                   for i in range(100)}
+        self.assertLess(len(dumps(records.items())),
+                        len(json.dumps(records)))
+
+    def test_not_a_snapshot(self):
+        with self.assertRaises(ValueError):
+            list(loads(b"{}"))
+
+
+class TestBinaryFormat_converters(unittest.TestCase):
+    """Unittests for testing the JSON converters."""
+
+    def tearDown(self):
+        for path in ("test_in.json", "test.hbnb", "test_out.json"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+
+    def test_json_round_trip(self):
+        records = TestBinaryFormat.records
+        with open("test_in.json", "w") as f:
+            json.dump(records, f)
+        json_to_binary("test_in.json", "test.hbnb")
+        binary_to_json("test.hbnb", "test_out.json")
+        with open("test_out.json", "r") as f:
+            self.assertEqual(records, json.load(f))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/bulk.py.
+
+Unittest classes:
+    TestCoerce
+    TestReadWrite
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from models.engine import bulk
+from models.place import Place
+from models.user import User
+
+
+class TestCoerce(unittest.TestCase):
+    """Unittests for testing the checks and conversions of coerce()."""
+
+    def test_converts_to_declared_types(self):
+        record = {"__class__": "Place", "id": "1", "max_guest": "4",
+                  "latitude": "37.5", "price_by_night": 80.0,
+                  "amenity_ids": '["wifi"]', "name": "Loft",
+                  "created_at": "2017-09-28T21:05:54.119427"}
+        self.assertEqual({"id": "1", "max_guest": 4, "latitude": 37.5,
+                          "price_by_night": 80, "amenity_ids": ["wifi"],
+                          "name": "Loft",
+                          "created_at": "2017-09-28T21:05:54.119427"},
+                         bulk.coerce(Place, record, True))
+
+    def test_skips_empty_values(self):
+        self.assertEqual({}, bulk.coerce(Place, {"max_guest": None}))
+        self.assertEqual({}, bulk.coerce(Place, {"max_guest": ""}, True))
+        self.assertEqual({"name": ""}, bulk.coerce(Place, {"name": ""}))
+
+    def test_invalid(self):
+        for record in ({"__class__": "User"}, {"color": "red"},
+                       {"max_guest": "many"}, {"max_guest": 2.5},
+                       {"max_guest": True}, {"name": 3},
+                       {"amenity_ids": "wifi"}, {"created_at": "today"},
+                       {"id": 1}):
+            with self.subTest(record=record):
+                with self.assertRaises(ValueError):
+                    bulk.coerce(Place, record)
+
+
+class TestReadWrite(unittest.TestCase):
+    """Unittests for testing read() and write() with JSON Lines and CSV."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.places = [Place(name="Loft {}".format(i), max_guest=i,
+                             latitude=i / 4, amenity_ids=["wifi"] * i)
+                       for i in range(5)]
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_round_trip(self):
+        for name in ("places.jsonl", "places.csv"):
+            with self.subTest(name=name):
+                path = self.path(name)
+                self.assertEqual(5, bulk.write(path, Place, self.places))
+                self.assertFalse(os.path.exists(path + ".tmp"))
+                self.assertEqual([place.to_dict() for place in self.places],
+                                 [Place(**attributes).to_dict()
+                                  for attributes in bulk.read(path, Place)])
+
+    def test_csv_columns(self):
+        path = self.path("users.csv")
+        bulk.write(path, User, [User(email="a@b.c")])
+        with open(path) as file:
+            header, row = file.read().splitlines()
+        self.assertEqual("id,created_at,updated_at,email,password,"
+                         "first_name,last_name", header)
+        self.assertTrue(row.endswith(",a@b.c,,,"))
+
+    def test_invalid_line(self):
+        path = self.path("places.jsonl")
+        with open(path, "w") as file:
+            file.write('{"name": "Loft"}\n\n[1]\n')
+        with self.assertRaisesRegex(ValueError, "line 3: Not a JSON object"):
+            bulk.read(path, Place)
+        path = self.path("places.csv")
+        with open(path, "w") as file:
+            file.write('name,max_guest\nLoft,2\n"Attic\nroom",x\n')
+        with self.assertRaisesRegex(ValueError, "line 4: Invalid int"):
+            bulk.read(path, Place)
+        with open(path, "w") as file:
+            file.write('name,max_guest\nLoft\n')
+        with self.assertRaisesRegex(ValueError, "line 2: Expected 2 cells"):
+            bulk.read(path, Place)
+
+    @patch.object(bulk, "CHUNK_LINES", 2)
+    def test_process_pool(self):
+        for name in ("places.jsonl", "places.csv"):
+            with self.subTest(name=name):
+                path = self.path(name)
+                bulk.write(path, Place, self.places)
+                self.assertEqual(bulk.read(path, Place),
+                                 bulk.read(path, Place, processes=2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/db_storage.py.
+
+Unittest classes:
+    TestDBStorage
+"""
+import os
+import unittest
+from unittest.mock import patch
+from models.engine.base_storage import BaseStorage
+from models.engine.db_storage import DBStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+
+
+class TestDBStorage(unittest.TestCase):
+    """Unittests for testing the DBStorage class."""
+
+    def setUp(self):
+        with patch.dict(os.environ, {"HBNB_SQLITE_PATH": "test_hbnb.db"}):
+            self.storage = DBStorage()
+        self.storage.reload()
+
+    def tearDown(self):
+        self.storage.close()
+        try:
+            os.remove("test_hbnb.db")
+        except IOError:
+            pass
+
+    def reopen(self):
+        self.storage.close()
+        with patch.dict(os.environ, {"HBNB_SQLITE_PATH": "test_hbnb.db"}):
+            self.storage = DBStorage()
+        self.storage.reload()
+
+    def test_is_storage(self):
+        self.assertIsInstance(self.storage, BaseStorage)
+
+    def test_new_and_get(self):
+        us = User(id="1", first_name="Betty")
+        self.storage.new(us)
+        self.assertIs(us, self.storage.get(User, "1"))
+        self.assertIsNone(self.storage.get("User", "2"))
+
+    def test_save_persists(self):
+        self.storage.new(User(id="1", first_name="Betty"))
+        self.storage.save()
+        self.reopen()
+        us = self.storage.get("User", "1")
+        self.assertEqual("Betty", us.first_name)
+        self.assertIs(us, self.storage.get("User", "1"))
+
+    def test_save_writes_dirty_objects(self):
+        us = User(id="1")
+        self.storage.new(us)
+        self.storage.save()
+        us.first_name = "Betty"
+        self.storage.save()
+        self.reopen()
+        self.assertEqual("Betty", self.storage.get(User, "1").first_name)
+
+    def test_unsaved_changes_rolled_back(self):
+        self.storage.new(User(id="1"))
+        self.reopen()
+        self.assertIsNone(self.storage.get(User, "1"))
+
+    def test_all_and_count(self):
+        self.storage.new(User(id="1"))
+        self.storage.new(User(id="2"))
+        self.storage.new(State(id="1"))
+        self.assertEqual({"User.1", "User.2"},
+                         set(self.storage.all(User)))
+        self.assertEqual({"User.1", "User.2", "State.1"},
+                         set(self.storage.all()))
+        self.assertEqual(2, self.storage.count("User"))
+        self.assertEqual(3, self.storage.count())
+        self.assertEqual(0, self.storage.count(Place))
+
+    def test_delete(self):
+        us = User(id="1")
+        self.storage.new(us)
+        self.storage.save()
+        self.storage.delete(us)
+        self.storage.save()
+        self.reopen()
+        self.assertIsNone(self.storage.get(User, "1"))
+        self.assertEqual(0, self.storage.count(User))
+
+    def test_update_many_persists(self):
+        place = Place(id="1", max_guest=2)
+        self.storage.new(place)
+        self.storage.save()
+        self.storage.update_many("Place.1", {"name": "Loft",
+                                             "max_guest": "4"})
+        self.reopen()
+        place = self.storage.get("Place", "1")
+        self.assertEqual(("Loft", 4), (place.name, place.max_guest))
+
+    def test_batch_commits_once(self):
+        with self.storage.batch():
+            for i in range(3):
+                self.storage.new(User(id=str(i)))
+                self.storage.save()
+        self.reopen()
+        self.assertEqual(3, self.storage.count(User))
+
+    def test_batch_rollback(self):
+        self.storage.new(User(id="1"))
+        self.storage.save()
+        with self.assertRaises(ValueError):
+            with self.storage.batch():
+                self.storage.new(User(id="2"))
+                self.storage.save()
+                raise ValueError
+        self.assertEqual(1, self.storage.count(User))
+        self.assertIsNone(self.storage.get(User, "2"))
+
+    def test_unknown_class(self):
+        with self.assertRaises(KeyError):
+            self.storage.count("Unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
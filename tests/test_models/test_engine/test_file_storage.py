@@ -4,20 +4,34 @@
 Unittest classes:
     TestFileStorage_instantiation
     TestFileStorage_methods
+    TestFileStorage_journal
+    TestFileStorage_lazy
+    TestFileStorage_batch
+    TestFileStorage_threads
+    TestFileStorage_search
+    TestFileStorage_shared
 """
 import os
 import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
 import models
 import unittest
 from datetime import datetime
 from models.base_model import BaseModel
+from models.engine.base_storage import BaseStorage
 from models.engine.file_storage import FileStorage
+from models.engine import text_index
 from models.user import User
 from models.state import State
 from models.place import Place
 from models.city import City
 from models.amenity import Amenity
 from models.review import Review
+from unittest.mock import patch
 
 
 class TestFileStorage_instantiation(unittest.TestCase):
@@ -36,6 +50,9 @@ class TestFileStorage_instantiation(unittest.TestCase):
     def testFileStorage_objects_is_private_dict(self):
         self.assertEqual(dict, type(FileStorage._FileStorage__objects))
 
+    def test_FileStorage_is_storage(self):
+        self.assertTrue(issubclass(FileStorage, BaseStorage))
+
     def test_storage_initializes(self):
         self.assertEqual(type(models.storage), FileStorage)
 
@@ -65,9 +82,104 @@ class TestFileStorage_methods(unittest.TestCase):
     def test_all(self):
         self.assertEqual(dict, type(models.storage.all()))
 
-    def test_all_with_arg(self):
-        with self.assertRaises(TypeError):
-            models.storage.all(None)
+    def test_all_with_None(self):
+        self.assertIs(models.storage.all(), models.storage.all(None))
+
+    def test_all_with_cls(self):
+        us = User()
+        st = State()
+        self.assertEqual({"User." + us.id: us}, models.storage.all(User))
+        self.assertEqual({"State." + st.id: st}, models.storage.all("State"))
+        self.assertEqual({}, models.storage.all(Review))
+
+    def test_count(self):
+        User()
+        User()
+        State()
+        self.assertEqual(3, models.storage.count())
+        self.assertEqual(2, models.storage.count(User))
+        self.assertEqual(1, models.storage.count("State"))
+        self.assertEqual(0, models.storage.count(Review))
+
+    def test_count_after_delete(self):
+        us = User()
+        models.storage.delete(us)
+        self.assertEqual(0, models.storage.count(User))
+        self.assertNotIn("User." + us.id, models.storage.all())
+
+    def test_related(self):
+        st = State()
+        cy = City()
+        cy.state_id = st.id
+        self.assertEqual({"City." + cy.id: cy},
+                         models.storage.related(City, "state_id", st.id))
+        other = City()
+        other.state_id = st.id
+        self.assertEqual(2, len(models.storage.related("City", "state_id",
+                                                       st.id)))
+        models.storage.delete(cy)
+        self.assertEqual({"City." + other.id: other},
+                         models.storage.related(City, "state_id", st.id))
+
+    def test_related_updated_by_setattr(self):
+        rv = Review()
+        self.assertEqual({}, models.storage.related(Review, "place_id", "1"))
+        rv.place_id = "1"
+        self.assertEqual({"Review." + rv.id: rv},
+                         models.storage.related(Review, "place_id", "1"))
+
+    def test_related_without_index(self):
+        us = User()
+        us.first_name = "Betty"
+        self.assertEqual({"User." + us.id: us},
+                         models.storage.related(User, "first_name", "Betty"))
+
+    def test_nearby(self):
+        sf = Place()
+        sf.latitude, sf.longitude = 37.77, -122.42
+        oakland = Place()
+        oakland.latitude, oakland.longitude = 37.80, -122.27
+        self.assertEqual([sf, oakland],
+                         models.storage.nearby(Place, 37.77, -122.42, 20))
+        self.assertEqual([oakland],
+                         models.storage.nearby("Place", 37.8, -122.27, 20, 1))
+        oakland.latitude = 34.05
+        self.assertEqual([sf], models.storage.nearby(Place, 37.8, -122.3, 20))
+        with self.assertRaises(ValueError):
+            models.storage.nearby(Place, 100, 0, 1)
+
+    def test_within(self):
+        sf = Place()
+        sf.latitude, sf.longitude = 37.77, -122.42
+        self.assertEqual({"Place." + sf.id: sf},
+                         models.storage.within(Place, 37, -123, 38, -122))
+        models.storage.delete(sf)
+        self.assertEqual({}, models.storage.within(Place, 37, -123, 38, -122))
+
+    def test_nearby_without_index(self):
+        us = User()
+        us.latitude, us.longitude = 37.77, -122.42
+        self.assertEqual([us], models.storage.nearby(User, 37.77, -122.4, 5))
+        self.assertEqual({"User." + us.id: us},
+                         models.storage.within(User, 37, -123, 38, -122))
+
+    def test_aggregate(self):
+        FileStorage._FileStorage__objects = {}
+        for price in (100, 50):
+            pl = Place()
+            pl.city_id, pl.price_by_night = "sf", price
+        self.assertEqual([{"city_id": "sf", "count": 2,
+                           "avg_price_by_night": 75}],
+                         models.storage.aggregate(Place, "city_id",
+                                                  avg="price_by_night"))
+        self.assertEqual([], models.storage.aggregate(Review, "place_id"))
+
+    def test_all_with_cls_after_direct_change(self):
+        us = User()
+        del models.storage.all()["User." + us.id]
+        self.assertEqual({}, models.storage.all(User))
+        FileStorage._FileStorage__objects = {"User." + us.id: us}
+        self.assertEqual({"User." + us.id: us}, models.storage.all(User))
 
     def test_new(self):
         bm = BaseModel()
@@ -134,6 +246,67 @@ class TestFileStorage_methods(unittest.TestCase):
         with self.assertRaises(TypeError):
             models.storage.save(None)
 
+    def test_save_leaves_no_temporary_file(self):
+        User()
+        models.storage.save()
+        self.assertFalse(os.path.exists("file.json.tmp"))
+
+    def test_binary_snapshot(self):
+        us = User()
+        us.first_name = "Betty"
+        FileStorage.snapshot_format = "binary"
+        try:
+            models.storage.save()
+            self.assertTrue(os.path.exists("file.hbnb"))
+            self.assertFalse(os.path.exists("file.json"))
+            FileStorage._FileStorage__objects = {}
+            models.storage.reload()
+        finally:
+            FileStorage.snapshot_format = "json"
+            os.remove("file.hbnb")
+        self.assertEqual("Betty",
+                         models.storage.get(User, us.id).first_name)
+
+    def test_background_save(self):
+        FileStorage.background = True
+        try:
+            us = User()
+            models.storage.save()
+            models.storage.flush()
+        finally:
+            FileStorage.background = False
+        with open("file.json", "r") as f:
+            self.assertIn("User." + us.id, f.read())
+
+    def test_save_clears_dirty_flag(self):
+        us = User()
+        self.assertTrue(us._dirty)
+        models.storage.save()
+        self.assertFalse(us._dirty)
+        us.first_name = "Betty"
+        self.assertTrue(us._dirty)
+
+    def test_save_only_serializes_dirty_objects(self):
+        us = User()
+        st = State()
+        models.storage.save()
+        st.name = "California"
+        with patch.object(User, "to_dict") as user_to_dict:
+            models.storage.save()
+            user_to_dict.assert_not_called()
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertEqual("California", saved["State." + st.id]["name"])
+        self.assertEqual(us.to_dict(), saved["User." + us.id])
+
+    def test_save_drops_deleted_objects(self):
+        us = User()
+        models.storage.save()
+        models.storage.delete(us)
+        models.storage.save()
+        with open("file.json", "r") as f:
+            self.assertNotIn("User." + us.id, f.read())
+
     def test_reload(self):
         bm = BaseModel()
         us = User()
@@ -165,5 +338,600 @@ class TestFileStorage_methods(unittest.TestCase):
             models.storage.reload(None)
 
 
+class TestFileStorage_journal(unittest.TestCase):
+    """Unittests for testing the journaled mode of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        FileStorage.journaled = True
+
+    def tearDown(self):
+        FileStorage.journaled = False
+        FileStorage.journal_threshold = 1000
+        for path in ("file.json", "file.json.log"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_save_appends_to_journal(self):
+        us = User()
+        us.save()
+        self.assertFalse(os.path.exists("file.json"))
+        with open("file.json.log", "r") as f:
+            self.assertIn("User." + us.id, f.read())
+
+    def test_save_appends_only_changes(self):
+        us = User()
+        us.save()
+        pl = Place()
+        pl.save()
+        with open("file.json.log", "r") as f:
+            lines = f.readlines()
+        self.assertEqual(2, len(lines))
+        self.assertIn("Place." + pl.id, lines[1])
+        self.assertNotIn("User." + us.id, lines[1])
+
+    def test_reload_replays_journal(self):
+        us = User()
+        us.first_name = "Betty"
+        us.save()
+        st = State()
+        st.save()
+        models.storage.delete(st)
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        objs = models.storage.all()
+        self.assertEqual("Betty", objs["User." + us.id].first_name)
+        self.assertNotIn("State." + st.id, objs)
+
+    def test_reload_replays_changed_attribute(self):
+        us = User()
+        us.save()
+        us.first_name = "Bob"
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        objs = models.storage.all()
+        self.assertEqual("Bob", objs["User." + us.id].first_name)
+
+    def test_save_appends_only_changed_attribute(self):
+        us = User()
+        State()
+        models.storage.save()
+        us.first_name = "Bob"
+        models.storage.save()
+        with open("file.json.log", "r") as f:
+            lines = f.readlines()
+        self.assertEqual(3, len(lines))
+        self.assertIn("User." + us.id, lines[2])
+        self.assertIn("Bob", lines[2])
+        models.storage.save()
+        with open("file.json.log", "r") as f:
+            self.assertEqual(3, len(f.readlines()))
+
+    def test_threshold_compacts_journal(self):
+        FileStorage.journal_threshold = 2
+        us = User()
+        us.save()
+        st = State()
+        st.save()
+        self.assertFalse(os.path.exists("file.json.log"))
+        with open("file.json", "r") as f:
+            save_text = f.read()
+            self.assertIn("User." + us.id, save_text)
+            self.assertIn("State." + st.id, save_text)
+
+    def test_snapshot_save_empties_journal(self):
+        us = User()
+        us.save()
+        FileStorage.journaled = False
+        models.storage.save()
+        self.assertFalse(os.path.exists("file.json.log"))
+        with open("file.json", "r") as f:
+            self.assertIn("User." + us.id, f.read())
+
+
+class TestFileStorage_lazy(unittest.TestCase):
+    """Unittests for testing the lazy reload of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.us = User()
+        self.us.first_name = "Betty"
+        self.st = State()
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage.lazy = True
+        models.storage.reload()
+
+    def tearDown(self):
+        FileStorage.lazy = False
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_reload_instantiates_nothing(self):
+        self.assertEqual({}, FileStorage._FileStorage__objects)
+        self.assertEqual(2, models.storage.count())
+        self.assertEqual(1, models.storage.count(User))
+
+    def test_get_instantiates_one_object(self):
+        us = models.storage.get(User, self.us.id)
+        self.assertIsNot(us, self.us)
+        self.assertEqual("Betty", us.first_name)
+        self.assertIs(us, models.storage.get("User", self.us.id))
+        self.assertEqual(["User." + self.us.id],
+                         list(FileStorage._FileStorage__objects))
+
+    def test_get_missing(self):
+        self.assertIsNone(models.storage.get(User, "missing"))
+
+    def test_all_with_cls_instantiates_class(self):
+        self.assertEqual(["User." + self.us.id],
+                         list(models.storage.all(User)))
+        self.assertNotIn("State." + self.st.id,
+                         FileStorage._FileStorage__objects)
+
+    def test_all_instantiates_everything(self):
+        objs = models.storage.all()
+        self.assertIn("User." + self.us.id, objs)
+        self.assertIn("State." + self.st.id, objs)
+
+    def test_save_keeps_raw_objects(self):
+        us = models.storage.get(User, self.us.id)
+        us.last_name = "Holberton"
+        models.storage.save()
+        with open("file.json", "r") as f:
+            saved = json.load(f)
+        self.assertEqual("Holberton", saved["User." + self.us.id]["last_name"])
+        self.assertIn("State." + self.st.id, saved)
+
+    def test_delete_raw_object(self):
+        models.storage.delete(models.storage.get(State, self.st.id))
+        self.assertEqual(0, models.storage.count(State))
+        self.assertIsNone(models.storage.get(State, self.st.id))
+
+
+class TestFileStorage_batch(unittest.TestCase):
+    """Unittests for testing batches of the FileStorage class."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        models.storage.rollback()
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_batch_saves_once(self):
+        with patch.object(FileStorage, "_FileStorage__write_snapshot") as w:
+            with models.storage.batch():
+                for i in range(5):
+                    User().save()
+                w.assert_not_called()
+            w.assert_called_once()
+        self.assertEqual(5, models.storage.count(User))
+
+    def test_update_many(self):
+        place = Place(max_guest=2)
+        models.storage.new(place)
+        created_at = place.created_at
+        updated_at = place.updated_at
+        key = "Place." + place.id
+        with patch.object(FileStorage, "_FileStorage__write_snapshot") as w:
+            self.assertIs(place, models.storage.update_many(key, {
+                "name": "Loft", "max_guest": "4", "latitude": 37,
+                "amenity_ids": '["wifi"]', "view": "sea", "id": "other",
+                "created_at": "2017-09-28T21:05:54.119427"}))
+            w.assert_called_once()
+        self.assertEqual(("Loft", 4, 37.0, ["wifi"], "sea"),
+                         (place.name, place.max_guest, place.latitude,
+                          place.amenity_ids, place.view))
+        self.assertIsInstance(place.latitude, float)
+        self.assertIs(place, models.storage.get(Place, place.id))
+        self.assertEqual(created_at, place.created_at)
+        self.assertLess(updated_at, place.updated_at)
+
+    def test_update_many_invalid(self):
+        place = Place(max_guest=2)
+        models.storage.new(place)
+        with self.assertRaises(ValueError):
+            models.storage.update_many("Place." + place.id,
+                                       {"name": "Loft", "max_guest": "x"})
+        self.assertEqual((2, ""), (place.max_guest, place.name))
+        with self.assertRaises(KeyError):
+            models.storage.update_many("Place.nope", {"name": "Loft"})
+
+    def test_import_file_saves_once(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "users.jsonl")
+            with open(path, "w") as file:
+                file.write('{"email": "a@b.c"}\n{"email": "d@e.f"}\n')
+            with patch.object(FileStorage,
+                              "_FileStorage__write_snapshot") as w:
+                self.assertEqual(2, models.storage.import_file("User", path))
+                w.assert_called_once()
+        self.assertEqual(["a@b.c", "d@e.f"],
+                         sorted(user.email for user in
+                                models.storage.all(User).values()))
+
+    def test_import_file_invalid_stores_nothing(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "users.jsonl")
+            with open(path, "w") as file:
+                file.write('{"email": "a@b.c"}\n{"age": 3}\n')
+            with self.assertRaisesRegex(ValueError, "line 2"):
+                models.storage.import_file(User, path)
+        self.assertEqual(0, models.storage.count(User))
+
+    def test_batch_without_save(self):
+        with patch.object(FileStorage, "_FileStorage__write_snapshot") as w:
+            with models.storage.batch():
+                User()
+            w.assert_not_called()
+
+    def test_nested_batch(self):
+        with models.storage.batch():
+            with models.storage.batch():
+                User().save()
+            self.assertFalse(os.path.exists("file.json"))
+        self.assertTrue(os.path.exists("file.json"))
+
+    def test_batch_rollback_on_exception(self):
+        us = User()
+        with self.assertRaises(ValueError):
+            with models.storage.batch():
+                State().save()
+                models.storage.delete(us)
+                raise ValueError
+        self.assertEqual({"User." + us.id: us}, models.storage.all())
+        self.assertEqual(0, models.storage.count(State))
+        self.assertFalse(os.path.exists("file.json"))
+
+    def test_begin_commit(self):
+        models.storage.begin()
+        us = User()
+        us.save()
+        self.assertFalse(os.path.exists("file.json"))
+        models.storage.commit()
+        with open("file.json", "r") as f:
+            self.assertIn("User." + us.id, f.read())
+
+    def test_commit_without_begin(self):
+        models.storage.commit()
+        self.assertFalse(os.path.exists("file.json"))
+
+
+class TestFileStorage_threads(unittest.TestCase):
+    """Unittests for using the FileStorage class from several threads."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def tearDown(self):
+        FileStorage.journaled = False
+        FileStorage.journal_threshold = 1000
+        for path in ("file.json", "file.json.log"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def run_threads(self, *targets):
+        errors = []
+
+        def run(target):
+            try:
+                target()
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=run, args=(target,))
+                   for target in targets]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(60)
+        self.assertEqual([], errors)
+
+    def test_stress(self):
+        self.stress()
+
+    def test_stress_journaled(self):
+        FileStorage.journaled = True
+        FileStorage.journal_threshold = 50
+        self.stress()
+
+    def stress(self):
+        models.storage.query(Place).where(price_by_night__lt=50).all()
+        kept = []
+        done = threading.Event()
+
+        def write():
+            for i in range(100):
+                pl = Place()
+                pl.price_by_night = i
+                pl.name = "place {}".format(i)
+                if i % 2:
+                    models.storage.delete(pl)
+                else:
+                    kept.append(pl)
+                if i % 10 == 0:
+                    models.storage.save()
+
+        def read():
+            while not done.is_set():
+                for key, obj in models.storage.all().items():
+                    self.assertEqual(key, "Place." + obj.id)
+                models.storage.all(Place)
+                models.storage.count(Place)
+                models.storage.query(Place).where(
+                    price_by_night__lt=50).all()
+
+        readers = [threading.Thread(target=read) for i in range(4)]
+        for reader in readers:
+            reader.start()
+        try:
+            self.run_threads(*[write] * 8)
+        finally:
+            done.set()
+            for reader in readers:
+                reader.join(60)
+        self.assertEqual(400, models.storage.count(Place))
+        self.assertEqual(200, len(models.storage.query(Place).where(
+            price_by_night__lt=50).all()))
+        models.storage.save()
+        FileStorage._FileStorage__objects = {}
+        models.storage.reload()
+        self.assertEqual({"Place." + pl.id for pl in kept},
+                         set(models.storage.all()))
+
+    def test_get_while_creating(self):
+        def read():
+            for obj in models.storage.all().values():
+                models.storage.get(Place, obj.id)
+
+        for i in range(50):
+            Place()
+        self.run_threads(read, read, lambda: [Place() for i in range(50)])
+        self.assertEqual(100, models.storage.count(Place))
+
+    def test_all_is_a_snapshot(self):
+        us = User()
+        objects = models.storage.all()
+        User()
+        models.storage.delete(us)
+        self.assertEqual(["User." + us.id], list(objects))
+        self.assertEqual(1, models.storage.count(User))
+
+    def test_save_does_not_wait_for_writers(self):
+        for i in range(10):
+            User()
+        saving = threading.Event()
+        created = threading.Event()
+
+        def to_dict(obj):
+            saving.set()
+            self.assertTrue(created.wait(5))
+            return {"__class__": "User", "id": obj.id}
+
+        def create():
+            self.assertTrue(saving.wait(5))
+            User()
+            created.set()
+
+        with patch.object(User, "to_dict", to_dict):
+            self.run_threads(models.storage.save, create)
+        self.assertEqual(11, models.storage.count(User))
+
+
+class TestFileStorage_search(unittest.TestCase):
+    """Unittests for testing the full-text search of FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.loft = Place(name="Cozy loft", description="Near the beach")
+        self.house = Place(name="House", description="With a garden")
+        self.review = Review(text="The loft was cozy")
+        for obj in (self.loft, self.house, self.review):
+            models.storage.new(obj)
+
+    def tearDown(self):
+        for path in ("file.json", "file.json.search"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def test_search(self):
+        self.assertCountEqual([self.loft, self.review],
+                              models.storage.search("cozy loft"))
+        self.assertEqual([self.loft],
+                         models.storage.search("cozy loft", Place))
+        self.assertEqual([self.review],
+                         models.storage.search("loft", "Review", 1))
+        self.assertEqual([], models.storage.search("loft", User))
+
+    def test_search_follows_changes(self):
+        models.storage.search("garden")
+        self.house.description = "A loft"
+        self.assertIn(self.house, models.storage.search("loft", Place))
+        self.assertEqual([], models.storage.search("garden"))
+        models.storage.delete(self.loft)
+        self.assertEqual([self.house], models.storage.search("loft", Place))
+
+    def test_search_index_is_saved(self):
+        models.storage.search("loft")
+        models.storage.save()
+        self.assertTrue(os.path.isfile("file.json.search"))
+        models.storage.reload()
+        FileStorage._FileStorage__objects = dict(models.storage.all())
+        with patch("models.engine.text_index.tokenize",
+                   wraps=text_index.tokenize) as tokenize:
+            self.assertEqual(2, len(models.storage.search("loft")))
+        self.assertEqual(1, tokenize.call_count)
+
+
+class TestFileStorage_shared(unittest.TestCase):
+    """Unittests for sharing the JSON file between processes."""
+
+    CHILD = """
+import os, sys
+os.chdir(sys.argv[1])
+sys.path.insert(0, sys.argv[2])
+from models import storage
+from models.user import User
+{}
+"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = FileStorage._FileStorage__file_path
+        FileStorage._FileStorage__file_path = \
+            os.path.join(self.directory, "file.json")
+        FileStorage._FileStorage__objects = {}
+        FileStorage.shared = True
+        models.storage.reload()
+
+    def tearDown(self):
+        FileStorage.shared = False
+        FileStorage.journaled = False
+        FileStorage._FileStorage__file_path = self.path
+        FileStorage._FileStorage__objects = {}
+        shutil.rmtree(self.directory)
+
+    def run_child(self, code, journaled=False):
+        """Runs code in another process sharing the JSON file."""
+        return subprocess.Popen(
+            [sys.executable, "-c", self.CHILD.format(code), self.directory,
+             os.getcwd()],
+            env=dict(os.environ, HBNB_SHARED_FILE="1",
+                     HBNB_FILE_JOURNAL="1" if journaled else "0"),
+            stdout=subprocess.PIPE, universal_newlines=True)
+
+    def child_output(self, code, journaled=False):
+        child = self.run_child(code, journaled)
+        output = child.communicate(timeout=60)[0]
+        self.assertEqual(0, child.returncode)
+        return output.split()
+
+    def test_sees_changes_of_other_process(self):
+        kept, deleted = User(), User()
+        models.storage.save()
+        created, = self.child_output(
+            "us = User()\n"
+            "storage.get(User, '{}').first_name = 'Betty'\n"
+            "storage.delete(storage.get(User, '{}'))\n"
+            "storage.save()\n"
+            "print(us.id)".format(kept.id, deleted.id))
+        self.assertIsNotNone(models.storage.get(User, created))
+        self.assertIsNone(models.storage.get(User, deleted.id))
+        self.assertEqual("Betty", models.storage.get(User, kept.id)
+                         .first_name)
+        self.assertEqual(2, models.storage.count(User))
+
+    def test_unchanged_objects_are_kept(self):
+        us = User()
+        models.storage.save()
+        self.child_output("User().save()")
+        self.assertIs(us, models.storage.get(User, us.id))
+
+    def test_unsaved_changes_are_kept(self):
+        us = User()
+        models.storage.save()
+        created = User()
+        us.first_name = "Local"
+        models.storage.new(us)
+        self.child_output(
+            "storage.get(User, '{}').first_name = 'Remote'\n"
+            "storage.save()".format(us.id))
+        self.assertEqual(2, models.storage.count(User))
+        self.assertEqual("Local", us.first_name)
+        models.storage.save()
+        self.assertEqual(["Local"], self.child_output(
+            "print(storage.get(User, '{}').first_name)".format(us.id)))
+        self.assertEqual([created.id], self.child_output(
+            "print(storage.get(User, '{}').id)".format(created.id)))
+
+    def test_no_lost_saves(self):
+        self.no_lost_saves(False)
+
+    def test_no_lost_saves_journaled(self):
+        FileStorage.journaled = True
+        self.no_lost_saves(True)
+
+    def no_lost_saves(self, journaled):
+        children = [self.run_child("for i in range(20):\n"
+                                   "    User().save()", journaled)
+                    for i in range(4)]
+        for i in range(20):
+            User().save()
+        for child in children:
+            child.communicate(timeout=60)
+            self.assertEqual(0, child.returncode)
+        self.assertEqual(100, models.storage.count(User))
+        self.assertEqual(["100"], self.child_output(
+            "print(storage.count(User))", journaled))
+
+    def test_journal_tail_is_merged(self):
+        FileStorage.journaled = True
+        User().save()
+        with patch.object(FileStorage, "_FileStorage__read_snapshot") as read:
+            created, = self.child_output("us = User()\nus.save()\n"
+                                         "print(us.id)", True)
+            self.assertIsNotNone(models.storage.get(User, created))
+        read.assert_not_called()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/geo.py.
+
+Unittest classes:
+    TestGeo
+"""
+import unittest
+from models.engine.geo import bounding_box, distance_km, in_box
+
+
+class TestGeo(unittest.TestCase):
+    """Unittests for testing the geometry functions."""
+
+    def test_distance_km(self):
+        self.assertEqual(0, distance_km(37.77, -122.42, 37.77, -122.42))
+        self.assertAlmostEqual(559, distance_km(37.77, -122.42,
+                                                34.05, -118.24), delta=2)
+        self.assertAlmostEqual(2.2, distance_km(0, 179.99, 0, -179.99),
+                               delta=0.1)
+
+    def test_bounding_box(self):
+        south, west, north, east = bounding_box(0, 0, 111.2)
+        self.assertAlmostEqual(-1, south, places=2)
+        self.assertAlmostEqual(1, east, places=2)
+        self.assertEqual((-180, 180), bounding_box(89.9, 0, 100)[1::2])
+        west, east = bounding_box(0, 179.5, 111.2)[1::2]
+        self.assertGreater(west, east)
+
+    def test_bounding_box_invalid(self):
+        with self.assertRaises(ValueError):
+            bounding_box(91, 0, 1)
+        with self.assertRaises(ValueError):
+            bounding_box(0, "0", 1)
+        with self.assertRaises(ValueError):
+            bounding_box(0, 0, -1)
+
+    def test_in_box(self):
+        self.assertTrue(in_box(1, 1, 0, 0, 2, 2))
+        self.assertFalse(in_box(3, 1, 0, 0, 2, 2))
+        self.assertTrue(in_box(0, 179.5, -1, 179, 1, -179))
+        self.assertTrue(in_box(0, -179.5, -1, 179, 1, -179))
+        self.assertFalse(in_box(0, 0, -1, 179, 1, -179))
+
+
+if __name__ == "__main__":
+    unittest.main()
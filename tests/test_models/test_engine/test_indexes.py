@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/indexes.py.
+
+Unittest classes:
+    TestReferenceIndex
+    TestSortedIndex
+    TestGeoIndex
+"""
+import unittest
+from models.city import City
+from models.place import Place
+from models.engine.indexes import GeoIndex, ReferenceIndex, SortedIndex
+
+
+class TestReferenceIndex(unittest.TestCase):
+    """Unittests for testing the ReferenceIndex class."""
+
+    def setUp(self):
+        self.sf = City(id="1", state_id="CA")
+        self.la = City(id="2", state_id="CA")
+        self.index = ReferenceIndex("state_id", {"City.1": self.sf,
+                                                 "City.2": self.la})
+
+    def test_lookup(self):
+        self.assertEqual({"City.1": self.sf, "City.2": self.la},
+                         self.index.lookup("CA"))
+        self.assertEqual({}, self.index.lookup("NY"))
+
+    def test_remove(self):
+        self.index.remove("City.1")
+        self.assertEqual({"City.2": self.la}, self.index.lookup("CA"))
+        self.index.remove("City.3")
+
+    def test_update(self):
+        self.sf.state_id = "NY"
+        self.index.update("City.1", self.sf)
+        self.assertEqual({"City.1": self.sf}, self.index.lookup("NY"))
+        self.assertEqual({"City.2": self.la}, self.index.lookup("CA"))
+
+    def test_empty_reference(self):
+        self.index.add("City.3", City(id="3"))
+        self.assertEqual({}, self.index.lookup(""))
+
+    def test_list_attribute(self):
+        place = Place(id="1", amenity_ids=["wifi", "tv"])
+        index = ReferenceIndex("amenity_ids", {"Place.1": place})
+        self.assertEqual({"Place.1": place}, index.lookup("wifi"))
+        self.assertEqual({"Place.1": place}, index.lookup("tv"))
+
+
+class TestSortedIndex(unittest.TestCase):
+    """Unittests for testing the SortedIndex class."""
+
+    def setUp(self):
+        self.places = {"Place.{}".format(i): Place(id=str(i),
+                                                   price_by_night=price)
+                       for i, price in enumerate([50, 120, 80, 80, 200])}
+        self.index = SortedIndex("price_by_night", self.places)
+
+    def prices(self, op=None, value=None):
+        return [obj.price_by_night
+                for key, obj in self.index.select(op, value)]
+
+    def test_select_all(self):
+        self.assertEqual([50, 80, 80, 120, 200], self.prices())
+
+    def test_select_ranges(self):
+        self.assertEqual([50], self.prices("lt", 80))
+        self.assertEqual([50, 80, 80], self.prices("lte", 80))
+        self.assertEqual([120, 200], self.prices("gt", 80))
+        self.assertEqual([80, 80, 120, 200], self.prices("gte", 80))
+        self.assertEqual([80, 80], self.prices("eq", 80))
+        self.assertEqual([], self.prices("eq", 81))
+
+    def test_update_and_remove(self):
+        place = self.places["Place.0"]
+        place.price_by_night = 300
+        self.index.update("Place.0", place)
+        self.assertEqual([80, 80, 120, 200, 300], self.prices())
+        self.index.remove("Place.0")
+        self.index.remove("Place.9")
+        self.assertEqual([80, 80, 120, 200], self.prices())
+
+    def test_non_numeric_values_are_left_out(self):
+        self.index.add("Place.5", Place(id="5", price_by_night="cheap"))
+        self.assertEqual(5, len(self.index))
+
+
+class TestGeoIndex(unittest.TestCase):
+    """Unittests for testing the GeoIndex class."""
+
+    def setUp(self):
+        locations = {"sf": (37.77, -122.42), "oakland": (37.80, -122.27),
+                     "la": (34.05, -118.24), "east": (0, 179.99),
+                     "west": (0, -179.99)}
+        self.places = {"Place." + name: Place(id=name, latitude=lat,
+                                              longitude=lon)
+                       for name, (lat, lon) in locations.items()}
+        self.index = GeoIndex("latitude", "longitude", self.places)
+
+    def test_nearby(self):
+        found = self.index.nearby(37.77, -122.42, 20)
+        self.assertEqual(["Place.sf", "Place.oakland"],
+                         [key for distance, key, obj in found])
+        self.assertAlmostEqual(13.3, found[1][0], delta=0.5)
+        self.assertEqual(1, len(self.index.nearby(37.77, -122.42, 20, 1)))
+        self.assertEqual(3, len(self.index.nearby(37.77, -122.42, 600)))
+
+    def test_nearby_across_antimeridian(self):
+        found = self.index.nearby(0, 180, 5)
+        self.assertEqual({"Place.east", "Place.west"},
+                         {key for distance, key, obj in found})
+
+    def test_within(self):
+        self.assertEqual({"Place.sf", "Place.oakland"},
+                         set(self.index.within(37, -123, 38, -122)))
+        self.assertEqual({"Place.east", "Place.west"},
+                         set(self.index.within(-1, 179, 1, -179)))
+        self.assertEqual(5, len(self.index.within(-90, -180, 90, 180)))
+
+    def test_update_and_remove(self):
+        place = self.places["Place.la"]
+        place.latitude, place.longitude = 37.78, -122.41
+        self.index.update("Place.la", place)
+        self.assertEqual(3, len(self.index.nearby(37.77, -122.42, 20)))
+        self.index.remove("Place.la")
+        self.index.remove("Place.nowhere")
+        self.assertEqual(2, len(self.index.nearby(37.77, -122.42, 20)))
+
+    def test_invalid_locations_are_left_out(self):
+        self.index.add("Place.x", Place(id="x", latitude="north"))
+        self.index.add("Place.y", Place(id="y", latitude=95.0))
+        self.assertEqual(5, len(self.index))
+
+
+if __name__ == "__main__":
+    unittest.main()
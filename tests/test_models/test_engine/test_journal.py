@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/journal.py.
+
+Unittest classes:
+    TestJournal
+"""
+import os
+import unittest
+from models.engine.journal import Journal
+
+
+class TestJournal(unittest.TestCase):
+    """Unittests for testing the Journal class."""
+
+    def setUp(self):
+        self.journal = Journal("test_journal.log")
+
+    def tearDown(self):
+        try:
+            os.remove("test_journal.log")
+        except IOError:
+            pass
+
+    def test_replay_missing_file(self):
+        self.assertEqual([], list(self.journal.replay()))
+
+    def test_append_and_replay(self):
+        self.journal.append({"User.1": {"id": "1"}})
+        self.journal.append({"User.1": None})
+        self.assertEqual(2, self.journal.records)
+        self.assertEqual([("User.1", {"id": "1"}), ("User.1", None)],
+                         list(self.journal.replay()))
+
+    def test_append_nothing(self):
+        self.journal.append({})
+        self.assertFalse(os.path.exists("test_journal.log"))
+
+    def test_replay_skips_torn_line(self):
+        self.journal.append({"User.1": {"id": "1"}})
+        with open("test_journal.log", "a") as f:
+            f.write('["set", "User.2", {"id"')
+        self.assertEqual([("User.1", {"id": "1"})],
+                         list(self.journal.replay()))
+        self.assertEqual(1, self.journal.records)
+
+    def test_tail(self):
+        other = Journal("test_journal.log")
+        self.journal.append({"User.1": {"id": "1"}})
+        self.assertEqual([("User.1", {"id": "1"})], list(other.tail()))
+        other.append({"User.2": {"id": "2"}})
+        self.assertEqual([], list(other.tail()))
+        self.assertEqual([("User.2", {"id": "2"})], list(self.journal.tail()))
+        self.assertEqual(os.path.getsize("test_journal.log"),
+                         self.journal.offset)
+        self.assertEqual(self.journal.size(), other.offset)
+
+    def test_tail_waits_for_torn_line(self):
+        with open("test_journal.log", "a") as f:
+            f.write('["set", "User.2", {"id"')
+        self.assertEqual([], list(self.journal.tail()))
+        self.assertEqual(0, self.journal.offset)
+        with open("test_journal.log", "a") as f:
+            f.write(': "2"}]\n')
+        self.assertEqual([("User.2", {"id": "2"})], list(self.journal.tail()))
+
+    def test_truncate(self):
+        self.journal.append({"User.1": {"id": "1"}})
+        self.journal.truncate()
+        self.assertEqual(0, self.journal.records)
+        self.assertFalse(os.path.exists("test_journal.log"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/json_stream.py.
+
+Unittest classes:
+    TestIterItems
+"""
+import json
+import unittest
+from io import StringIO
+from models.engine.json_stream import iter_items
+
+
+class TestIterItems(unittest.TestCase):
+    """Unittests for testing the iter_items function."""
+
+    data = {
+        "User.1": {"id": "1", "first_name": "Betty", "tags": [1, 2.5]},
+        "Place.{2}": {"id": "{2}", "name": "a \"quoted\" } name"},
+        "Amenity.3": {"id": "3", "number": 12345678901234567890}
+    }
+
+    def test_items_in_order(self):
+        text = json.dumps(self.data)
+        self.assertEqual(list(self.data.items()),
+                         list(iter_items(StringIO(text))))
+
+    def test_small_chunks(self):
+        text = json.dumps(self.data, indent=4)
+        for chunk_size in (1, 2, 3, 5, 8):
+            self.assertEqual(self.data,
+                             dict(iter_items(StringIO(text), chunk_size)))
+
+    def test_empty_object(self):
+        self.assertEqual([], list(iter_items(StringIO(" { } "))))
+
+    def test_not_an_object(self):
+        with self.assertRaises(ValueError):
+            list(iter_items(StringIO("[1, 2]")))
+
+    def test_empty_file(self):
+        with self.assertRaises(ValueError):
+            list(iter_items(StringIO("")))
+
+    def test_truncated_file(self):
+        text = json.dumps(self.data)[:-10]
+        with self.assertRaises(ValueError):
+            list(iter_items(StringIO(text), 4))
+
+    def test_missing_separator(self):
+        with self.assertRaises(ValueError) as error:
+            list(iter_items(StringIO('{"a": 1 "b": 2}')))
+        self.assertEqual("Expecting ',' or '}' after key 'a'",
+                         str(error.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
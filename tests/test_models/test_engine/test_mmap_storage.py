@@ -0,0 +1,124 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/mmap_storage.py.
+
+Unittest classes:
+    TestMmapStorage
+"""
+import os
+import unittest
+from unittest.mock import patch
+from models.engine.base_storage import BaseStorage
+from models.engine.mmap_storage import MmapStorage
+from models.state import State
+from models.user import User
+
+
+class TestMmapStorage(unittest.TestCase):
+    """Unittests for testing the MmapStorage class."""
+
+    def setUp(self):
+        self.reopen()
+
+    def tearDown(self):
+        self.storage.close()
+        for path in ("test_hbnb.dat", "test_hbnb.dat.idx"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+
+    def reopen(self):
+        if hasattr(self, "storage"):
+            self.storage.close()
+        with patch.dict(os.environ, {"HBNB_MMAP_PATH": "test_hbnb.dat"}):
+            self.storage = MmapStorage()
+        self.storage.reload()
+
+    def test_is_storage(self):
+        self.assertIsInstance(self.storage, BaseStorage)
+
+    def test_new_and_get(self):
+        us = User(id="1")
+        self.storage.new(us)
+        self.assertIs(us, self.storage.get(User, "1"))
+        self.assertIsNone(self.storage.get(User, "2"))
+        self.assertEqual(1, self.storage.count(User))
+
+    def test_save_and_reload(self):
+        self.storage.new(User(id="1", first_name="Betty"))
+        self.storage.new(State(id="1", name="California"))
+        self.storage.save()
+        self.reopen()
+        self.assertEqual(2, self.storage.count())
+        self.assertEqual("Betty", self.storage.get(User, "1").first_name)
+        self.assertEqual({"State.1"}, set(self.storage.all(State)))
+
+    def test_update_appends_one_record(self):
+        us = User(id="1")
+        self.storage.new(us)
+        self.storage.new(State(id="1"))
+        self.storage.save()
+        size = os.path.getsize("test_hbnb.dat")
+        us.first_name = "Betty"
+        self.storage.save()
+        with open("test_hbnb.dat", "rb") as f:
+            f.seek(size)
+            self.assertEqual(1, len(f.readlines()))
+        self.reopen()
+        self.assertEqual("Betty", self.storage.get(User, "1").first_name)
+
+    def test_delete(self):
+        us = User(id="1")
+        self.storage.new(us)
+        self.storage.save()
+        self.storage.delete(us)
+        self.storage.save()
+        self.reopen()
+        self.assertIsNone(self.storage.get(User, "1"))
+        self.assertEqual(0, self.storage.count(User))
+
+    def test_recovers_records_missing_from_index(self):
+        self.storage.new(User(id="1"))
+        self.storage.save()
+        self.storage.new(User(id="2"))
+        self.storage.save()
+        with open("test_hbnb.dat.idx", "r") as f:
+            first_line = f.readline()
+        with open("test_hbnb.dat.idx", "w") as f:
+            f.write(first_line)
+        self.reopen()
+        self.assertEqual(2, self.storage.count(User))
+        self.assertIsNotNone(self.storage.get(User, "2"))
+
+    def test_compact(self):
+        us = User(id="1")
+        self.storage.new(us)
+        for name in ("a", "b", "c"):
+            us.first_name = name
+            self.storage.save()
+        self.storage.compact()
+        with open("test_hbnb.dat", "rb") as f:
+            self.assertEqual(1, len(f.readlines()))
+        self.reopen()
+        self.assertEqual("c", self.storage.get(User, "1").first_name)
+
+    def test_batch_rollback(self):
+        with self.assertRaises(ValueError):
+            with self.storage.batch():
+                self.storage.new(User(id="1"))
+                self.storage.save()
+                raise ValueError
+        self.assertEqual(0, self.storage.count(User))
+        self.assertFalse(os.path.exists("test_hbnb.dat"))
+
+    def test_rollback_drops_unsaved(self):
+        self.storage.new(User(id="1"))
+        self.storage.begin()
+        self.storage.new(User(id="2"))
+        self.storage.rollback()
+        self.assertEqual({}, self.storage.all(User))
+        self.assertIsNone(self.storage.get(User, "1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
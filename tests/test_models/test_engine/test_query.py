@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/query.py.
+
+Unittest classes:
+    TestQuery
+"""
+import os
+import unittest
+import models
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.user import User
+from unittest.mock import patch
+
+
+class TestQuery(unittest.TestCase):
+    """Unittests for testing the Query class over FileStorage."""
+
+    def setUp(self):
+        try:
+            os.rename("file.json", "tmp")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+        self.places = []
+        for price, guests in [(50, 2), (120, 6), (80, 4), (95, 4), (60, 5)]:
+            place = Place(price_by_night=price, max_guest=guests)
+            models.storage.new(place)
+            self.places.append(place)
+        models.storage.new(User())
+
+    def tearDown(self):
+        try:
+            os.remove("file.json")
+        except IOError:
+            pass
+        try:
+            os.rename("tmp", "file.json")
+        except IOError:
+            pass
+        FileStorage._FileStorage__objects = {}
+
+    def prices(self, query):
+        return [place.price_by_night for place in query.all()]
+
+    def test_where(self):
+        query = models.storage.query(Place).where(price_by_night__lt=100,
+                                                  max_guest__gte=4)
+        self.assertEqual([60, 80, 95], sorted(self.prices(query)))
+
+    def test_order_by_and_limit(self):
+        query = models.storage.query("Place").order_by("-price_by_night")
+        self.assertEqual([120, 95, 80, 60, 50], self.prices(query))
+        self.assertEqual([95, 80], self.prices(query.offset(1).limit(2)))
+        query = models.storage.query(Place).where(price_by_night__gt=55) \
+            .order_by("price_by_night").limit(2)
+        self.assertEqual([60, 80], self.prices(query))
+
+    def test_order_by_several_attributes(self):
+        query = models.storage.query(Place).order_by("max_guest",
+                                                     "-price_by_night")
+        self.assertEqual([50, 95, 80, 60, 120], self.prices(query))
+
+    def test_operators(self):
+        query = models.storage.query(Place)
+        self.assertEqual(4, query.where(price_by_night__ne=80).count())
+        self.assertEqual(2, query.where(max_guest=4).count())
+        self.assertEqual(2, query.where(price_by_night__in=[50, 60]).count())
+        with self.assertRaises(ValueError):
+            query.where(price_by_night__between=1)
+
+    def test_incomparable_values_do_not_match(self):
+        self.places[0].price_by_night = "cheap"
+        query = models.storage.query(Place).where(price_by_night__lt=100)
+        self.assertEqual([60, 80, 95], sorted(self.prices(query)))
+        query = models.storage.query(Place).order_by("price_by_night")
+        self.assertEqual("cheap", query.all()[-1].price_by_night)
+
+    def test_index_follows_changes(self):
+        query = models.storage.query(Place).where(price_by_night__gte=100)
+        self.assertEqual([120], self.prices(query))
+        self.places[0].price_by_night = 150
+        place = Place(price_by_night=110)
+        models.storage.new(place)
+        models.storage.delete(self.places[1])
+        self.assertEqual([110, 150], sorted(self.prices(query)))
+
+    def test_uses_sorted_index(self):
+        models.storage.query(Place).where(price_by_night__lt=100).all()
+        with patch.object(FileStorage, "all") as all_objects:
+            query = models.storage.query(Place).where(price_by_night__lt=70)
+            self.assertEqual([50, 60], sorted(self.prices(query)))
+            all_objects.assert_not_called()
+
+    def test_first(self):
+        query = models.storage.query(Place).order_by("price_by_night")
+        self.assertEqual(50, query.first().price_by_night)
+        self.assertIsNone(query.where(price_by_night__gt=1000).first())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/rwlock.py.
+
+Unittest classes:
+    TestRWLock
+"""
+import threading
+import unittest
+from models.engine.rwlock import RWLock
+
+
+class TestRWLock(unittest.TestCase):
+    """Unittests for testing the RWLock class."""
+
+    def setUp(self):
+        self.lock = RWLock()
+
+    def run_thread(self, target):
+        thread = threading.Thread(target=target)
+        thread.start()
+        return thread
+
+    def test_readers_share(self):
+        entered = threading.Barrier(2, timeout=5)
+
+        def read():
+            with self.lock.read():
+                entered.wait()
+
+        thread = self.run_thread(read)
+        read()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+
+    def test_writer_excludes_readers(self):
+        done = []
+
+        def read():
+            with self.lock.read():
+                done.append(True)
+
+        with self.lock.write():
+            thread = self.run_thread(read)
+            thread.join(0.1)
+            self.assertEqual([], done)
+        thread.join(5)
+        self.assertEqual([True], done)
+
+    def test_waiting_writer_blocks_new_readers(self):
+        order = []
+        self.lock.acquire_read()
+
+        def write():
+            with self.lock.write():
+                order.append("write")
+
+        def read():
+            with self.lock.read():
+                order.append("read")
+
+        writer = self.run_thread(write)
+        writer.join(0.1)
+        reader = self.run_thread(read)
+        reader.join(0.1)
+        self.assertEqual([], order)
+        self.lock.release_read()
+        writer.join(5)
+        reader.join(5)
+        self.assertEqual(["write", "read"], order)
+
+    def test_reentrant(self):
+        with self.lock.write():
+            with self.lock.write():
+                with self.lock.read():
+                    pass
+        with self.lock.read():
+            with self.lock.read():
+                pass
+        with self.lock.write():
+            pass
+
+    def test_reader_cannot_write(self):
+        with self.lock.read():
+            with self.assertRaises(RuntimeError):
+                self.lock.acquire_write()
+        with self.lock.write():
+            pass
+
+    def test_release_write_not_held(self):
+        with self.assertRaises(RuntimeError):
+            self.lock.release_write()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/text_index.py.
+
+Unittest classes:
+    TestTextIndex
+"""
+import json
+import unittest
+from unittest.mock import patch
+from models.place import Place
+from models.review import Review
+from models.engine import text_index
+from models.engine.text_index import TextIndex, rank, tokenize
+
+
+class TestTextIndex(unittest.TestCase):
+    """Unittests for testing the TextIndex class and rank()."""
+
+    def setUp(self):
+        self.places = {
+            "Place.1": Place(id="1", name="Cozy loft",
+                             description="A cozy loft near the beach"),
+            "Place.2": Place(id="2", name="Big house",
+                             description="A family house with a garden"),
+            "Place.3": Place(id="3", name="Beach hut", description="")
+        }
+        self.index = TextIndex(("name", "description"), self.places)
+
+    def keys(self, text, indexes=None):
+        return [key for score, key, obj in rank(indexes or [self.index],
+                                                text)]
+
+    def test_tokenize(self):
+        self.assertEqual(["a", "cozy", "loft", "2br"],
+                         tokenize("A cozy-loft, 2BR!"))
+
+    def test_rank(self):
+        self.assertEqual(["Place.1"], self.keys("loft"))
+        self.assertEqual(["Place.3", "Place.1"], self.keys("beach"))
+        self.assertEqual(["Place.1", "Place.3"], self.keys("cozy beach"))
+        self.assertEqual([], self.keys("castle"))
+        self.assertEqual([], self.keys(""))
+
+    def test_rank_limit(self):
+        self.assertEqual(1, len(rank([self.index], "beach", 1)))
+
+    def test_rank_over_several_indexes(self):
+        review = Review(id="1", text="Loved the garden")
+        reviews = TextIndex(("text",), {"Review.1": review})
+        self.assertEqual(["Review.1", "Place.2"],
+                         self.keys("garden", [self.index, reviews]))
+
+    def test_update_and_remove(self):
+        place = self.places["Place.2"]
+        place.description = "A loft"
+        self.index.update("Place.2", place)
+        self.assertEqual({"Place.1", "Place.2"}, set(self.keys("loft")))
+        self.assertEqual([], self.keys("garden"))
+        self.index.remove("Place.1")
+        self.index.remove("Place.9")
+        self.assertEqual(["Place.2"], self.keys("loft"))
+        self.assertEqual(2, len(self.index))
+
+    def test_saved_index_is_reused(self):
+        saved = json.loads(json.dumps(self.index.dump()))
+        self.assertFalse(self.index.changed)
+        self.places["Place.2"].name = "Loft"
+        del self.places["Place.3"]
+        with patch.object(text_index, "tokenize",
+                          wraps=tokenize) as tokenize_mock:
+            index = TextIndex(("name", "description"), self.places, saved)
+        self.assertEqual(1, tokenize_mock.call_count)
+        self.assertTrue(index.changed)
+        self.assertEqual({"Place.1", "Place.2"},
+                         {key for score, key, obj in rank([index], "loft")})
+        self.assertEqual([], rank([index], "hut"))
+
+    def test_saved_index_of_other_attributes_is_ignored(self):
+        saved = TextIndex(("name",), self.places).dump()
+        index = TextIndex(("name", "description"), self.places, saved)
+        self.assertEqual(["Place.2"], self.keys("garden", [index]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+"""Defines unittests for models/engine/writer.py.
+
+Unittest classes:
+    TestWriteAtomic
+    TestBackgroundWriter
+"""
+import os
+import threading
+import unittest
+from unittest.mock import patch
+from models.engine import writer
+from models.engine.writer import BackgroundWriter, write_atomic
+
+
+class TestWriteAtomic(unittest.TestCase):
+    """Unittests for testing the write_atomic function."""
+
+    def tearDown(self):
+        for path in ("test_writer.json", "test_writer.json.tmp"):
+            try:
+                os.remove(path)
+            except IOError:
+                pass
+
+    def test_writes_file(self):
+        write_atomic("test_writer.json", "{}")
+        with open("test_writer.json", "r") as f:
+            self.assertEqual("{}", f.read())
+        self.assertFalse(os.path.exists("test_writer.json.tmp"))
+
+    def test_replaces_file(self):
+        write_atomic("test_writer.json", "old")
+        write_atomic("test_writer.json", "new")
+        with open("test_writer.json", "r") as f:
+            self.assertEqual("new", f.read())
+
+
+class TestBackgroundWriter(unittest.TestCase):
+    """Unittests for testing the BackgroundWriter class."""
+
+    def tearDown(self):
+        try:
+            os.remove("test_writer.json")
+        except IOError:
+            pass
+
+    def test_flush_waits_for_write(self):
+        bw = BackgroundWriter("test_writer.json")
+        bw.submit("first")
+        bw.submit("second")
+        bw.flush()
+        with open("test_writer.json", "r") as f:
+            self.assertEqual("second", f.read())
+
+    def test_flush_without_submit(self):
+        BackgroundWriter("test_writer.json").flush()
+        self.assertFalse(os.path.exists("test_writer.json"))
+
+    def test_coalesces_submissions(self):
+        written = []
+        release = threading.Event()
+
+        def slow_write(path, text):
+            release.wait()
+            written.append(text)
+
+        with patch.object(writer, "write_atomic", slow_write):
+            bw = BackgroundWriter("test_writer.json")
+            for i in range(10):
+                bw.submit(str(i))
+            release.set()
+            bw.flush()
+        self.assertLess(len(written), 10)
+        self.assertEqual("9", written[-1])
+
+    def test_flush_raises_write_error(self):
+        bw = BackgroundWriter(os.path.join("missing_dir", "file.json"))
+        bw.submit("{}")
+        with self.assertRaises(OSError):
+            bw.flush()
+        bw.flush()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,9 @@ Unittest for Place class.
 """
 import unittest
 from models.place import Place
+from models import storage
+from models.amenity import Amenity
+from models.review import Review
 
 
 class TestPlace(unittest.TestCase):
@@ -27,6 +30,20 @@ class TestPlace(unittest.TestCase):
         self.assertEqual(place.longitude, 0.0)
         self.assertEqual(place.amenity_ids, [])
 
+    def test_reviews(self):
+        place = Place()
+        review = Review()
+        review.place_id = place.id
+        self.assertEqual([review], place.reviews)
+        storage.delete(review)
+        self.assertEqual([], place.reviews)
+
+    def test_amenities(self):
+        place = Place()
+        wifi = Amenity()
+        place.amenity_ids = [wifi.id, "missing"]
+        self.assertEqual([wifi], place.amenities)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -4,6 +4,7 @@ Unittest for State class.
 """
 import unittest
 from models.state import State
+from models.city import City
 
 
 class TestState(unittest.TestCase):
@@ -17,6 +18,14 @@ class TestState(unittest.TestCase):
         state = State()
         self.assertEqual(state.name, "")
 
+    def test_cities(self):
+        state = State()
+        city = City()
+        city.state_id = state.id
+        self.assertEqual([city], state.cities)
+        city.state_id = "other"
+        self.assertEqual([], state.cities)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,42 @@
+#!/usr/bin/python3
+"""Defines unittests for models/timestamp.py.
+
+Unittest classes:
+    TestTimestamp
+"""
+import unittest
+from datetime import datetime
+from models.timestamp import TIME_FORMAT, parse_datetime, format_datetime
+
+
+class TestTimestamp(unittest.TestCase):
+    """Unittests for testing the timestamp codec."""
+
+    def test_round_trip(self):
+        dt = datetime.today()
+        self.assertEqual(dt, parse_datetime(format_datetime(dt)))
+
+    def test_parse_matches_strptime(self):
+        value = "2024-05-22T15:06:11.801865"
+        self.assertEqual(datetime.strptime(value, TIME_FORMAT),
+                         parse_datetime(value))
+
+    def test_parse_without_microseconds(self):
+        dt = datetime(2024, 5, 22, 15, 6, 11)
+        self.assertEqual(dt, parse_datetime(format_datetime(dt)))
+
+    def test_format_is_isoformat(self):
+        dt = datetime.today()
+        self.assertEqual(dt.isoformat(), format_datetime(dt))
+
+    def test_parse_invalid(self):
+        with self.assertRaises(ValueError):
+            parse_datetime("not a timestamp")
+
+    def test_parse_None(self):
+        with self.assertRaises(TypeError):
+            parse_datetime(None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,6 +8,8 @@ Unittest classes:
 """
 import unittest
 from models.user import User
+from models.place import Place
+from models.review import Review
 
 
 class TestUser(unittest.TestCase):
@@ -32,6 +34,16 @@ class TestUser(unittest.TestCase):
         """Test that last_name attribute is an empty string"""
         self.assertEqual(self.user.last_name, "")
 
+    def test_places(self):
+        place = Place()
+        place.user_id = self.user.id
+        self.assertEqual([place], self.user.places)
+
+    def test_reviews(self):
+        review = Review()
+        review.user_id = self.user.id
+        self.assertEqual([review], self.user.reviews)
+
 
 if __name__ == '__main__':
     unittest.main()
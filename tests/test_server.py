@@ -0,0 +1,171 @@
+#!/usr/bin/python3
+"""Defines unittests for server.py.
+
+Unittest classes:
+    TestConsoleServer
+"""
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from console import HBNBCommand
+from models import storage
+from server import ConsoleServer
+
+
+class TestConsoleServer(unittest.IsolatedAsyncioTestCase):
+    """Unittests for testing console sessions over a socket."""
+
+    async def asyncSetUp(self):
+        self.console_server = ConsoleServer()
+        self.server = await self.console_server.start("127.0.0.1:0")
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def connect(self):
+        reader, writer = await asyncio.open_connection("127.0.0.1",
+                                                       self.port)
+        self.assertEqual(b"(hbnb) ", await reader.readuntil(b"(hbnb) "))
+        self.addAsyncCleanup(self.close, writer)
+        return reader, writer
+
+    async def close(self, writer):
+        writer.close()
+        await writer.wait_closed()
+
+    async def run_command(self, session, command):
+        reader, writer = session
+        writer.write(command.encode("utf-8") + b"\n")
+        output = await asyncio.wait_for(reader.readuntil(b"(hbnb) "), 5)
+        return output[:-len(b"(hbnb) ")].decode("utf-8").strip()
+
+    async def test_sessions_share_storage(self):
+        first, second = await self.connect(), await self.connect()
+        user_id = await self.run_command(first, "create User")
+        self.assertIn(user_id, await self.run_command(second,
+                                                      f"show User {user_id}"))
+        self.assertIn(user_id, await self.run_command(
+            second, f'User.show("{user_id}")'))
+        self.assertEqual("** class doesn't exist **",
+                         await self.run_command(first, "create Nothing"))
+
+    async def test_concurrent_sessions(self):
+        sessions = [await self.connect() for i in range(10)]
+        count = storage.count("Place")
+        ids = await asyncio.gather(*[self.run_command(session,
+                                                      "create Place")
+                                     for session in sessions])
+        self.assertEqual(10, len(set(ids)))
+        self.assertEqual(count + 10, storage.count("Place"))
+
+    async def test_reads_interleave(self):
+        first, second = await self.connect(), await self.connect()
+        user_id = await self.run_command(first, "create User")
+        release = threading.Event()
+        count = HBNBCommand.do_count
+
+        def slow_count(console, arg):
+            release.wait(5)
+            count(console, arg)
+
+        with patch.object(HBNBCommand, "do_count", slow_count):
+            slow = asyncio.ensure_future(self.run_command(first,
+                                                          "count User"))
+            await asyncio.sleep(0.1)
+            self.assertIn(user_id, await self.run_command(
+                second, f"show User {user_id}"))
+            self.assertFalse(slow.done())
+            release.set()
+            self.assertEqual(str(storage.count("User")), await slow)
+
+    async def test_changes_leave_loop_free(self):
+        first = await self.connect()
+        release = threading.Event()
+
+        def slow_create(console, arg):
+            print("released" if release.wait(5) else "timed out",
+                  file=console.stdout)
+
+        with patch.object(HBNBCommand, "do_create", slow_create):
+            slow = asyncio.ensure_future(self.run_command(first,
+                                                          "create User"))
+            await asyncio.sleep(0.1)
+            await self.connect()
+            self.assertFalse(slow.done())
+            release.set()
+            self.assertEqual("released", await slow)
+
+    async def test_output_is_streamed(self):
+        reader, writer = await self.connect()
+        release = threading.Event()
+
+        def slow_all(console, arg):
+            print("first", file=console.stdout)
+            print("released" if release.wait(5) else "timed out",
+                  file=console.stdout)
+
+        with patch.object(HBNBCommand, "do_all", slow_all):
+            writer.write(b"all User\n")
+            self.assertEqual(b"first\n", await asyncio.wait_for(
+                reader.readline(), 5))
+            release.set()
+            self.assertEqual(b"released\n(hbnb) ", await asyncio.wait_for(
+                reader.readuntil(b"(hbnb) "), 5))
+
+    async def test_batch_is_isolated(self):
+        first, second = await self.connect(), await self.connect()
+        await self.run_command(first, "begin")
+        user_id = await self.run_command(first, "create User")
+        show = asyncio.ensure_future(self.run_command(second,
+                                                      f"show User {user_id}"))
+        await asyncio.sleep(0.1)
+        self.assertFalse(show.done())
+        await self.run_command(first, "rollback")
+        self.assertEqual("** no instance found **", await show)
+
+    async def test_disconnect_rolls_back(self):
+        first, second = await self.connect(), await self.connect()
+        await self.run_command(first, "begin")
+        user_id = await self.run_command(first, "create User")
+        await self.close(first[1])
+        self.assertEqual("** no instance found **", await self.run_command(
+            second, f"show User {user_id}"))
+
+    async def test_quit(self):
+        reader, writer = await self.connect()
+        writer.write(b"quit\n")
+        self.assertEqual(b"", await asyncio.wait_for(reader.read(), 5))
+
+    async def test_error_keeps_session(self):
+        session = await self.connect()
+        with patch.object(HBNBCommand, "do_count",
+                          side_effect=RuntimeError("boom")):
+            self.assertEqual("** error: boom **",
+                             await self.run_command(session, "count User"))
+        self.assertEqual("** class name missing **",
+                         await self.run_command(session, "create"))
+
+    @unittest.skipUnless(hasattr(asyncio, "start_unix_server"),
+                         "Unix sockets are not available")
+    async def test_unix_socket(self):
+        path = os.path.join(tempfile.mkdtemp(), "hbnb.sock")
+        server = await ConsoleServer().start("unix:" + path)
+        reader, writer = await asyncio.open_unix_connection(path)
+        await reader.readuntil(b"(hbnb) ")
+        writer.write(b"count User\n")
+        output = await asyncio.wait_for(reader.readuntil(b"(hbnb) "), 5)
+        self.assertEqual(str(storage.count("User")),
+                         output[:-7].decode().strip())
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    unittest.main()